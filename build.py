@@ -8,9 +8,11 @@ import json
 import shutil
 import zipfile
 import argparse
+import atexit
 from datetime import datetime
 from pathlib import Path
 from console_utils import ConsoleStyle
+from profiler import DEFAULT_TRACE_PATH, get_profiler, stage
 
 # Pack name from directory name
 PACK_NAME = os.path.basename(os.getcwd()).replace(" ", "_").replace("-", "_").lower()
@@ -227,6 +229,7 @@ examples:
   python3 build.py --mcaddon
   python3 build.py --all --test-on-local
   python3 build.py --mcpack --no-bump
+  python3 build.py --all --no-bump --profile
                                      """
                                      )
     parser.add_argument("--mcaddon", '-a', action="store_true", help="build .mcaddon package")
@@ -239,8 +242,13 @@ examples:
     parser.add_argument('--simplify-name', '-s', action='store_true',
                         help='simplify package file name (do not append version and timestamp)')
     parser.add_argument("--output", '-o', default="dist", help="output directory")
+    parser.add_argument("--profile", nargs='?', const=DEFAULT_TRACE_PATH, metavar='TRACE',
+                        help=f"measure time and memory per stage, write a Chrome trace (default {DEFAULT_TRACE_PATH})")
 
     args = parser.parse_args()
+    if args.profile:
+        get_profiler().enable("build")
+        atexit.register(get_profiler().finish, args.profile)
 
     if not any([args.mcaddon, args.mcpack, args.all]):
         parser.print_help()
@@ -261,8 +269,9 @@ examples:
         new_bp_version = bump_version(bp_version.copy())
         new_rp_version = bump_version(rp_version.copy())
 
-        update_version("BP/manifest.json", new_bp_version)
-        update_version("RP/manifest.json", new_rp_version)
+        with stage("bump_version"):
+            update_version("BP/manifest.json", new_bp_version)
+            update_version("RP/manifest.json", new_rp_version)
 
         bp_version = new_bp_version
         rp_version = new_rp_version
@@ -283,13 +292,15 @@ examples:
     rp_mcpack_path = None
 
     if args.mcaddon or args.all:
-        mcaddon_path, mcaddon_size = build_mcaddon(bp_version, rp_version, PACK_NAME, args.output, timestamp,
-                                                   args.simplify_name)
+        with stage("mcaddon"):
+            mcaddon_path, mcaddon_size = build_mcaddon(bp_version, rp_version, PACK_NAME, args.output, timestamp,
+                                                       args.simplify_name)
 
     if args.mcpack or args.all:
-        bp_mcpack_path, rp_mcpack_path, bp_size, rp_size = build_mcpack(
-            bp_version, rp_version, f"{PACK_NAME}_BP", f"{PACK_NAME}_RP", args.output, timestamp, args.simplify_name
-        )
+        with stage("mcpack"):
+            bp_mcpack_path, rp_mcpack_path, bp_size, rp_size = build_mcpack(
+                bp_version, rp_version, f"{PACK_NAME}_BP", f"{PACK_NAME}_RP", args.output, timestamp, args.simplify_name
+            )
 
     stats = {
         "📦Total files": count_files()
@@ -305,7 +316,9 @@ examples:
         ConsoleStyle.print_section("INSTALLATION", "")
         print(ConsoleStyle.process("Installing to local Minecraft..."))
         clean_existing = not args.no_clean
-        if install_mcaddon(mcaddon_path, clean_existing):
+        with stage("install"):
+            installed = install_mcaddon(mcaddon_path, clean_existing)
+        if installed:
             print(ConsoleStyle.success("Installation completed successfully!"))
         else:
             print(ConsoleStyle.error("Installation failed!"))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Przyrostowa pamięć podręczna budowania oparta na skrótach zawartości (.build-cache/manifest.json)
+"""
+import hashlib
+import json
+import os
+import subprocess
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from emitter import atomic_open
+
+BUILD_CACHE_DIR = ".build-cache"
+MANIFEST_PATH = os.path.join(BUILD_CACHE_DIR, "manifest.json")
+MANIFEST_VERSION = 1
+
+
+def file_hash(path: str) -> Optional[str]:
+    """Policz SHA-256 zawartości pliku (None, jeśli plik nie istnieje)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def file_sha1(path: str) -> Optional[str]:
+    """Policz SHA-1 zawartości pliku (skrót używany przez repozytoria plików MediaWiki)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def content_hash(data) -> str:
+    """Policz SHA-256 struktury JSON (niezależnie od kolejności kluczy)"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_tool_version(tool: str) -> str:
+    """Pobierz wersję narzędzia zewnętrznego (raz na proces)"""
+    try:
+        result = subprocess.run([tool, '--version'], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return "unavailable"
+    output = (result.stdout or result.stderr).strip()
+    return output.splitlines()[0] if output else "unknown"
+
+
+def get_tool_versions(*tools: str) -> Dict[str, str]:
+    return {tool: get_tool_version(tool) for tool in tools}
+
+
+class BuildCache:
+    """Manifest artefaktów: wejścia każdego artefaktu i skróty plików, które z nich powstały"""
+
+    def __init__(self, manifest_path: str = MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._updates: Dict[str, Optional[Dict]] = {}
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.manifest_path):
+                try:
+                    with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                        manifest = json.load(f)
+                    if manifest.get('version') == MANIFEST_VERSION:
+                        self._entries = manifest.get('entries', {})
+                except (OSError, ValueError):
+                    # Uszkodzony manifest oznacza po prostu pełne przebudowanie
+                    self._entries = {}
+        return self._entries
+
+    def is_fresh(self, key: str, inputs: Dict) -> bool:
+        """Czy artefakt powstał z tych samych wejść, a jego pliki są nienaruszone"""
+        entry = self.entries.get(key)
+        if not entry or entry.get('inputs') != inputs:
+            return False
+        return all(file_hash(path) == digest for path, digest in entry.get('outputs', {}).items())
+
+    def record(self, key: str, inputs: Dict, outputs: Iterable[str]):
+        """Zapamiętaj wejścia artefaktu oraz skróty utworzonych plików"""
+        entry = {
+            'inputs': inputs,
+            'outputs': {path: file_hash(path) for path in outputs},
+        }
+        self.entries[key] = entry
+        self._updates[key] = entry
+        self._dirty = True
+
+    def forget(self, key: str):
+        """Usuń wpis artefaktu (np. po usunięciu jego plików)"""
+        if self.entries.pop(key, None) is not None:
+            self._updates[key] = None
+            self._dirty = True
+
+    def pop_updates(self) -> Dict[str, Optional[Dict]]:
+        """Pobierz i wyczyść wpisy zmienione od ostatniego wywołania (do przekazania z procesu roboczego)"""
+        updates, self._updates = self._updates, {}
+        return updates
+
+    def merge(self, updates: Dict[str, Optional[Dict]]):
+        """Nanieś wpisy zmienione w procesie roboczym"""
+        for key, entry in updates.items():
+            if entry is None:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = entry
+        self._dirty = self._dirty or bool(updates)
+
+    def save(self) -> bool:
+        """Zapisz manifest atomowo, jeśli coś się zmieniło"""
+        if not self._dirty:
+            return False
+
+        with atomic_open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': dict(sorted(self.entries.items()))}, f, indent=2)
+
+        self._dirty = False
+        return True
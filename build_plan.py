@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Plan budowania: artefakty współdzielone przez znaki (modele 3D, tekstury rewersu) wyznaczane raz dla całego przebiegu
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from console_utils import ConsoleStyle, print_if_not_quiet
+from sign_catalog import SignRecord
+
+
+def scale_size_from_mm_to_px(value):
+    return value // 5
+
+
+def get_texture_canvas_size(target_width, target_height):
+    """Wymiary pliku PNG: tekstury węższe niż wyższe są dopełniane do kwadratu"""
+    if target_width < target_height:
+        return target_height, target_height
+    return target_width, target_height
+
+
+def get_reverse_texture_for_shape(sign_shape, sign_width, sign_height):
+    """Pobierz nazwę tekstury tła na podstawie kształtu znaku"""
+    shape_to_background = {
+        'triangle': f'triangle_{sign_width}x{sign_height}',
+        'inverted_triangle': f'inverted_triangle_{sign_width}x{sign_height}',
+        'circle': f'circle_{sign_width}x{sign_height}',
+        'square': f'square_{sign_width}x{sign_height}',
+        'diamond': f'diamond_{sign_width}x{sign_height}',
+        'octagon': f'octagon_{sign_width}x{sign_height}',
+        'rectangle': f'rectangle_{sign_width}x{sign_height}'
+    }
+
+    return shape_to_background.get(sign_shape, f'rectangle_{sign_width}x{sign_height}')
+
+
+def get_model_name(sign_shape, sign_width, sign_height, vertical_alignment="bottom"):
+    """Nazwa modelu 3D wspólnego dla znaków o tym samym kształcie, wymiarach i wyrównaniu"""
+    return f"road_sign_{sign_shape}_{sign_width}x{sign_height}_{vertical_alignment}"
+
+
+# Kształt może zawierać '_' (inverted_triangle), więc wymiary i wyrównanie odczytywane są od końca nazwy
+MODEL_NAME_PATTERN = re.compile(r'^road_sign_(?P<shape>.+)_(?P<width>\d+)x(?P<height>\d+)_(?P<alignment>[a-z]+)$')
+
+
+def parse_model_name(model_name) -> Optional[Tuple[str, int, int, str]]:
+    """Odwrotność get_model_name: (kształt, szerokość, wysokość, wyrównanie) lub None dla innych nazw"""
+    match = MODEL_NAME_PATTERN.match(model_name)
+    if not match:
+        return None
+    return match['shape'], int(match['width']), int(match['height']), match['alignment']
+
+
+class SharedArtifact:
+    """Artefakt wspólny dla grupy znaków o tym samym kształcie i wymiarach"""
+
+    __slots__ = ('name', 'sign_shape', 'sign_width', 'sign_height', 'sign_ids')
+
+    def __init__(self, name: str, sign_shape: str, sign_width: int, sign_height: int):
+        self.name = name
+        self.sign_shape = sign_shape
+        self.sign_width = sign_width
+        self.sign_height = sign_height
+        self.sign_ids: List[str] = []
+
+    @property
+    def target_width(self) -> int:
+        return scale_size_from_mm_to_px(self.sign_width)
+
+    @property
+    def target_height(self) -> int:
+        return scale_size_from_mm_to_px(self.sign_height)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r}, {len(self.sign_ids)} znaków)"
+
+
+class ReverseTextureArtifact(SharedArtifact):
+    """Tekstura rewersu: kształt + wymiary w mm"""
+
+    __slots__ = ()
+
+
+class ModelArtifact(SharedArtifact):
+    """Model 3D: kształt + wymiary w mm + wyrównanie w pionie"""
+
+    __slots__ = ('vertical_alignment',)
+
+    def __init__(self, name: str, sign_shape: str, sign_width: int, sign_height: int, vertical_alignment: str):
+        super().__init__(name, sign_shape, sign_width, sign_height)
+        self.vertical_alignment = vertical_alignment
+
+
+class BuildPlan:
+    """Grupy (kształt, wymiary, wyrównanie) znaków: każdy wspólny artefakt budowany jest dokładnie raz"""
+
+    def __init__(self, signs: Iterable[SignRecord]):
+        self.signs: List[SignRecord] = list(signs)
+        self.models: Dict[str, ModelArtifact] = {}
+        self.reverse_textures: Dict[str, ReverseTextureArtifact] = {}
+        self._sign_artifacts: Dict[str, Tuple[str, str]] = {}
+        self.failed: Set[str] = set()
+
+        for sign in self.signs:
+            model_name = get_model_name(sign.sign_shape, sign.sign_width, sign.sign_height, sign.vertical_alignment)
+            model = self.models.get(model_name)
+            if model is None:
+                model = self.models[model_name] = ModelArtifact(model_name, sign.sign_shape, sign.sign_width,
+                                                                sign.sign_height, sign.vertical_alignment)
+            model.sign_ids.append(sign.sign_id)
+
+            reverse_texture_name = get_reverse_texture_for_shape(sign.sign_shape, sign.sign_width, sign.sign_height)
+            reverse_texture = self.reverse_textures.get(reverse_texture_name)
+            if reverse_texture is None:
+                reverse_texture = self.reverse_textures[reverse_texture_name] = ReverseTextureArtifact(
+                    reverse_texture_name, sign.sign_shape, sign.sign_width, sign.sign_height)
+            reverse_texture.sign_ids.append(sign.sign_id)
+
+            self._sign_artifacts[sign.sign_id] = (model_name, reverse_texture_name)
+
+    def shared_artifacts(self, sign_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Nazwy (modelu, tekstury rewersu) znaku; None dla artefaktu, którego nie udało się zbudować"""
+        model_name, reverse_texture_name = self._sign_artifacts[sign_id]
+        return (None if model_name in self.failed else model_name,
+                None if reverse_texture_name in self.failed else reverse_texture_name)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Liczba artefaktów każdego rodzaju"""
+        return {
+            'signs': len(self.signs),
+            'averse_textures': len(self.signs),
+            'blocks': len(self.signs),
+            'models': len(self.models),
+            'reverse_textures': len(self.reverse_textures),
+        }
+
+    def print_plan(self):
+        """Wypisz plan (tryb próbny): grupy wspólnych artefaktów i liczby artefaktów do zbudowania"""
+        ConsoleStyle.print_section("PLAN BUDOWANIA")
+        ConsoleStyle.print_section(f"Modele 3D [{len(self.models)}]", "-")
+        for model in sorted(self.models.values(), key=lambda artifact: artifact.name):
+            print_if_not_quiet(ConsoleStyle.info(f"{model.name} ({model.target_width}x{model.target_height} px): "
+                                                 f"[{len(model.sign_ids)}] znaków"))
+        ConsoleStyle.print_section(f"Tekstury rewersu [{len(self.reverse_textures)}]", "-")
+        for reverse_texture in sorted(self.reverse_textures.values(), key=lambda artifact: artifact.name):
+            canvas_width, canvas_height = get_texture_canvas_size(reverse_texture.target_width,
+                                                                  reverse_texture.target_height)
+            print_if_not_quiet(ConsoleStyle.info(f"{reverse_texture.name} ({canvas_width}x{canvas_height} px): "
+                                                 f"[{len(reverse_texture.sign_ids)}] znaków"))
+
+        counts = self.counts
+        ConsoleStyle.print_stats({
+            "Znaki": counts['signs'],
+            "Tekstury awersu": counts['averse_textures'],
+            "Bloki": counts['blocks'],
+            "Modele 3D": counts['models'],
+            "Tekstury rewersu": counts['reverse_textures'],
+        }, "LICZBA ARTEFAKTÓW")
@@ -3,7 +3,10 @@
 Biblioteka z funkcjami stylizacji konsoli dla skryptów
 """
 
+import io
 import sys
+import threading
+from contextlib import contextmanager
 from typing import Dict, Any, Union
 
 
@@ -13,6 +16,46 @@ def print_if_not_quiet(text):
         print(text)
 
 
+class ThreadOutputRouter:
+    """Zamiennik sys.stdout: wątek w bloku capture() pisze do własnego bufora, pozostałe do oryginalnego strumienia
+
+    Pozostałe atrybuty (isatty, encoding, flush) pochodzą z oryginalnego strumienia, więc kolorowanie
+    ConsoleStyle działa w przechwyconym wydruku tak samo jak w terminalu.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def write(self, text):
+        return (getattr(self._local, 'buffer', None) or self._stream).write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    @contextmanager
+    def capture(self):
+        """Przechwyć wydruk bieżącego wątku; zwraca io.StringIO z zebranym tekstem"""
+        buffer = io.StringIO()
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+
+@contextmanager
+def thread_output_routing():
+    """Na czas bloku zastąp sys.stdout routerem ThreadOutputRouter (wydruk wątków roboczych w kolejności zadań)"""
+    original = sys.stdout
+    router = ThreadOutputRouter(original)
+    sys.stdout = router
+    try:
+        yield router
+    finally:
+        sys.stdout = original
+
+
 class ConsoleStyle:
     """Class for console message styling"""
 
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Asynchroniczne pobieranie plików przez HTTP/1.1 (keep-alive, limit współbieżności, limit zapytań na sekundę)
+"""
+import asyncio
+import hashlib
+import os
+import random
+import ssl
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+
+from console_utils import ConsoleStyle, print_if_not_quiet
+from emitter import atomic_open
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; PolishRoadSignsMinecraftBedrockAddon)"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 5
+
+MAX_REDIRECTS = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+MAX_RETRY_AFTER = 120.0
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class DownloadError(Exception):
+    """Nie udało się pobrać zasobu (także po wyczerpaniu ponowień)"""
+
+
+class DownloadSettings:
+    """Ustawienia warstwy pobierania przekazywane z linii poleceń"""
+
+    def __init__(self, base_url: Optional[str] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, timeout: float = DEFAULT_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES, user_agent: str = DEFAULT_USER_AGENT):
+        self.base_url = base_url
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.user_agent = user_agent
+
+
+class HttpResponse:
+    """Odpowiedź HTTP z całą treścią w pamięci"""
+
+    __slots__ = ('url', 'status', 'headers', 'body')
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def text(self) -> str:
+        charset = 'utf-8'
+        for parameter in self.headers.get('content-type', '').split(';')[1:]:
+            name, _, value = parameter.strip().partition('=')
+            if name.lower() == 'charset' and value:
+                charset = value.strip('"')
+        try:
+            return self.body.decode(charset, errors='replace')
+        except LookupError:
+            return self.body.decode('utf-8', errors='replace')
+
+
+class TokenBucket:
+    """Limit zapytań: średnio `rate` na sekundę, najwyżej `capacity` naraz"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Wstrzymaj wszystkie zapytania (np. po odpowiedzi 429)"""
+        resume_at = time.monotonic() + seconds
+        if resume_at > self._blocked_until:
+            self._blocked_until = resume_at
+            self._tokens = 0.0
+            self._updated = resume_at
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Odczytaj nagłówek Retry-After (liczba sekund lub data HTTP)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max(retry_at.timestamp() - time.time(), 0.0), MAX_RETRY_AFTER)
+
+
+class AsyncDownloader:
+    """Klient HTTP/1.1 z pulą połączeń keep-alive; tworzyć wewnątrz działającej pętli asyncio"""
+
+    def __init__(self, settings: Optional[DownloadSettings] = None):
+        self.settings = settings or DownloadSettings()
+        self._semaphore = asyncio.Semaphore(self.settings.concurrency)
+        self._bucket = TokenBucket(self.settings.rate, self.settings.burst)
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._ssl_context = ssl.create_default_context()
+        self.request_count = 0
+
+    async def __aenter__(self) -> 'AsyncDownloader':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Zamknij bezczynne połączenia"""
+        writers = [writer for connections in self._idle.values() for _, writer in connections]
+        self._idle.clear()
+        for writer in writers:
+            writer.close()
+        for writer in writers:
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+    def resolve_url(self, url: str) -> str:
+        """Przekieruj adres na base_url (np. lokalny serwer z plikami testowymi), zachowując ścieżkę"""
+        if not self.settings.base_url:
+            return url
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        return self.settings.base_url.rstrip('/') + path
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """Pobierz zasób, podążając za przekierowaniami i ponawiając błędy przejściowe"""
+        url = self.resolve_url(url)
+        async with self._semaphore:
+            for _ in range(MAX_REDIRECTS + 1):
+                response = await self._fetch_with_retries(url, headers or {})
+                location = response.headers.get('location')
+                if response.status not in REDIRECT_STATUSES or not location:
+                    return response
+                url = self.resolve_url(urljoin(url, location))
+        raise DownloadError(f"{url}: zbyt wiele przekierowań")
+
+    async def fetch_text(self, url: str) -> str:
+        response = await self.fetch(url)
+        if response.status != 200:
+            raise DownloadError(f"{response.url}: HTTP {response.status}")
+        return response.text()
+
+    async def download(self, url: str, output_path: str, expected_sha1: Optional[str] = None,
+                       headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """Pobierz zasób i zapisz go atomowo pod wskazaną ścieżką (opcjonalnie sprawdzając SHA-1)
+
+        Przy zapytaniu warunkowym odpowiedź 304 zwracana jest bez zapisywania pliku.
+        """
+        response = await self.fetch(url, headers)
+        if response.status == 304 and headers:
+            return response
+        if response.status != 200:
+            raise DownloadError(f"{response.url}: HTTP {response.status}")
+        if expected_sha1 and hashlib.sha1(response.body).hexdigest() != expected_sha1:
+            raise DownloadError(f"{response.url}: niezgodna suma SHA-1")
+
+        with atomic_open(output_path) as f:
+            f.write(response.body)
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX)
+        return delay + random.uniform(0, delay / 10)
+
+    async def _fetch_with_retries(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        error = None
+        for attempt in range(self.settings.max_retries + 1):
+            await self._bucket.acquire()
+            try:
+                response = await asyncio.wait_for(self._send(url, headers), self.settings.timeout)
+            except (OSError, ssl.SSLError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                error = str(e) or e.__class__.__name__
+                delay = self._backoff(attempt)
+            else:
+                if response.status not in RETRY_STATUSES:
+                    return response
+                error = f"HTTP {response.status}"
+                delay = parse_retry_after(response.headers.get('retry-after'))
+                if delay is None:
+                    delay = self._backoff(attempt)
+                if response.status == 429:
+                    # Serwer ogranicza zapytania: wstrzymaj wszystkie, nie tylko bieżące
+                    self._bucket.pause(delay)
+
+            if attempt == self.settings.max_retries:
+                break
+            print_if_not_quiet(ConsoleStyle.warning(f"Ponawiam pobieranie [{url}] za {delay:.1f}s ({error})"))
+            await asyncio.sleep(delay)
+        raise DownloadError(f"{url}: {error}")
+
+    async def _open_connection(self, key: Tuple[str, str, int]):
+        """Weź bezczynne połączenie z puli lub otwórz nowe; zwraca (reader, writer, ponownie_użyte)"""
+        idle = self._idle.get(key, [])
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = key
+        if scheme == 'https':
+            reader, writer = await asyncio.open_connection(host, port, ssl=self._ssl_context, server_hostname=host)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return reader, writer, False
+
+    async def _send(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Nieobsługiwany adres [{url}]")
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+
+        target = quote(parts.path or '/', safe="/%:@!$&'()*+,;=-._~")
+        if parts.query:
+            target += '?' + quote(parts.query, safe="=&%+/:@!$'()*,;-._~")
+        host_header = parts.hostname + (f":{parts.port}" if parts.port else "")
+        request_headers = {
+            'Host': host_header,
+            'User-Agent': self.settings.user_agent,
+            'Accept-Encoding': 'identity',
+            'Connection': 'keep-alive',
+        }
+        request_headers.update(headers)
+        request = f"GET {target} HTTP/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+        request = (request + "\r\n").encode('latin-1')
+
+        for attempt in range(2):
+            reader, writer, reused = await self._open_connection(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, response_headers, body, keep_alive = await self._read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                # Serwer mógł zamknąć bezczynne połączenie keep-alive — spróbuj raz na nowym
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            self.request_count += 1
+            if keep_alive:
+                self._idle.setdefault(key, []).append((reader, writer))
+            else:
+                writer.close()
+            return HttpResponse(url, status, response_headers, body)
+        raise ConnectionError(f"Nie udało się wysłać zapytania [{url}]")
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Połączenie zamknięte przez serwer")
+        version, _, rest = status_line.decode('latin-1').strip().partition(' ')
+        status = int(rest.split(' ', 1)[0])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # Pomiń ewentualne nagłówki końcowe
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return status, headers, body, keep_alive
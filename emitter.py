@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Zapis generowanych plików (bloki, modele, tłumaczenia, katalog crafting, terrain_texture.json) tylko wtedy,
+gdy zmieniła się ich zawartość
+"""
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, Optional
+
+from schema_validation import SchemaValidationError, validate_document
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'wb', encoding: Optional[str] = None) -> Iterator[IO]:
+    """Otwórz plik tymczasowy obok pliku docelowego; po udanym zapisie zastąp nim plik (os.replace), po błędzie usuń
+
+    Czytelnik nigdy nie widzi pliku zapisanego częściowo, a przerwany zapis nie zostawia pozostałości.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _floats_match_json(data: Any) -> bool:
+    """Czy liczby zmiennoprzecinkowe zapisze orjson tak samo jak json (json używa notacji wykładniczej
+    dla |x| < 1e-4 i |x| >= 1e16, orjson — innej)"""
+    data_type = type(data)
+    if data_type is float:
+        return data == 0 or 1e-4 <= abs(data) < 1e16
+    if data_type is dict:
+        return all(_floats_match_json(value) for value in data.values())
+    if data_type is list or data_type is tuple:
+        return all(_floats_match_json(value) for value in data)
+    return True
+
+
+def serialize_json(data: Any, ensure_ascii: bool = True) -> bytes:
+    """Serializuj do bajtów identycznych z json.dumps(data, indent=2, ensure_ascii=...)
+
+    orjson (jeśli jest zainstalowany) daje dla wcięcia 2 ten sam wynik; gdy wynik mógłby się różnić
+    (znaki spoza ASCII przy ensure_ascii, liczby w notacji wykładniczej, typy nieobsługiwane przez orjson),
+    używany jest moduł json.
+    """
+    if ORJSON_AVAILABLE and _floats_match_json(data):
+        try:
+            content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            content = None
+        if content is not None and (not ensure_ascii or content.isascii()):
+            return content
+    return json.dumps(data, indent=2, ensure_ascii=ensure_ascii).encode('utf-8')
+
+
+class Emitter:
+    """Atomowy zapis plików (plik tymczasowy + os.replace) pomijający pliki o niezmienionej zawartości"""
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+
+    @staticmethod
+    def is_unchanged(path: str, content: bytes) -> bool:
+        """Czy plik ma już tę zawartość (najpierw porównanie rozmiaru, bez czytania pliku)"""
+        try:
+            if os.path.getsize(path) != len(content):
+                return False
+            with open(path, 'rb') as f:
+                return f.read() == content
+        except OSError:
+            return False
+
+    def write_bytes(self, path: str, content: bytes) -> bool:
+        """Zapisz plik, jeśli jego zawartość się zmieniła; zwraca True, gdy plik został zapisany"""
+        if self.is_unchanged(path, content):
+            self.skipped += 1
+            return False
+
+        with atomic_open(path) as f:
+            f.write(content)
+
+        self.written += 1
+        return True
+
+    def write_text(self, path: str, text: str) -> bool:
+        return self.write_bytes(path, text.encode('utf-8'))
+
+    def write_json(self, path: str, data: Any, ensure_ascii: bool = True) -> bool:
+        """Zapisz strukturę jako JSON z wcięciem 2 (format wszystkich plików dodatku)
+
+        Bloki, geometrie, manifesty i katalog crafting są przed zapisem walidowane schematem (schema_validation);
+        dokument niezgodny ze schematem nie jest zapisywany (SchemaValidationError).
+        """
+        errors = validate_document(path, data)
+        if errors:
+            raise SchemaValidationError(path, errors)
+        return self.write_bytes(path, serialize_json(data, ensure_ascii))
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return {'written': self.written, 'skipped': self.skipped}
+
+    def pop_counts(self) -> Dict[str, int]:
+        """Pobierz i wyzeruj liczniki (do przekazania z procesu roboczego)"""
+        counts = self.counts
+        self.written = self.skipped = 0
+        return counts
+
+    def merge(self, counts: Dict[str, int]):
+        """Dolicz liczniki z procesu roboczego"""
+        self.written += counts['written']
+        self.skipped += counts['skipped']
@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Hermetyczne atrapy narzędzi zewnętrznych (inkscape, rsvg-convert, magick, identify, curl) oraz lokalny serwer
+stron plików, API imageinfo i plików SVG — pełny przebieg procesora bez sieci i bez prawdziwych narzędzi,
+z zapisem każdego wywołania (argumenty, czas) do sprawdzania liczby wywołań
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from console_utils import ConsoleStyle, print_if_not_quiet
+
+FAKE_TOOLS = ("inkscape", "rsvg-convert", "magick", "identify", "curl")
+
+# Zmienne środowiskowe przekazujące atrapom ścieżkę dziennika wywołań i katalog plików testowych
+CALL_LOG_ENV = "FAKE_TOOLS_LOG"
+FIXTURES_ENV = "FAKE_TOOLS_FIXTURES"
+
+UPLOAD_HOST = "https://upload.wikimedia.org"
+UPLOAD_PATH = "/wikipedia/commons"
+FIXTURE_TIMESTAMP = "2024-01-01T00:00:00Z"
+DEFAULT_FIXTURE_SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="900mm" height="900mm" viewBox="0 0 900 900">'
+                       '<rect width="900" height="900" fill="#06c"/></svg>\n')
+
+STUB_TEMPLATE = """#!{python}
+import sys
+sys.path.insert(0, {root!r})
+from fake_tools import run_stub
+sys.exit(run_stub({tool!r}, sys.argv[1:]))
+"""
+
+
+class HarnessError(Exception):
+    """Przebieg z atrapami narzędzi nie spełnił oczekiwań"""
+
+
+def make_png(width: int, height: int) -> bytes:
+    """Poprawny, przezroczysty PNG RGBA 8 bit o zadanych wymiarach (bez PIL)"""
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    row = b'\x00' * (width * 4 + 1)
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(row * height, 1))
+            + chunk(b'IEND', b''))
+
+
+def record_call(tool: str, action: str, args: List[str], duration: float):
+    """Dopisz wywołanie do dziennika (jeden wiersz JSON, zapis O_APPEND — bezpieczny dla wielu procesów)"""
+    log_path = os.environ.get(CALL_LOG_ENV)
+    if not log_path:
+        return
+    line = json.dumps({'tool': tool, 'action': action, 'args': args, 'duration': round(duration, 6),
+                       'pid': os.getpid()}) + "\n"
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+def upload_url(file_name: str) -> str:
+    """Adres pliku w układzie katalogów Wikimedia Commons (/x/xy/Nazwa.svg)"""
+    digest = hashlib.md5(file_name.encode('utf-8')).hexdigest()
+    return f"{UPLOAD_HOST}{UPLOAD_PATH}/{digest[0]}/{digest[:2]}/{quote(file_name)}"
+
+
+class FixtureStore:
+    """Treści serwowane zamiast Wikipedii: pliki z katalogu testowego lub wygenerowane domyślne"""
+
+    def __init__(self, fixtures_dir: Optional[str] = None):
+        self.fixtures_dir = fixtures_dir
+
+    def _read(self, file_name: str) -> Optional[bytes]:
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, os.path.basename(file_name))
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def file_name(title: str) -> str:
+        """Nazwa pliku z tytułu strony (Plik:Nazwa.svg → Nazwa.svg)"""
+        return title.split(':', 1)[-1].replace(' ', '_')
+
+    def file(self, file_name: str) -> Optional[bytes]:
+        """Plik SVG (domyślny, jeśli brak go w katalogu testowym); None dla innych brakujących plików"""
+        content = self._read(file_name)
+        if content is None and file_name.lower().endswith('.svg'):
+            content = DEFAULT_FIXTURE_SVG.encode('utf-8')
+        return content
+
+    def page(self, title: str) -> bytes:
+        """Strona pliku z linkiem fullImageLink (albo Nazwa.svg.html z katalogu testowego)"""
+        file_name = self.file_name(title)
+        content = self._read(f"{file_name}.html")
+        if content is None:
+            content = (f'<html><body><div class="fullImageLink"><a href="{upload_url(file_name)}" '
+                       f'class="internal fullImageLink">{file_name}</a></div></body></html>').encode('utf-8')
+        return content
+
+    def imageinfo(self, titles: List[str]) -> bytes:
+        """Odpowiedź API imageinfo (formatversion=2) dla tytułów plików"""
+        pages = []
+        for title in titles:
+            content = self.file(self.file_name(title))
+            if content is None:
+                pages.append({'title': title, 'missing': True})
+                continue
+            pages.append({'title': title, 'imageinfo': [{
+                'url': upload_url(self.file_name(title)),
+                'sha1': hashlib.sha1(content).hexdigest(),
+                'size': len(content),
+                'timestamp': FIXTURE_TIMESTAMP,
+            }]})
+        return json.dumps({'batchcomplete': True, 'query': {'pages': pages}}).encode('utf-8')
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Nagłówki i treść wysyłane są osobno — bez TCP_NODELAY każda odpowiedź czekałaby na opóźnione ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        from wikimedia_api import API_PATH
+
+        started = time.perf_counter()
+        store = self.server.store
+        parts = urlsplit(self.path)
+        if parts.path == API_PATH:
+            action, content_type = 'api', 'application/json; charset=utf-8'
+            titles = parse_qs(parts.query).get('titles', [''])[0].split('|')
+            body = store.imageinfo([title for title in titles if title])
+        elif parts.path.startswith('/wiki/'):
+            action, content_type = 'page', 'text/html; charset=utf-8'
+            body = store.page(unquote(parts.path[len('/wiki/'):]))
+        else:
+            action, content_type = 'file', 'image/svg+xml'
+            body = store.file(unquote(os.path.basename(parts.path)))
+
+        if body is None:
+            status = 404
+            self._respond(status, b'', 'text/plain')
+        else:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            status = 304 if self.headers.get('If-None-Match') == etag else 200
+            self._respond(status, body if status == 200 else b'', content_type, etag)
+        # Kod odpowiedzi w argumentach: zapytanie warunkowe (304) odróżnialne od pobrania pliku
+        record_call('http', action, [self.path, str(status)], time.perf_counter() - started)
+
+    def _respond(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Lokalny serwer HTTP w wątku; adres podawany procesorowi jako --base-url"""
+
+    def __init__(self, store: FixtureStore):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _FixtureHandler)
+        self._server.daemon_threads = True
+        self._server.store = store
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _options(args: List[str]) -> Dict[str, str]:
+    """Opcje w postaci --nazwa=wartość"""
+    return dict(arg[2:].split('=', 1) for arg in args if arg.startswith('--') and '=' in arg)
+
+
+def _write_png(path: str, width: int, height: int):
+    """Zapisz PNG do pliku lub, dla nazwy "-", na standardowe wyjście (tak jak Inkscape)"""
+    if path == '-':
+        sys.stdout.buffer.write(make_png(width, height))
+        sys.stdout.buffer.flush()
+        return
+    with open(path, 'wb') as f:
+        f.write(make_png(width, height))
+
+
+def _inkscape_shell() -> int:
+    """Protokół `inkscape --shell`: znak zachęty, akcje rozdzielone średnikami, polecenie quit"""
+    stdout = sys.stdout.buffer
+    stdout.write(b"Inkscape interactive shell mode. Type 'action-list' to list all actions.\n> ")
+    stdout.flush()
+    for line in sys.stdin.buffer:
+        line = line.decode('utf-8').strip()
+        if line == 'quit':
+            break
+        started = time.perf_counter()
+        actions = dict(action.split(':', 1) if ':' in action else (action, '') for action in line.split(';'))
+        if 'export-do' in actions:
+            if os.path.exists(actions.get('file-open', '')):
+                _write_png(actions['export-filename'], int(actions['export-width']), int(actions['export-height']))
+            else:
+                sys.stderr.write(f"Can't open file: {actions.get('file-open')}\n")
+                sys.stderr.flush()
+            record_call('inkscape', 'export', [line], time.perf_counter() - started)
+        stdout.write(b"> ")
+        stdout.flush()
+    return 0
+
+
+def _stub_inkscape(args: List[str]) -> Tuple[str, int]:
+    if '--version' in args:
+        print("Inkscape 1.2.2 (fake)")
+        return 'version', 0
+    if '--shell' in args:
+        return 'shell', _inkscape_shell()
+    options = _options(args)
+    sources = [arg for arg in args if not arg.startswith('-')]
+    if not sources or not os.path.exists(sources[-1]) or 'export-filename' not in options:
+        sys.stderr.write("Can't open file\n")
+        return 'export', 1
+    _write_png(options['export-filename'], int(options['export-width']), int(options['export-height']))
+    return 'export', 0
+
+
+def _stub_rsvg_convert(args: List[str]) -> Tuple[str, int]:
+    if '--version' in args:
+        print("rsvg-convert version 2.54.0 (fake)")
+        return 'version', 0
+    options = _options(args)
+    sys.stdout.buffer.write(make_png(int(options['width']), int(options['height'])))
+    return 'render', 0
+
+
+def _size_argument(args: List[str], *names: str) -> Optional[Tuple[int, int]]:
+    for name in names:
+        if name in args[:-1]:
+            width, height = args[args.index(name) + 1].lower().split('x')[:2]
+            return int(width), int(height.split('+')[0])
+    return None
+
+
+def _stub_magick(args: List[str]) -> Tuple[str, int]:
+    from image_metadata import read_png_header
+
+    if '-version' in args or '--version' in args:
+        print("Version: ImageMagick 7.1.0 (fake)")
+        return 'version', 0
+    size = _size_argument(args, '-extent', '-resize', '-size')
+    if size is None:
+        header = read_png_header(args[0]) if args else None
+        size = header.size if header else (1, 1)
+    _write_png(args[-1], *size)
+    return 'convert', 0
+
+
+def _stub_identify(args: List[str]) -> Tuple[str, int]:
+    from image_metadata import read_png_header
+
+    if '-version' in args or '--version' in args:
+        print("Version: ImageMagick 7.1.0 (fake)")
+        return 'version', 0
+    header = read_png_header(args[-1]) if args else None
+    if header is None:
+        sys.stderr.write("identify: no decode delegate for this image format\n")
+        return 'identify', 1
+    print(f"{header.width} {header.height}")
+    return 'identify', 0
+
+
+def _stub_curl(args: List[str]) -> Tuple[str, int]:
+    if '--version' in args:
+        print("curl 8.0.0 (fake)")
+        return 'version', 0
+    output_path = args[args.index('-o') + 1] if '-o' in args[:-1] else None
+    urls = [arg for arg in args if arg.startswith(('http://', 'https://'))]
+    if not urls:
+        return 'fetch', 2
+    store = FixtureStore(os.environ.get(FIXTURES_ENV))
+    path = unquote(urlsplit(urls[-1]).path)
+    body = store.page(path[len('/wiki/'):]) if path.startswith('/wiki/') else store.file(os.path.basename(path))
+    if body is None:
+        sys.stderr.write("curl: (22) The requested URL returned error: 404\n")
+        return 'fetch', 22
+    if output_path:
+        with open(output_path, 'wb') as f:
+            f.write(body)
+    else:
+        sys.stdout.buffer.write(body)
+    return 'fetch', 0
+
+
+STUBS = {
+    'inkscape': _stub_inkscape,
+    'rsvg-convert': _stub_rsvg_convert,
+    'magick': _stub_magick,
+    'identify': _stub_identify,
+    'curl': _stub_curl,
+}
+
+
+def run_stub(tool: str, args: List[str]) -> int:
+    """Punkt wejścia atrapy (plik wykonywalny w katalogu bin zestawu); zwraca kod wyjścia"""
+    started = time.perf_counter()
+    action, returncode = STUBS[tool](args)
+    # Eksporty w trybie powłoki zapisywane są osobno, sama sesja — jako jedno wywołanie 'shell'
+    record_call(tool, action, args, time.perf_counter() - started)
+    return returncode
+
+
+class FakeToolbox:
+    """Atrapy narzędzi na początku PATH i serwer plików testowych; przywraca środowisko po zakończeniu
+
+        with FakeToolbox() as tools:
+            ...  # procesor uruchomiony z --base-url tools.base_url
+            tools.count('inkscape', 'export')
+    """
+
+    def __init__(self, fixtures_dir: Optional[str] = None, tools: Tuple[str, ...] = FAKE_TOOLS):
+        self.fixtures_dir = os.path.abspath(fixtures_dir) if fixtures_dir else None
+        self.tools = tools
+        self.root: Optional[str] = None
+        self.log_path: Optional[str] = None
+        self._server: Optional[FixtureServer] = None
+        self._saved_environ: Dict[str, Optional[str]] = {}
+
+    @property
+    def base_url(self) -> str:
+        return self._server.base_url
+
+    def _setenv(self, name: str, value: str):
+        self._saved_environ.setdefault(name, os.environ.get(name))
+        os.environ[name] = value
+
+    def __enter__(self) -> 'FakeToolbox':
+        self.root = tempfile.mkdtemp(prefix='fake_tools.')
+        bin_dir = os.path.join(self.root, 'bin')
+        os.makedirs(bin_dir)
+        source_root = os.path.dirname(os.path.abspath(__file__))
+        for tool in self.tools:
+            stub_path = os.path.join(bin_dir, tool)
+            with open(stub_path, 'w', encoding='utf-8') as f:
+                f.write(STUB_TEMPLATE.format(python=sys.executable, root=source_root, tool=tool))
+            os.chmod(stub_path, 0o755)
+
+        self.log_path = os.path.join(self.root, 'calls.jsonl')
+        open(self.log_path, 'w').close()
+        self._setenv('PATH', bin_dir + os.pathsep + os.environ.get('PATH', ''))
+        self._setenv(CALL_LOG_ENV, self.log_path)
+        if self.fixtures_dir:
+            self._setenv(FIXTURES_ENV, self.fixtures_dir)
+
+        self._server = FixtureServer(FixtureStore(self.fixtures_dir))
+        self._server.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.stop()
+        for name, value in self._saved_environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        self._saved_environ.clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def calls(self, tool: Optional[str] = None, action: Optional[str] = None) -> List[Dict]:
+        """Zapisane wywołania (opcjonalnie tylko danego narzędzia i akcji)"""
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            calls = [json.loads(line) for line in f if line.strip()]
+        return [call for call in calls
+                if (tool is None or call['tool'] == tool) and (action is None or call['action'] == action)]
+
+    def count(self, tool: str, action: Optional[str] = None) -> int:
+        return len(self.calls(tool, action))
+
+    def counts(self) -> Counter:
+        """Liczba wywołań per narzędzie ('inkscape') i per narzędzie z akcją ('inkscape:export')"""
+        counts = Counter()
+        for call in self.calls():
+            counts[call['tool']] += 1
+            counts[f"{call['tool']}:{call['action']}"] += 1
+        return counts
+
+    def expect(self, expectations: Dict[str, int]):
+        """Sprawdź liczby wywołań {'inkscape:export': 261, 'magick': 0}; HarnessError przy niezgodności"""
+        counts = self.counts()
+        mismatches = [f"{key}: oczekiwano {expected}, jest {counts[key]}"
+                      for key, expected in expectations.items() if counts[key] != expected]
+        if mismatches:
+            raise HarnessError("; ".join(mismatches))
+
+    def print_report(self):
+        """Tabela wywołań: liczba i łączny czas per narzędzie i akcja"""
+        totals: Dict[str, List[float]] = {}
+        for call in self.calls():
+            total = totals.setdefault(f"{call['tool']}:{call['action']}", [0, 0.0])
+            total[0] += 1
+            total[1] += call['duration']
+        ConsoleStyle.print_section("WYWOŁANIA NARZĘDZI", icon='🧪')
+        for key, (count, duration) in sorted(totals.items()):
+            print_if_not_quiet(f"{key:<24}{count:>8}{duration:>12.3f}s")
+
+
+def parse_expectation(spec: str, sign_count: int) -> Tuple[str, int]:
+    """NARZĘDZIE[:AKCJA]=LICZBA, gdzie LICZBA może być słowem 'signs' (liczba znaków w bazie)"""
+    key, separator, value = spec.partition('=')
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Nieprawidłowe oczekiwanie [{spec}] (format: narzędzie[:akcja]=liczba)")
+    return key, sign_count if value == 'signs' else int(value)
+
+
+def run_processor(processor_args: List[str]) -> int:
+    """Uruchom main() procesora w bieżącym procesie (atrapy widoczne przez PATH); zwraca kod wyjścia"""
+    import road_sign_processor
+
+    saved_argv = sys.argv
+    sys.argv = ['road_sign_processor.py'] + processor_args
+    try:
+        road_sign_processor.main()
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    finally:
+        sys.argv = saved_argv
+        # Zamknięcie silnika kończy sesję `inkscape --shell`, więc trafia ona do dziennika przed raportem
+        road_sign_processor.set_rasterizer(road_sign_processor.DEFAULT_RASTERIZER)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Uruchamia procesor w kopii projektu z atrapami narzędzi i lokalnym serwerem zamiast Wikipedii",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Przykłady użycia:
+  python3 fake_tools.py all  # pobieranie z lokalnego serwera, rasteryzacja atrapą Inkscape
+  python3 fake_tools.py --expect inkscape:export=signs --expect magick=0 -- all -s
+  python3 fake_tools.py --fixtures tests/fixtures -- a_1 b_20  # pliki Nazwa.svg i Nazwa.svg.html z katalogu
+
+Argumenty po "--" przekazywane są do road_sign_processor.py (domyślnie "all")
+Oczekiwania: narzędzie[:akcja]=liczba lub =signs (liczba znaków w bazie); akcje: export, shell, version,
+render, convert, identify, fetch oraz dla serwera http: api, page, file
+        """
+    )
+    parser.add_argument('--fixtures', help='Katalog z plikami SVG i stronami HTML (domyślnie pliki wygenerowane)')
+    parser.add_argument('--database', default='database.json', help='Ścieżka do bazy danych')
+    parser.add_argument('--expect', action='append', default=[], metavar='NARZĘDZIE[:AKCJA]=N',
+                        help='Oczekiwana liczba wywołań (można podać wiele razy)')
+    parser.add_argument('--workdir', help='Katalog kopii projektu zachowany po przebiegu (domyślnie tymczasowy)')
+    parser.add_argument('processor_args', nargs='*', help='Argumenty procesora (po "--")')
+    args = parser.parse_args()
+
+    from pipeline_benchmark import copy_tool_tree, write_fixture_svgs
+    from sign_catalog import SignCatalog
+
+    source_root = os.path.dirname(os.path.abspath(__file__))
+    processor_args = args.processor_args or ['all']
+    catalog = SignCatalog.load(args.database)
+    try:
+        expectations = dict(parse_expectation(spec, len(catalog)) for spec in args.expect)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    workspace = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='fake_tools_run.')
+    original_dir = os.getcwd()
+    try:
+        copy_tool_tree(workspace, source_root)
+        shutil.copy2(args.database, os.path.join(workspace, 'database.json'))
+        if {'-s', '--skip-download'} & set(processor_args):
+            write_fixture_svgs(workspace, catalog)
+
+        with FakeToolbox(args.fixtures) as tools:
+            if not {'-s', '--skip-download', '--base-url'} & set(processor_args):
+                processor_args += ['--base-url', tools.base_url]
+                # Lokalny serwer nie wymaga limitu zapytań, który chroni Wikipedię
+                if '--rate' not in processor_args:
+                    processor_args += ['--rate', '0']
+            os.chdir(workspace)
+            started = time.perf_counter()
+            returncode = run_processor(processor_args)
+            duration = time.perf_counter() - started
+            os.chdir(original_dir)
+            # Raport harnessu wypisywany także wtedy, gdy procesor działał w trybie cichym
+            ConsoleStyle.set_quiet_mode(False)
+
+            tools.print_report()
+            print_if_not_quiet(ConsoleStyle.info(f"Przebieg procesora: [{duration:.2f}s], kod wyjścia [{returncode}]"))
+            try:
+                tools.expect(expectations)
+            except HarnessError as e:
+                print_if_not_quiet(ConsoleStyle.error(f"Niespełnione oczekiwania: {e}"))
+                sys.exit(1)
+            if expectations:
+                print_if_not_quiet(ConsoleStyle.success(f"Spełniono [{len(expectations)}] oczekiwań"))
+    finally:
+        os.chdir(original_dir)
+        if not args.workdir:
+            shutil.rmtree(workspace, ignore_errors=True)
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Odczyt wymiarów obrazów PNG z nagłówka IHDR (pierwsze 33 bajty) z trwałym indeksem (.build-cache/image_metadata.json)
+"""
+import json
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+from build_cache import BUILD_CACHE_DIR
+from emitter import atomic_open
+
+IMAGE_METADATA_PATH = os.path.join(BUILD_CACHE_DIR, "image_metadata.json")
+IMAGE_METADATA_VERSION = 1
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Sygnatura (8) + długość i typ fragmentu (8) + dane IHDR (13) + CRC (4)
+PNG_HEADER_SIZE = 33
+
+# Typy kolorów PNG (bajt color type w IHDR)
+PNG_COLOR_TYPES = {0: 'grayscale', 2: 'rgb', 3: 'palette', 4: 'grayscale_alpha', 6: 'rgba'}
+
+
+class PngHeader:
+    """Dane z fragmentu IHDR pliku PNG"""
+
+    __slots__ = ('width', 'height', 'bit_depth', 'color_type')
+
+    def __init__(self, width: int, height: int, bit_depth: int, color_type: int):
+        self.width = width
+        self.height = height
+        self.bit_depth = bit_depth
+        self.color_type = color_type
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def color_type_name(self) -> str:
+        return PNG_COLOR_TYPES.get(self.color_type, f'unknown({self.color_type})')
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'width': self.width, 'height': self.height, 'bit_depth': self.bit_depth, 'color_type': self.color_type}
+
+    def __repr__(self):
+        return f"PngHeader({self.width}x{self.height}, {self.bit_depth}-bit {self.color_type_name})"
+
+
+def parse_png_header(data: bytes) -> Optional[PngHeader]:
+    """Odczytaj IHDR z początku pliku; None, jeśli to nie jest poprawny nagłówek PNG"""
+    if len(data) < PNG_HEADER_SIZE or not data.startswith(PNG_SIGNATURE) or data[12:16] != b'IHDR':
+        return None
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', data[16:26])
+    return PngHeader(width, height, bit_depth, color_type)
+
+
+def read_png_header(path: str) -> Optional[PngHeader]:
+    """Wczytaj tylko nagłówek pliku PNG (33 bajty) — bez dekodowania obrazu"""
+    try:
+        with open(path, 'rb') as f:
+            return parse_png_header(f.read(PNG_HEADER_SIZE))
+    except OSError:
+        return None
+
+
+class ImageMetadataIndex:
+    """Indeks nagłówków PNG według ścieżki; wpis jest ważny, dopóki plik ma ten sam mtime i rozmiar"""
+
+    def __init__(self, index_path: str = IMAGE_METADATA_PATH):
+        self.index_path = index_path
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+        self.read_count = 0
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.index_path):
+                try:
+                    with open(self.index_path, 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                    if index.get('version') == IMAGE_METADATA_VERSION:
+                        self._entries = index.get('images', {})
+                except (OSError, ValueError):
+                    self._entries = {}
+        return self._entries
+
+    def get(self, path: str) -> Optional[PngHeader]:
+        """Nagłówek PNG z indeksu lub z pliku, jeśli plik zmienił się od ostatniego odczytu"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        key = os.path.normpath(path)
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return PngHeader(entry['width'], entry['height'], entry['bit_depth'], entry['color_type'])
+
+        header = read_png_header(path)
+        self.read_count += 1
+        if header is None:
+            if self.entries.pop(key, None) is not None:
+                self._dirty = True
+            return None
+        self.entries[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, **header.to_dict()}
+        self._dirty = True
+        return header
+
+    def dimensions(self, path: str) -> Tuple[Optional[int], Optional[int]]:
+        """Wymiary obrazu (szerokość, wysokość) lub (None, None)"""
+        header = self.get(path)
+        return header.size if header else (None, None)
+
+    def save(self) -> bool:
+        """Zapisz indeks atomowo, jeśli coś się zmieniło"""
+        if not self._dirty:
+            return False
+
+        with atomic_open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': IMAGE_METADATA_VERSION, 'images': dict(sorted(self.entries.items()))}, f)
+
+        self._dirty = False
+        return True
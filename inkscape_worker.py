@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Długo działający proces Inkscape (--shell) eksportujący wiele plików SVG→PNG bez ponownego uruchamiania
+"""
+import os
+import queue
+import struct
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+INKSCAPE_EXECUTABLE = "inkscape"
+SHELL_PROMPT = b"> "
+# Nazwa pliku wynikowego oznaczająca standardowe wyjście (eksport do pamięci, bez pliku)
+STDOUT_FILENAME = "-"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+DEFAULT_STARTUP_TIMEOUT = 60
+DEFAULT_EXPORT_TIMEOUT = 60
+MAX_STDERR_LINES = 50
+
+
+class InkscapeError(Exception):
+    """Proces Inkscape nie odpowiada lub nie udało się go uruchomić"""
+
+
+def png_end(data: bytes, start: int) -> Optional[int]:
+    """Pozycja tuż za chunkiem IEND obrazu PNG zaczynającego się w `start`; None, jeśli obraz jest niepełny"""
+    offset = start + len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[offset:offset + 8])
+        offset += 12 + length
+        if chunk_type == b'IEND':
+            return offset if offset <= len(data) else None
+    return None
+
+
+class ExportJob:
+    """Zadanie eksportu jednego pliku SVG do PNG o zadanych wymiarach"""
+
+    __slots__ = ('svg_path', 'png_path', 'width', 'height')
+
+    def __init__(self, svg_path: str, png_path: str, width: int, height: int):
+        self.svg_path = svg_path
+        self.png_path = png_path
+        self.width = width
+        self.height = height
+
+    def actions(self) -> str:
+        """Akcje Inkscape eksportujące plik (jedna linia poleceń powłoki)"""
+        return ";".join([
+            f"file-open:{os.path.abspath(self.svg_path)}",
+            "export-type:png",
+            f"export-filename:{self.png_path if self.png_path == STDOUT_FILENAME else os.path.abspath(self.png_path)}",
+            f"export-width:{self.width}",
+            f"export-height:{self.height}",
+            "export-background-opacity:0",
+            "export-background:transparent",
+            "export-png-color-mode:RGBA_8",
+            "export-do",
+            "file-close",
+        ])
+
+    def __repr__(self):
+        return f"ExportJob({self.svg_path!r} → {self.png_path!r}, {self.width}x{self.height})"
+
+
+class ExportResult:
+    """Wynik eksportu pojedynczego pliku"""
+
+    __slots__ = ('job', 'success', 'error', 'duration', 'data')
+
+    def __init__(self, job: ExportJob, success: bool, error: Optional[str] = None, duration: float = 0.0,
+                 data: Optional[bytes] = None):
+        self.job = job
+        self.success = success
+        self.error = error
+        self.duration = duration
+        # Treść PNG przy eksporcie na standardowe wyjście (export_data)
+        self.data = data
+
+    def __bool__(self):
+        return self.success
+
+    def __repr__(self):
+        status = "ok" if self.success else f"błąd: {self.error}"
+        return f"ExportResult({self.job.png_path!r}, {status}, {self.duration:.2f}s)"
+
+
+class InkscapeShell:
+    """Jeden proces `inkscape --shell`, któremu zlecane są kolejne eksporty
+
+    Koszt uruchomienia Inkscape (GTK, rozszerzenia, czcionki) ponoszony jest raz na proces,
+    a nie raz na plik. Po przekroczeniu limitu czasu proces jest zabijany i uruchamiany
+    ponownie przy następnym zadaniu.
+    """
+
+    def __init__(self, executable: str = INKSCAPE_EXECUTABLE, startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
+                 export_timeout: float = DEFAULT_EXPORT_TIMEOUT):
+        self.executable = executable
+        self.startup_timeout = startup_timeout
+        self.export_timeout = export_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._stdout: Optional[queue.Queue] = None
+        self._stderr = deque(maxlen=MAX_STDERR_LINES)
+        self._lock = threading.Lock()
+        self.start_count = 0
+        self.export_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        """Uruchom proces i poczekaj na znak zachęty powłoki"""
+        if self.running:
+            return
+        try:
+            self._process = subprocess.Popen([self.executable, '--shell'], stdin=subprocess.PIPE,
+                                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+        except OSError as e:
+            self._process = None
+            raise InkscapeError(f"Nie udało się uruchomić [{self.executable}]: {e}") from e
+
+        self._stdout = queue.Queue()
+        self._stderr.clear()
+        threading.Thread(target=self._pump_stdout, args=(self._process.stdout, self._stdout), daemon=True).start()
+        threading.Thread(target=self._pump_stderr, args=(self._process.stderr,), daemon=True).start()
+        self.start_count += 1
+        try:
+            self._wait_for_prompt(self.startup_timeout)
+        except InkscapeError:
+            self._kill()
+            raise
+
+    @staticmethod
+    def _pump_stdout(stream, chunks: queue.Queue):
+        while True:
+            chunk = stream.read1(4096) if hasattr(stream, 'read1') else stream.read(4096)
+            chunks.put(chunk)
+            if not chunk:
+                return
+
+    def _pump_stderr(self, stream):
+        for line in iter(stream.readline, b''):
+            self._stderr.append(line.decode('utf-8', errors='replace').rstrip())
+
+    def _wait_for_prompt(self, timeout: float) -> str:
+        """Czytaj wyjście do znaku zachęty; zwraca tekst wypisany przed nim"""
+        deadline = time.monotonic() + timeout
+        output = b""
+        while not output.endswith(SHELL_PROMPT):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise InkscapeError(f"Inkscape nie odpowiada od {timeout:.0f}s")
+            try:
+                chunk = self._stdout.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if not chunk:
+                raise InkscapeError("Proces Inkscape zakończył się nieoczekiwanie")
+            output += chunk
+        return output[:-len(SHELL_PROMPT)].decode('utf-8', errors='replace')
+
+    def _wait_for_png(self, timeout: float) -> Optional[bytes]:
+        """Czytaj wyjście do znaku zachęty za pełnym obrazem PNG (bajty obrazu mogą zawierać znak zachęty);
+        zwraca obraz lub None, jeśli Inkscape go nie wypisał"""
+        deadline = time.monotonic() + timeout
+        output = b""
+        while True:
+            start = output.find(PNG_SIGNATURE)
+            end = png_end(output, start) if start >= 0 else None
+            complete = start < 0 or (end is not None and end <= len(output) - len(SHELL_PROMPT))
+            if complete and output.endswith(SHELL_PROMPT):
+                return output[start:end] if end is not None else None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise InkscapeError(f"Inkscape nie odpowiada od {timeout:.0f}s")
+            try:
+                chunk = self._stdout.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if not chunk:
+                raise InkscapeError("Proces Inkscape zakończył się nieoczekiwanie")
+            output += chunk
+
+    def _send(self, line: str):
+        try:
+            self._process.stdin.write(line.encode('utf-8') + b"\n")
+            self._process.stdin.flush()
+        except OSError as e:
+            raise InkscapeError(f"Nie udało się wysłać polecenia do Inkscape: {e}") from e
+
+    def _command(self, line: str, timeout: float) -> str:
+        self._send(line)
+        return self._wait_for_prompt(timeout)
+
+    def export(self, job: ExportJob) -> ExportResult:
+        """Wyeksportuj jeden plik; błąd dotyczy tylko tego pliku"""
+        started = time.perf_counter()
+        if ';' in job.svg_path or ';' in job.png_path:
+            return ExportResult(job, False, "ścieżka zawiera znak ';'", 0.0)
+
+        # Eksport do pliku tymczasowego: istnienie pliku po poleceniu oznacza sukces, a PNG podmieniany jest atomowo
+        output_dir = os.path.dirname(os.path.abspath(job.png_path))
+        temp_path = os.path.join(output_dir, f".{os.path.basename(job.png_path)}.inkscape.png")
+        temp_job = ExportJob(job.svg_path, temp_path, job.width, job.height)
+        with self._lock:
+            try:
+                self.start()
+                os.makedirs(output_dir, exist_ok=True)
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                self._stderr.clear()
+                self._command(temp_job.actions(), self.export_timeout)
+            except InkscapeError as e:
+                self._kill()
+                return ExportResult(job, False, str(e), time.perf_counter() - started)
+            self.export_count += 1
+
+            if not os.path.exists(temp_path):
+                error = "\n".join(self._stderr) or "Inkscape nie utworzył pliku"
+                return ExportResult(job, False, error, time.perf_counter() - started)
+        os.replace(temp_path, job.png_path)
+        return ExportResult(job, True, None, time.perf_counter() - started)
+
+    def export_data(self, svg_path: str, width: int, height: int) -> ExportResult:
+        """Wyeksportuj plik na standardowe wyjście powłoki; PNG w result.data, bez pliku na dysku"""
+        started = time.perf_counter()
+        job = ExportJob(svg_path, STDOUT_FILENAME, width, height)
+        if ';' in svg_path:
+            return ExportResult(job, False, "ścieżka zawiera znak ';'", 0.0)
+        with self._lock:
+            try:
+                self.start()
+                self._stderr.clear()
+                self._send(job.actions())
+                data = self._wait_for_png(self.export_timeout)
+            except InkscapeError as e:
+                self._kill()
+                return ExportResult(job, False, str(e), time.perf_counter() - started)
+            self.export_count += 1
+            if data is None:
+                error = "\n".join(self._stderr) or "Inkscape nie wypisał obrazu PNG"
+                return ExportResult(job, False, error, time.perf_counter() - started)
+        return ExportResult(job, True, None, time.perf_counter() - started, data)
+
+    def export_batch(self, jobs: Iterable[ExportJob]) -> List[ExportResult]:
+        """Wyeksportuj wiele plików w jednym procesie; wyniki w kolejności zadań"""
+        return [self.export(job) for job in jobs]
+
+    def _kill(self):
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process.wait()
+            self._process = None
+
+    def close(self):
+        """Zakończ proces Inkscape (poleceniem quit, a w razie potrzeby siłą)"""
+        with self._lock:
+            if not self.running:
+                self._process = None
+                return
+            try:
+                self._process.stdin.write(b"quit\n")
+                self._process.stdin.close()
+                self._process.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._kill()
+
+    def __enter__(self) -> 'InkscapeShell':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
@@ -5,9 +5,14 @@ Biblioteka z funkcjami weryfikacji strukturę paczki Minecraft
 import json
 import os
 import sys
-from typing import Any, Dict, List, Callable, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Callable, Optional, Tuple
 
-from console_utils import ConsoleStyle, print_if_not_quiet
+from console_utils import ConsoleStyle, print_if_not_quiet, thread_output_routing
+from project_snapshot import (BLOCKS_DIR, CRAFTING_CATALOG_PATH, ITEM_TEXTURE_PATH, ITEMS_DIR, LANGUAGES_PATH,
+                              TERRAIN_TEXTURE_PATH, get_project_snapshot)
+from schema_validation import SCHEMAS, schema_kind_for_path, validate_document
 
 
 class MinecraftUtils:
@@ -48,110 +53,84 @@ class MinecraftUtils:
 
     # ===== FUNKCJE POMOCNICZE =====
 
+    # Wszystkie pliki projektu czytane są z migawki (project_snapshot.py): jedno przejście po drzewie
+    # i jedno parsowanie pliku na cały przebieg weryfikacji. Bloki i itemy sprawdzane są przez fakty wyciągnięte
+    # z pojedynczych plików, które przy --changed-only pochodzą z pamięci podręcznej dla niezmienionych plików.
+
     @staticmethod
     def _get_bp_blocks():
-        """Pobierz wszystkie bloki z BP"""
-        blocks = {}
-        for root, dirs, files in os.walk("BP/blocks"):
-            for file in files:
-                if file.endswith('.block.json'):
-                    file_path = os.path.join(root, file)
-                    data = MinecraftUtils.load_json_file(file_path)
-                    if data:
-                        blocks[file.replace('.block.json', '')] = data
-        return blocks
+        """Pobierz fakty wszystkich bloków z BP: block_id → identifier, geometry, textures, errors, warnings"""
+        return get_project_snapshot().facts_in(BLOCKS_DIR, '.block.json', MinecraftUtils._extract_block_facts)
 
     @staticmethod
     def _get_bp_items():
-        """Pobierz wszystkie itemy z BP"""
-        items = {}
-        for root, dirs, files in os.walk("BP/items"):
-            for file in files:
-                if file.endswith('.item.json'):
-                    file_path = os.path.join(root, file)
-                    data = MinecraftUtils.load_json_file(file_path)
-                    if data:
-                        items[file.replace('.item.json', '')] = data
-        return items
+        """Pobierz fakty wszystkich itemów z BP: item_id → icon"""
+        return get_project_snapshot().facts_in(ITEMS_DIR, '.item.json', MinecraftUtils._extract_item_facts)
 
     @staticmethod
-    def _get_rp_block_model_dimensions():
-        model_dimensions = {}
-        for root, dirs, files in os.walk("RP/models/blocks"):
-            for file in files:
-                if file.endswith('.geo.json'):
-                    model_name = file.replace('.geo.json', '')
-                    model_path = os.path.join(root, file)
-                    width, height = MinecraftUtils._get_model_dimensions(model_path)
-                    if width and height:
-                        model_dimensions[model_name] = (width, height)
-        return model_dimensions
+    def _extract_block_facts(path):
+        """Fakty pliku bloku i wynik sprawdzenia jego struktury"""
+        block_data = get_project_snapshot().load_json(path)
+        if not block_data:
+            return None
 
-    @staticmethod
-    def _get_model_dimensions(model_path):
-        """Pobierz wymiary modelu z pliku .geo.json"""
-        model_data = MinecraftUtils.load_json_file(model_path)
-        if 'minecraft:geometry' in model_data and isinstance(model_data['minecraft:geometry'], list) and len(
-                model_data['minecraft:geometry']) > 0:
-            geometry = model_data['minecraft:geometry'][0]
-            if 'description' in geometry:
-                description = geometry['description']
-                if 'texture_width' in description and 'texture_height' in description:
-                    return description['texture_width'], description['texture_height']
-
-        return None, None
+        block_id = os.path.basename(path)[:-len('.block.json')]
+        errors, warnings = MinecraftUtils._verify_block_structure(block_id, block_data)
+        block_section = block_data.get('minecraft:block', {})
+        return {
+            'identifier': block_section.get('description', {}).get('identifier'),
+            'geometry': block_section.get('components', {}).get('minecraft:geometry', ''),
+            'textures': MinecraftUtils._verify_material_instances(block_data),
+            'errors': errors,
+            'warnings': warnings,
+        }
 
     @staticmethod
-    def _find_category_for_block_id(block_id):
-        """Znajdź kategorię dla znaku w bazie danych"""
-        if not os.path.exists(MinecraftUtils.DATABASE_FILE_NAME):
+    def _extract_item_facts(path):
+        """Fakty pliku itemu"""
+        item_data = get_project_snapshot().load_json(path)
+        if not item_data:
             return None
-        data = MinecraftUtils.load_json_file('database.json')
-        if not data:
-            return None
-
-        for category in data['categories']:
-            if block_id in data['categories'][category]['blocks']:
-                return category
-
-        return None
+        return {'icon': MinecraftUtils._verify_icon(item_data)}
 
     @staticmethod
-    def _find_similar_model(model_name, available_models):
-        """Znajdź podobny model, jeśli dokładny nie istnieje"""
-        if model_name in available_models:
-            return model_name
+    def _extract_schema_errors(path):
+        """Błędy pliku względem jego schematu (schema_validation)"""
+        try:
+            data = get_project_snapshot().load_json(path)
+        except ValueError as e:
+            return [f"$: invalid JSON: {e}"]
+        return validate_document(path, data)
 
-        # Próbuj znaleźć podobny model
-        base_name = model_name.split('_')[0]  # np. "road_sign_rectangle"
-        for available_model in available_models:
-            if available_model.startswith(base_name):
-                return available_model
+    @staticmethod
+    def _get_rp_block_model_dimensions():
+        return get_project_snapshot().model_dimensions
 
-        return None
+    @staticmethod
+    def _find_category_for_block_id(block_id):
+        """Znajdź kategorię dla znaku w bazie danych"""
+        return get_project_snapshot().database_categories.get(block_id)
 
     # ===== WSPÓLNE FUNKCJE POMOCNICZE =====
 
     @staticmethod
     def _verify_texture_mappings():
         """Wspólna weryfikacja mapowań terrain_texture.json"""
-        try:
-            terrain_data = MinecraftUtils.load_json_file('RP/textures/terrain_texture.json')
-        except FileNotFoundError:
-            terrain_data = []
-        try:
-            item_data = MinecraftUtils.load_json_file('RP/textures/item_texture.json')
-        except FileNotFoundError:
-            item_data = {}
+        snapshot = get_project_snapshot()
+        terrain_data = snapshot.load_optional_json(TERRAIN_TEXTURE_PATH, {})
+        item_data = snapshot.load_optional_json(ITEM_TEXTURE_PATH, {})
         if not terrain_data and not item_data:
             return [], [], [], []
 
         missing_textures = []
         valid_textures = []
 
+        # Kopie wpisów: uzupełnienie rozszerzenia '.png' nie zmienia danych współdzielonych w migawce
         groups = {
-            'blocks': terrain_data.get('texture_data', {}),
-            'items': item_data.get('texture_data', {})
+            'blocks': {texture_id: dict(texture_info)
+                       for texture_id, texture_info in terrain_data.get('texture_data', {}).items()},
+            'items': {texture_id: dict(texture_info)
+                      for texture_id, texture_info in item_data.get('texture_data', {}).items()},
         }
 
         for key, data in groups.items():
@@ -161,9 +140,9 @@ class MinecraftUtils:
                 texture_path = texture_info.get('textures')
                 if texture_path:
                     full_path = os.path.join("RP/", texture_path)
-                    if os.path.exists(full_path):
+                    if snapshot.exists(full_path):
                         valid_textures.append(texture_id)
-                    elif os.path.exists(full_path + '.png'):
+                    elif snapshot.exists(full_path + '.png'):
                         valid_textures.append(texture_id)
                         groups[key][texture_id]['textures'] = texture_path + '.png'
                     else:
@@ -174,15 +153,7 @@ class MinecraftUtils:
     @staticmethod
     def _verify_png_files():
         """Wspólna weryfikacja plików PNG"""
-        all_png_files = set()
-
-        for root, dirs, files in os.walk("RP/textures/"):
-            for file in files:
-                if file.endswith('.png'):
-                    full_path = os.path.join(root, file).replace('RP/', '')
-                    all_png_files.add(full_path)
-
-        return all_png_files
+        return set(get_project_snapshot().png_files)
 
     @staticmethod
     def _verify_material_instances(block_data):
@@ -254,19 +225,11 @@ class MinecraftUtils:
 
     @staticmethod
     def _get_database_block_ids():
-        """Pobierz wszystkie bloki z bazy danych"""
-
-        data = MinecraftUtils.load_json_file(MinecraftUtils.DATABASE_FILE_NAME)
-        if not data:
-            return set()
-
-        database_block_ids = set()
-        for category in data['categories']:
-            signs = data['categories'][category]['blocks']
-            for block_id in signs.keys():
-                database_block_ids.add(block_id)
-
-        return database_block_ids
+        """Pobierz wszystkie bloki z bazy danych (brak pliku → FileNotFoundError, uszkodzony plik → ValueError)"""
+        snapshot = get_project_snapshot()
+        if snapshot.database is None:
+            raise FileNotFoundError(f"No such file: '{MinecraftUtils.DATABASE_FILE_NAME}'")
+        return set(snapshot.database_categories)
 
     # ===== SPECJALIZOWANE FUNKCJE WERYFIKACJI =====
 
@@ -279,11 +242,11 @@ class MinecraftUtils:
         blocks_loaded = []
         blocks_with_errors = []
 
-        for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
+        for block_id, block_facts in MinecraftUtils._get_bp_blocks().items():
             blocks_loaded.append(block_id)
-            structure_errors, structure_warnings = MinecraftUtils._verify_block_structure(block_id, block_data)
+            structure_errors = block_facts['errors']
             errors.extend(structure_errors)
-            warnings.extend(structure_warnings)
+            warnings.extend(block_facts['warnings'])
 
             if structure_errors:
                 blocks_with_errors.append(block_id)
@@ -310,7 +273,7 @@ class MinecraftUtils:
             category = MinecraftUtils._find_category_for_block_id(block_id)
             if category:
                 block_path = f"BP/blocks/{category.lower()}/{block_id}.block.json"
-                if os.path.exists(block_path):
+                if get_project_snapshot().exists(block_path):
                     file_blocks_found += 1
                 else:
                     file_blocks_missing.add(block_id)
@@ -357,20 +320,20 @@ class MinecraftUtils:
         stats = {}
 
         model_dimensions = MinecraftUtils._get_rp_block_model_dimensions()
+        model_index = get_project_snapshot().model_index
         missing_models = []
 
         # Sprawdź modele używane w blokach
-        for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
-            geometry = block_data.get('minecraft:block', {}).get('components', {}).get(
-                'minecraft:geometry', '')
+        for block_id, block_facts in MinecraftUtils._get_bp_blocks().items():
+            geometry = block_facts['geometry']
             if geometry:
                 model_name = geometry.replace('geometry.', '')
 
-                # Sprawdź, czy model istnieje
-                actual_model_name = MinecraftUtils._find_similar_model(model_name,
-                                                                       model_dimensions.keys())
-                if not actual_model_name:
-                    missing_models.append(f"{block_id} (model: {model_name})")
+                # Sprawdź, czy model istnieje (najbliższy model jest tylko podpowiedzią w raporcie)
+                if model_name not in model_index:
+                    nearest_model = model_index.nearest(model_name)
+                    missing_models.append(f"{block_id} (model: {model_name}"
+                                          + (f", nearest: {nearest_model})" if nearest_model else ")"))
 
         stats[ConsoleStyle.info("Available models")] = f"[{len(model_dimensions)}]"
         stats[ConsoleStyle.error("Missing models") if missing_models else ConsoleStyle.info("Missing models")] \
@@ -396,10 +359,8 @@ class MinecraftUtils:
         unused_models = set()
 
         # Sprawdź, które modele są używane
-        for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
-
-            geometry = block_data.get('minecraft:block', {}).get('components', {}).get(
-                'minecraft:geometry', '')
+        for block_id, block_facts in MinecraftUtils._get_bp_blocks().items():
+            geometry = block_facts['geometry']
             if geometry:
                 model_name = geometry.replace('geometry.', '')
                 used_models.add(model_name)
@@ -489,10 +450,8 @@ class MinecraftUtils:
         valid_textures, missing_textures, terrain_texture_mappings, item_texture_mappings = MinecraftUtils._verify_texture_mappings()
 
         # Sprawdź tekstury używane w blokach
-        for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
-            # Użyj wspólnej funkcji do weryfikacji material_instances
-            textures = MinecraftUtils._verify_material_instances(block_data)
-            for face, texture_name in textures:
+        for block_id, block_facts in MinecraftUtils._get_bp_blocks().items():
+            for face, texture_name in block_facts['textures']:
                 if texture_name.startswith("minecraft:") or texture_name in MinecraftUtils.get_builtin_textures():
                     build_in_textures.add(texture_name)
                 else:
@@ -536,8 +495,8 @@ class MinecraftUtils:
         valid_textures, missing_textures, terrain_texture_mappings, item_texture_mappings = MinecraftUtils._verify_texture_mappings()
 
         # Sprawdź tekstury używane w blokach
-        for item_id, item_data in MinecraftUtils._get_bp_items().items():
-            texture_name = MinecraftUtils._verify_icon(item_data)
+        for item_id, item_facts in MinecraftUtils._get_bp_items().items():
+            texture_name = item_facts['icon']
             if texture_name.startswith("minecraft:") or texture_name in MinecraftUtils.get_builtin_textures():
                 build_in_textures.add(texture_name)
             else:
@@ -582,12 +541,15 @@ class MinecraftUtils:
         errors.extend(structure_errors)
         warnings.extend(structure_warnings)
 
+        # Bez bazy danych pokrycia bloków nie da się sprawdzić — to błąd, a nie pominięte sprawdzenie
         try:
             database_block_ids = MinecraftUtils._get_database_block_ids()
-        except FileNotFoundError:
-            database_block_ids = {}
-
-        if isinstance(database_block_ids, list):
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            errors.append(f"Cannot load database [{MinecraftUtils.DATABASE_FILE_NAME}]: {e}")
+            return errors, warnings
+        if not database_block_ids:
+            errors.append(f"No blocks defined in database [{MinecraftUtils.DATABASE_FILE_NAME}]")
+        else:
             coverage_errors, coverage_warnings = MinecraftUtils._verify_database_block_coverage(database_block_ids)
             errors.extend(coverage_errors)
             warnings.extend(coverage_warnings)
@@ -655,8 +617,7 @@ class MinecraftUtils:
 
         for file_path, pack_type in manifest_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = get_project_snapshot().load_json(file_path)
 
                 # Check required fields
                 required_fields = ['format_version', 'header']
@@ -694,6 +655,32 @@ class MinecraftUtils:
 
         return errors, warnings
 
+    @staticmethod
+    def verify_schemas():
+        """Validate blocks, geometries, manifests and the crafting catalog against their compiled schemas"""
+        errors = []
+        warnings = []
+
+        snapshot = get_project_snapshot()
+        validated = {kind: 0 for kind in SCHEMAS}
+        invalid_files = []
+        for path in sorted(snapshot.files):
+            kind = schema_kind_for_path(path)
+            if kind is None:
+                continue
+            validated[kind] += 1
+            file_errors = snapshot.file_facts(path, MinecraftUtils._extract_schema_errors)
+            if file_errors:
+                invalid_files.append(path)
+                errors.extend(f"{path} {error}" for error in file_errors)
+
+        stats = {ConsoleStyle.info(f"{kind.capitalize()} files"): f"[{count}]" for kind, count in validated.items()}
+        stats[ConsoleStyle.error("Invalid files") if invalid_files else ConsoleStyle.info("Invalid files")] \
+            = f"[{len(invalid_files)}] ({', '.join(invalid_files)})" if invalid_files else "0"
+        ConsoleStyle.print_stats(stats, "SCHEMA VALIDATION", icon="🧾")
+
+        return errors, warnings
+
     @staticmethod
     def verify_config():
         """Weryfikuj plik config.json"""
@@ -702,13 +689,12 @@ class MinecraftUtils:
         warnings = []
 
         config_path = "config.json"
-        if not os.path.exists(config_path):
+        if not get_project_snapshot().exists(config_path):
             print_if_not_quiet(ConsoleStyle.info("config.json not found - skipping config verification"))
             return errors, warnings
 
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = get_project_snapshot().load_json(config_path)
 
             # Check required fields
             required_fields = ['type', 'name', 'namespace', 'targetVersion']
@@ -727,9 +713,9 @@ class MinecraftUtils:
 
                 # Check if a namespace is used in block files
                 namespace_used = False
-                for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
-                    if 'minecraft:block' in block_data:
-                        identifier = block_data['minecraft:block']['description'].get('identifier', '')
+                for block_id, block_facts in MinecraftUtils._get_bp_blocks().items():
+                    if block_facts['identifier']:
+                        identifier = block_facts['identifier']
                         if identifier.startswith(f"{MinecraftUtils.namespace}:"):
                             namespace_used = True
                             break
@@ -758,18 +744,10 @@ class MinecraftUtils:
         stats: Dict[str, Any] = {}
 
         total_files = 0
-        # Count files by directory
-        for root, dirs, files in os.walk("."):
-            # Skip git and cache directories
-            if any(skip in root for skip in ['.git', '.idea', '__pycache__', 'venv', 'dist']):
-                continue
-
-            rel_path = os.path.relpath(root, ".")
-            if rel_path == ".":
-                rel_path = ""
-
-            stats[ConsoleStyle.info(f"/{rel_path}", icon='📁')] = f"[{len(files)}] files"
-            total_files += len(files)
+        # Count files by directory (git and cache directories are skipped by the snapshot scan)
+        for rel_path, file_count in get_project_snapshot().dir_file_counts:
+            stats[ConsoleStyle.info(f"/{rel_path.rstrip('/')}", icon='📁')] = f"[{file_count}] files"
+            total_files += file_count
 
         ConsoleStyle.print_stats(stats, f"PROJECT FILES ([{total_files}])", icon="📦")
 
@@ -820,7 +798,7 @@ class MinecraftUtils:
 
         item_stats = {}
         for file_path, state in sorted(locations.items(), key=lambda item: item[0]):
-            if os.path.exists(file_path):
+            if get_project_snapshot().exists(file_path):
                 item_stats[ConsoleStyle.success(file_path, icon=f'📁' if file_path.endswith(
                     '/') else '📄')] = f"Found {state_name[state]}"
             else:
@@ -842,12 +820,18 @@ class MinecraftUtils:
         errors = []
         warnings = []
 
+        snapshot = get_project_snapshot()
+
+        # Przestrzeń nazw ustawia verify_config, ale w puli wątków kolejność sprawdzeń nie jest zagwarantowana
+        if MinecraftUtils.namespace is None:
+            try:
+                MinecraftUtils.namespace = snapshot.load_optional_json("config.json", {}).get('namespace')
+            except ValueError:
+                pass
+
         # Check languages.json
         try:
-            try:
-                languages_list = MinecraftUtils.load_json_file('RP/texts/languages.json')
-            except FileNotFoundError:
-                languages_list = {}
+            languages_list = snapshot.load_optional_json(LANGUAGES_PATH, {})
 
             # languages.json is a list, not an object
             if isinstance(languages_list, list):
@@ -855,15 +839,18 @@ class MinecraftUtils:
 
                 # Wczytaj bloki
                 project_block_translations = set()
-                for block_id, block_data in MinecraftUtils._get_bp_blocks().items():
-                    block_name = block_data['minecraft:block']['description']['identifier']
+                for block_id, block_facts in MinecraftUtils._get_bp_blocks().items():
+                    block_name = block_facts['identifier']
+                    if not block_name:
+                        # Brak identyfikatora zgłasza sprawdzenie struktury bloków
+                        continue
                     project_block_translations.add(block_name.replace(f'{MinecraftUtils.namespace}:', ''))
 
                 # Wczytaj bazę danych
                 database_block_ids = set()
                 database_categories = set()
-                if os.path.exists(MinecraftUtils.DATABASE_FILE_NAME):
-                    database_file_content = MinecraftUtils.load_json_file(MinecraftUtils.DATABASE_FILE_NAME)
+                if snapshot.database:
+                    database_file_content = snapshot.database
                     for category in database_file_content['categories']:
                         group_name = database_file_content['categories'][category]['crafting_group']
                         database_categories.add(f"{group_name}")
@@ -872,37 +859,25 @@ class MinecraftUtils:
 
                 # Check if language files exist
                 for lang_name in languages_list:
-                    lang_path = f"RP/texts/{lang_name}.lang"
                     lang_file_block_translations = set()
                     lang_file_category_translations = set()
                     stats = {}
-                    with open(lang_path, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line and '=' in line:
-                                key = line.split('=', 1)[0].strip()
-                                if key.startswith(f'tile.{MinecraftUtils.namespace}:') and key.endswith(
-                                        '.name'):
-                                    block_name = key.replace(f'tile.{MinecraftUtils.namespace}:',
-                                                             '').replace('.name', '')
-                                    lang_file_block_translations.add(block_name)
-                                elif key.startswith(f'{MinecraftUtils.namespace}:'):
-                                    # Kategorie mają format `namespace:category_name`
-                                    category_name = key.replace(f'{MinecraftUtils.namespace}:', '')
-                                    lang_file_category_translations.add(category_name)
+                    for key in snapshot.lang_keys(lang_name):
+                        if key.startswith(f'tile.{MinecraftUtils.namespace}:') and key.endswith('.name'):
+                            block_name = key.replace(f'tile.{MinecraftUtils.namespace}:', '').replace('.name', '')
+                            lang_file_block_translations.add(block_name)
+                        elif key.startswith(f'{MinecraftUtils.namespace}:'):
+                            # Kategorie mają format `namespace:category_name`
+                            category_name = key.replace(f'{MinecraftUtils.namespace}:', '')
+                            lang_file_category_translations.add(category_name)
 
                     # Wczytaj crafting catalog
                     project_category_translations = set()
                     try:
-                        with open('BP/item_catalog/crafting_item_catalog.json', 'r', encoding='utf-8') as f:
-                            catalog_data = json.load(f)
-                            for category in catalog_data['minecraft:crafting_items_catalog']['categories']:
-                                for group in category.get('groups', []):
-                                    if 'group_identifier' in group and 'name' in group['group_identifier']:
-                                        name = group['group_identifier']['name']
-                                        if name.startswith(f'{MinecraftUtils.namespace}:'):
-                                            category_name = name.replace(f'{MinecraftUtils.namespace}:', '')
-                                            project_category_translations.add(category_name)
+                        for name in snapshot.catalog_groups:
+                            if name.startswith(f'{MinecraftUtils.namespace}:'):
+                                category_name = name.replace(f'{MinecraftUtils.namespace}:', '')
+                                project_category_translations.add(category_name)
                     except Exception as e:
                         print_if_not_quiet(ConsoleStyle.error(f"Error reading crafting catalog: {e}"))
                         warnings.append(f"Error reading crafting catalog: {e}")
@@ -958,7 +933,7 @@ class MinecraftUtils:
                         errors.append(
                             f"Missing [{len(lang_file_missing_blocks)}] blocks defined in [{lang_name}] lang file")
 
-                    if os.path.exists(MinecraftUtils.DATABASE_FILE_NAME):
+                    if snapshot.database is not None:
                         stats[ConsoleStyle.info("In database")] = len(database_categories) + len(
                             database_block_ids)
                         stats[ConsoleStyle.info("Categories in database", 3)] = len(database_categories)
@@ -987,25 +962,73 @@ class MinecraftUtils:
         return errors, warnings
 
     @staticmethod
-    def verification_summary(verifications: List[Callable[[], Tuple[List[str], List[str]]]]):
+    def verification_summary(verifications: List[Callable[[], Tuple[List[str], List[str]]]],
+                             jobs: Optional[int] = None):
+        """Uruchom sprawdzenia (jobs > 1: w puli wątków), wypisz ich raporty w kolejności listy i podsumowanie
+
+        Sprawdzenia czytają wspólną migawkę projektu, więc są niezależne. Wydruk każdego z nich w puli jest
+        przechwytywany i emitowany po kolei, gdy poprzednie sprawdzenia już się zakończyły.
+        """
         verification_results = {
             'success': [],
             'warning': {},
             'error': {},
         }
-        for verify_func in verifications:
-            try:
-                errors, warnings = verify_func()
-                if errors or warnings:
-                    if errors:
-                        verification_results['error'][verify_func.__name__] = errors
-                    if warnings:
-                        verification_results['warning'][verify_func.__name__] = warnings
-                else:
-                    verification_results['success'].append(verify_func.__name__)
+        check_times = {}
+        jobs = min(jobs or os.cpu_count() or 1, len(verifications)) or 1
 
+        def run_check(verify_func):
+            start = time.perf_counter()
+            try:
+                return verify_func(), None, time.perf_counter() - start
             except Exception as e:
-                verification_results['error'][{verify_func.__name__}].append(e)
+                return None, e, time.perf_counter() - start
+
+        def record_result(verify_func, result, exception, wall_time):
+            check_times[verify_func.__name__] = wall_time
+            if exception is not None:
+                verification_results['error'].setdefault(verify_func.__name__, []).append(exception)
+                return
+            errors, warnings = result
+            if errors or warnings:
+                if errors:
+                    verification_results['error'][verify_func.__name__] = errors
+                if warnings:
+                    verification_results['warning'][verify_func.__name__] = warnings
+            else:
+                verification_results['success'].append(verify_func.__name__)
+
+        total_start = time.perf_counter()
+        if jobs == 1:
+            for verify_func in verifications:
+                record_result(verify_func, *run_check(verify_func))
+        else:
+            # Migawka tworzona przed startem wątków, żeby drzewo projektu było przeglądane tylko raz
+            get_project_snapshot()
+            with thread_output_routing() as router, ThreadPoolExecutor(max_workers=jobs) as executor:
+                def run_captured(verify_func):
+                    with router.capture() as output:
+                        outcome = run_check(verify_func)
+                    return output.getvalue(), outcome
+
+                futures = [executor.submit(run_captured, verify_func) for verify_func in verifications]
+                for verify_func, future in zip(verifications, futures):
+                    output, outcome = future.result()
+                    sys.stdout.write(output)
+                    record_result(verify_func, *outcome)
+        total_time = time.perf_counter() - total_start
+
+        # Fakty plików zapisywane po każdym przebiegu — następny --changed-only sparsuje tylko zmienione pliki
+        snapshot = get_project_snapshot()
+        snapshot.save_facts()
+
+        ConsoleStyle.print_stats({
+            **{ConsoleStyle.info(name): f"[{wall_time:.3f}] s" for name, wall_time in check_times.items()},
+            ConsoleStyle.success("Total", icon="⏱️"): f"[{total_time:.3f}] s ([{jobs}] thread(s))",
+            ConsoleStyle.info("File facts extracted"): f"[{snapshot.facts_extracted}]",
+            ConsoleStyle.info("File facts reused from cache"):
+                f"[{snapshot.facts_reused}]" if snapshot.changed_only else "- (use --changed-only)",
+        }, f"CHECK TIMES ([{len(check_times)}])", icon='⏱️')
 
         # Print summary statistics
         success_details = ''.join([f'\n   • {name}' for name in verification_results['success']])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Indeks modeli 3D: dokładne wyszukiwanie po nazwie oraz najbliższy model o tym samym kształcie i wyrównaniu
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from build_plan import get_model_name, parse_model_name
+
+
+class ModelIndex:
+    """Nazwy modeli w zbiorze (O(1)) i posortowane wymiary w grupach (kształt, wyrównanie) do wyszukiwania
+    najbliższego modelu (bisect zamiast przeglądu wszystkich modeli)
+
+    Najbliższy model służy tylko jako podpowiedź — brak dokładnego modelu jest zawsze błędem.
+    """
+
+    def __init__(self, model_names: Iterable[str]):
+        self.names = set(model_names)
+        # (kształt, wyrównanie) → posortowane szerokości i posortowane wysokości dla każdej szerokości
+        self._widths: Dict[Tuple[str, str], List[int]] = {}
+        self._heights: Dict[Tuple[str, str, int], List[int]] = {}
+        for model_name in self.names:
+            key = parse_model_name(model_name)
+            if key:
+                shape, width, height, alignment = key
+                self._heights.setdefault((shape, alignment, width), []).append(height)
+        for (shape, alignment, width), heights in self._heights.items():
+            heights.sort()
+            self._widths.setdefault((shape, alignment), []).append(width)
+        for widths in self._widths.values():
+            widths.sort()
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, model_name: str) -> bool:
+        return model_name in self.names
+
+    def nearest(self, model_name: str) -> Optional[str]:
+        """Model o tym samym kształcie i wyrównaniu z najbliższymi wymiarami (najmniejszy łączny odstęp)
+
+        Szerokości przeglądane są od miejsca wstawienia na zewnątrz, dla każdej najbliższa wysokość (bisect);
+        przegląd kończy się, gdy sama różnica szerokości nie jest mniejsza od najlepszego odstępu. Zwraca None
+        dla nazw spoza schematu road_sign_{kształt}_{szer}x{wys}_{wyrównanie} i kształtów bez modeli.
+        """
+        if model_name in self.names:
+            return model_name
+        key = parse_model_name(model_name)
+        if not key:
+            return None
+        shape, width, height, alignment = key
+        widths = self._widths.get((shape, alignment))
+        if not widths:
+            return None
+
+        best = None
+        left, right = bisect_left(widths, width) - 1, bisect_left(widths, width)
+        while left >= 0 or right < len(widths):
+            # Następna szerokość: bliższa z dwóch stron
+            if right >= len(widths) or (left >= 0 and width - widths[left] <= widths[right] - width):
+                candidate_width, left = widths[left], left - 1
+            else:
+                candidate_width, right = widths[right], right + 1
+            width_distance = abs(candidate_width - width)
+            if best is not None and width_distance >= best[0]:
+                break
+            for candidate_height in _neighbours(self._heights[(shape, alignment, candidate_width)], height):
+                size_distance = width_distance + abs(candidate_height - height)
+                if best is None or size_distance < best[0]:
+                    best = (size_distance, candidate_width, candidate_height)
+        return get_model_name(shape, best[1], best[2], alignment)
+
+
+def _neighbours(values: List[int], value: int) -> List[int]:
+    """Sąsiednie wartości posortowanej listy: największa mniejsza i najmniejsza niemniejsza od value"""
+    position = bisect_left(values, value)
+    return values[max(position - 1, 0):position + 1]
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Rejestr modeli 3D (RP/models/blocks/*.geo.json): szablony z bieżącego przebiegu i modele z dysku wczytywane raz
+"""
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+from emitter import Emitter
+
+MODELS_DIR = "RP/models/blocks"
+
+# Wynik ModelRegistry.update()
+MODEL_UNCHANGED = 'unchanged'
+MODEL_CREATED = 'created'
+MODEL_UPDATED = 'updated'
+
+
+class ModelRegistry:
+    """Modele w pamięci: plik z dysku parsowany najwyżej raz, zapis tylko gdy szablon różni się od pliku"""
+
+    def __init__(self, models_dir: str = MODELS_DIR, emitter: Optional[Emitter] = None):
+        self.models_dir = models_dir
+        self.emitter = emitter or Emitter()
+        self._disk: Dict[str, Optional[Dict]] = {}
+        self._templates: Dict[str, Dict] = {}
+        self.read_count = 0
+        self.write_count = 0
+
+    def model_path(self, model_name: str) -> str:
+        return os.path.join(self.models_dir, f"{model_name}.geo.json")
+
+    def load(self, model_name: str) -> Optional[Dict]:
+        """Model zapisany na dysku (None, jeśli pliku nie ma lub jest nieczytelny); wczytywany przy pierwszym użyciu"""
+        if model_name not in self._disk:
+            model = None
+            try:
+                with open(self.model_path(model_name), 'r') as f:
+                    model = json.load(f)
+                self.read_count += 1
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError):
+                # Uszkodzony plik traktowany jest jak brak modelu i zostanie nadpisany
+                self.read_count += 1
+            self._disk[model_name] = model
+        return self._disk[model_name]
+
+    def exists(self, model_name: str) -> bool:
+        return model_name in self._templates or self.load(model_name) is not None
+
+    def get(self, model_name: str) -> Optional[Dict]:
+        """Model z bieżącego przebiegu, a jeśli go nie ma — z dysku"""
+        return self._templates.get(model_name) or self.load(model_name)
+
+    def update(self, model_name: str, template: Dict) -> Tuple[str, Optional[Dict]]:
+        """Zarejestruj szablon i zapisz go, jeśli różni się od pliku; zwraca (status, poprzedni model z dysku)"""
+        self._templates[model_name] = template
+        current = self.load(model_name)
+        if current == template:
+            return MODEL_UNCHANGED, current
+
+        self._write(model_name, template)
+        return (MODEL_CREATED if current is None else MODEL_UPDATED), current
+
+    def _write(self, model_name: str, template: Dict):
+        """Zapisz model atomowo (plik tymczasowy + os.replace)"""
+        self.emitter.write_json(self.model_path(model_name), template)
+        self._disk[model_name] = template
+        self.write_count += 1
+
+    def forget(self, model_name: str):
+        """Zapomnij model (np. po usunięciu jego pliku)"""
+        self._disk[model_name] = None
+        self._templates.pop(model_name, None)
+
+    def dimensions(self, model_name: str) -> Tuple[Optional[float], Optional[float]]:
+        """Wymiary pierwszego sześcianu modelu (szerokość, wysokość)"""
+        model = self.get(model_name)
+        try:
+            size = model["minecraft:geometry"][0]["bones"][0]["cubes"][0]["size"]
+            return size[0], size[1]
+        except (KeyError, IndexError, TypeError):
+            return None, None
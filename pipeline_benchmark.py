@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Pomiar skalowania całego potoku (road_sign_processor.py all -s, verify_all.py, build.py --all) na syntetycznych
+bazach danych z 1k, 10k i 50k znaków, bez dostępu do sieci; wyniki w pliku JSON do porównania między commitami
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from build_cache import BUILD_CACHE_DIR
+from console_utils import ConsoleStyle, print_if_not_quiet
+from model_registry import MODELS_DIR
+from rasterizers import DEFAULT_RASTERIZER, RASTERIZERS
+from reconcile import AVERSE_TEXTURES_DIR, BLOCKS_DIR, REVERSE_TEXTURES_DIR
+from sign_catalog import SignCatalog
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+DEFAULT_RESULTS_PATH = "pipeline_benchmark.json"
+RESULTS_VERSION = 1
+
+# Pliki narzędzi kopiowane do katalogu roboczego (oprócz wszystkich modułów *.py)
+TOOL_FILES = ("config.json", "minecraft_textures.json")
+# Katalogi generowane przez procesor — nie są kopiowane, każdy pomiar zaczyna od pustych wyników
+GENERATED_DIRS = (BLOCKS_DIR, MODELS_DIR, AVERSE_TEXTURES_DIR, REVERSE_TEXTURES_DIR)
+
+STEPS = ("process_cold", "process_warm", "verify", "build")
+
+# Proste kształty plików SVG (w milimetrach, jak wymiary w bazie danych)
+FIXTURE_SHAPES = {
+    'circle': '<circle cx="{cx}" cy="{cy}" r="{r}" fill="#d00" stroke="#fff" stroke-width="{stroke}"/>',
+    'octagon': '<circle cx="{cx}" cy="{cy}" r="{r}" fill="#d00"/>',
+    'triangle': '<polygon points="{cx},0 {w},{h} 0,{h}" fill="#fc0" stroke="#d00" stroke-width="{stroke}"/>',
+    'inverted_triangle': '<polygon points="0,0 {w},0 {cx},{h}" fill="#fff" stroke="#d00" stroke-width="{stroke}"/>',
+    'diamond': '<polygon points="{cx},0 {w},{cy} {cx},{h} 0,{cy}" fill="#fc0" stroke="#fff" stroke-width="{stroke}"/>',
+}
+FIXTURE_RECTANGLE = '<rect width="{w}" height="{h}" fill="#06c" stroke="#fff" stroke-width="{stroke}"/>'
+
+
+def generate_database(size: int, template_path: str = "database.json") -> Dict:
+    """Syntetyczna baza z `size` znakami: kształty, wymiary i wyrównania powielane w proporcjach bazy wzorcowej"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template = json.load(f)
+
+    templates = [(category, sign_data) for category, category_data in template['categories'].items()
+                 for sign_data in category_data['blocks'].values()]
+    categories = {category: {key: value for key, value in category_data.items() if key != 'blocks'}
+                  for category, category_data in template['categories'].items()}
+    for category_data in categories.values():
+        category_data['blocks'] = {}
+
+    for index in range(size):
+        category, sign_data = templates[index % len(templates)]
+        blocks = categories[category]['blocks']
+        number = len(blocks) + 1
+        sign_id = f"{category}_{number}"
+        code = f"{category.upper()}-{number}"
+        sign = {key: value for key, value in sign_data.items() if key != 'translations'}
+        sign['code'] = code
+        sign['translations'] = {'pl_PL': f"{code}: znak syntetyczny", 'en_US': f"{code}: synthetic sign"}
+        blocks[sign_id] = sign
+
+    categories = {category: category_data for category, category_data in categories.items() if category_data['blocks']}
+    for category_data in categories.values():
+        category_data['icon'] = next(iter(category_data['blocks']))
+
+    metadata = dict(template.get('metadata', {}))
+    metadata['total_signs'] = size
+    metadata['description'] = f"Syntetyczna baza danych ({size} znaków) do pomiarów wydajności"
+    return {'categories': categories, 'metadata': metadata}
+
+
+def fixture_svg(sign_shape: str, width: int, height: int) -> str:
+    """Plik SVG o wymiarach znaku z jednym kształtem w jego obrysie"""
+    shape = FIXTURE_SHAPES.get(sign_shape, FIXTURE_RECTANGLE)
+    body = shape.format(w=width, h=height, cx=width / 2, cy=height / 2, r=min(width, height) / 2,
+                        stroke=max(1, min(width, height) // 30))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}mm" height="{height}mm" '
+            f'viewBox="0 0 {width} {height}">{body}</svg>\n')
+
+
+def write_fixture_svgs(workspace: str, catalog: SignCatalog) -> int:
+    """Zapisz pliki SVG wszystkich znaków tam, gdzie procesor szuka ich w trybie offline"""
+    from road_sign_processor import get_averse_svg_path
+
+    fixtures = {}
+    for sign in catalog:
+        svg_path = os.path.join(workspace, get_averse_svg_path(sign.sign_id))
+        os.makedirs(os.path.dirname(svg_path), exist_ok=True)
+        key = (sign.sign_shape, sign.sign_width, sign.sign_height)
+        if key not in fixtures:
+            fixtures[key] = fixture_svg(*key)
+        with open(svg_path, 'w', encoding='utf-8') as f:
+            f.write(fixtures[key])
+    return len(catalog)
+
+
+def copy_tool_tree(workspace: str, source_root: str):
+    """Kopia narzędzi i szkieletu BP/RP bez plików generowanych (wcześniejsze wyniki w katalogu są usuwane)"""
+    os.makedirs(workspace, exist_ok=True)
+    for directory in ("BP", "RP", BUILD_CACHE_DIR, "dist"):
+        shutil.rmtree(os.path.join(workspace, directory), ignore_errors=True)
+    for file_name in os.listdir(source_root):
+        if file_name.endswith('.py') or file_name in TOOL_FILES:
+            shutil.copy2(os.path.join(source_root, file_name), workspace)
+
+    generated = {os.path.normpath(path) for path in GENERATED_DIRS}
+
+    def ignore_generated(directory, names):
+        relative = os.path.relpath(directory, source_root)
+        return [name for name in names if os.path.normpath(os.path.join(relative, name)) in generated]
+
+    for pack_dir in ("BP", "RP"):
+        shutil.copytree(os.path.join(source_root, pack_dir), os.path.join(workspace, pack_dir), ignore=ignore_generated)
+
+
+def prepare_workspace(workspace: str, size: int, source_root: str) -> int:
+    """Katalog roboczy: kopia narzędzi i szkieletu BP/RP (bez plików generowanych), baza i pliki SVG"""
+    copy_tool_tree(workspace, source_root)
+
+    database = generate_database(size, os.path.join(source_root, "database.json"))
+    with open(os.path.join(workspace, "database.json"), 'w', encoding='utf-8') as f:
+        json.dump(database, f, indent=2, ensure_ascii=False)
+    return write_fixture_svgs(workspace, SignCatalog(database))
+
+
+def step_commands(rasterizer: str, jobs: int) -> Dict[str, List[str]]:
+    process = [sys.executable, "road_sign_processor.py", "all", "-s", "--rasterizer", rasterizer, "--jobs", str(jobs)]
+    return {
+        'process_cold': process,
+        'process_warm': process,
+        'verify': [sys.executable, "verify_all.py"],
+        'build': [sys.executable, "build.py", "--all", "--no-bump"],
+    }
+
+
+def run_step(command: List[str], workspace: str, log_path: str) -> Dict:
+    """Uruchom krok w katalogu roboczym; czas rzeczywisty oraz (POSIX) czas CPU i szczytowe RSS procesu potomnego"""
+    with open(log_path, 'ab') as log:
+        log.write(f"$ {' '.join(command)}\n".encode('utf-8'))
+        log.flush()
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=workspace, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            # wait4 zwraca zużycie zasobów tylko tego procesu (i jego potomków), a nie całego benchmarku
+            _, status, usage = os.wait4(process.pid, 0)
+            # os.waitstatus_to_exitcode jest dostępne dopiero od Pythona 3.9
+            process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        else:
+            process.wait()
+            usage = None
+        wall_time = time.perf_counter() - started
+
+    result = {'wall_time': round(wall_time, 3), 'cpu_time': None, 'peak_rss_kb': None,
+              'returncode': process.returncode}
+    if usage is not None:
+        result['cpu_time'] = round(usage.ru_utime + usage.ru_stime, 3)
+        # macOS podaje ru_maxrss w bajtach, Linux w KiB
+        result['peak_rss_kb'] = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return result
+
+
+def run_benchmark(sizes: List[int], steps: List[str], rasterizer: str, jobs: int, work_root: str,
+                  source_root: str) -> List[Dict]:
+    """Dla każdej wielkości bazy przygotuj katalog roboczy i zmierz kolejne kroki potoku"""
+    commands = step_commands(rasterizer, jobs)
+    results = []
+    for size in sizes:
+        ConsoleStyle.print_section(f"BAZA SYNTETYCZNA [{size}]")
+        workspace = os.path.join(work_root, f"signs_{size}")
+        started = time.perf_counter()
+        fixtures = prepare_workspace(workspace, size, source_root)
+        print_if_not_quiet(ConsoleStyle.info(
+            f"Wygenerowano bazę i [{fixtures}] plików SVG w [{time.perf_counter() - started:.2f}s]"))
+
+        log_path = os.path.join(workspace, "benchmark.log")
+        for step in steps:
+            result = run_step(commands[step], workspace, log_path)
+            result.update(size=size, step=step)
+            results.append(result)
+            message = f"{step:<14} czas [{result['wall_time']:>8.2f}s]"
+            if result['cpu_time'] is not None:
+                message += f"  CPU [{result['cpu_time']:>8.2f}s]  RSS [{result['peak_rss_kb'] / 1024:>6.0f} MiB]"
+            if result['returncode'] == 0:
+                print_if_not_quiet(ConsoleStyle.info(message))
+            else:
+                print_if_not_quiet(ConsoleStyle.warning(f"{message}  kod wyjścia [{result['returncode']}] ({log_path})"))
+    return results
+
+
+def get_commit(source_root: str) -> Optional[str]:
+    """Skrót bieżącego commita (None poza repozytorium git)"""
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=source_root,
+                                   capture_output=True, text=True)
+    except OSError:
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare_results(results: List[Dict], baseline_path: str):
+    """Wypisz zmianę czasu każdego kroku względem wcześniej zapisanych wyników"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(result['size'], result['step']): result for result in baseline['results']}
+
+    ConsoleStyle.print_section(f"PORÓWNANIE Z [{baseline.get('commit') or baseline_path}]")
+    for result in results:
+        before = previous.get((result['size'], result['step']))
+        if not before or not before['wall_time']:
+            continue
+        change = (result['wall_time'] - before['wall_time']) / before['wall_time'] * 100
+        message = (f"{result['size']:>6} {result['step']:<14} [{before['wall_time']:>8.2f}s] → "
+                   f"[{result['wall_time']:>8.2f}s] ({change:+.1f}%)")
+        print_if_not_quiet(ConsoleStyle.warning(message) if change > 10 else ConsoleStyle.info(message))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mierzy czas całego potoku na syntetycznych bazach danych (bez dostępu do sieci)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Przykłady użycia:
+  python3 pipeline_benchmark.py  # bazy 1k, 10k i 50k znaków, rasteryzacja Inkscape
+  python3 pipeline_benchmark.py --rasterizer stub  # tylko narzut Pythona, bez zewnętrznych narzędzi
+  python3 pipeline_benchmark.py --sizes 1000 --steps process_cold process_warm --jobs 0
+  python3 pipeline_benchmark.py --compare {DEFAULT_RESULTS_PATH} --json after.json  # porównaj z poprzednim commitem
+
+Kroki: process_cold (pierwszy przebieg all -s), process_warm (ponowny przebieg bez zmian),
+verify (verify_all.py), build (build.py --all --no-bump)
+        """
+    )
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help=f"Liczby znaków w bazach syntetycznych (domyślnie {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--steps', nargs='+', choices=STEPS, default=list(STEPS), help='Mierzone kroki potoku')
+    parser.add_argument('--rasterizer', choices=list(RASTERIZERS), default=DEFAULT_RASTERIZER,
+                        help=f'Silnik rasteryzacji procesora (domyślnie {DEFAULT_RASTERIZER}; stub — bez renderowania)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Liczba procesów procesora (0 = liczba rdzeni)')
+    parser.add_argument('--workdir', help='Katalog roboczy zachowany po pomiarze (domyślnie katalog tymczasowy)')
+    parser.add_argument('--json', default=DEFAULT_RESULTS_PATH,
+                        help=f'Plik wyników (domyślnie {DEFAULT_RESULTS_PATH})')
+    parser.add_argument('--compare', metavar='BASELINE', help='Porównaj z wcześniejszym plikiem wyników')
+    args = parser.parse_args()
+
+    source_root = os.path.dirname(os.path.abspath(__file__))
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+    if baseline_path and not os.path.exists(baseline_path):
+        print_if_not_quiet(ConsoleStyle.error(f"Brak pliku wyników [{args.compare}]"))
+        sys.exit(1)
+
+    ConsoleStyle.print_section("POMIAR WYDAJNOŚCI POTOKU")
+    if args.workdir:
+        results = run_benchmark(args.sizes, args.steps, args.rasterizer, args.jobs, os.path.abspath(args.workdir),
+                                source_root)
+    else:
+        with tempfile.TemporaryDirectory(prefix='pipeline_benchmark.') as temp_dir:
+            results = run_benchmark(args.sizes, args.steps, args.rasterizer, args.jobs, temp_dir, source_root)
+
+    report = {
+        'version': RESULTS_VERSION,
+        'commit': get_commit(source_root),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'rasterizer': args.rasterizer,
+        'jobs': args.jobs,
+        'results': results,
+    }
+    if baseline_path:
+        compare_results(results, baseline_path)
+
+    with open(args.json, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print_if_not_quiet(ConsoleStyle.success(f"Zapisano wyniki [{args.json}]"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Pomiar etapów przebiegu (--profile): czas rzeczywisty, czas CPU i szczyt pamięci (tracemalloc) per etap i per znak,
+tabela podsumowania oraz ślad w formacie Chrome Trace (trace.json, do otwarcia w Perfetto / chrome://tracing)
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+from console_utils import ConsoleStyle, print_if_not_quiet
+
+DEFAULT_TRACE_PATH = "trace.json"
+
+_NULL_STAGE = nullcontext()
+
+# tracemalloc.reset_peak istnieje od Pythona 3.9; wcześniej szczytu pamięci nie da się wyzerować na początku etapu,
+# więc etap dostaje jako szczyt największą pamięć bieżącą zmierzoną na granicach etapów (przyrost od bazy)
+_CAN_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+def _traced_peak() -> int:
+    current, peak = tracemalloc.get_traced_memory()
+    return peak if _CAN_RESET_PEAK else current
+
+
+class _Frame:
+    """Otwarty etap na stosie bieżącego wątku"""
+
+    __slots__ = ('peak', 'start_memory')
+
+    def __init__(self, start_memory: int):
+        self.peak = start_memory
+        self.start_memory = start_memory
+
+
+class Profiler:
+    """Zbiera zdarzenia etapów; wyłączony nie mierzy niczego (stage() zwraca pusty kontekst)"""
+
+    def __init__(self):
+        self.enabled = False
+        self.process_name = None
+        self.events: List[Dict] = []
+        self._local = threading.local()
+        self._concurrent_ids = 0
+
+    def enable(self, process_name: str):
+        """Włącz pomiary w bieżącym procesie (także w procesach roboczych puli)"""
+        self.enabled = True
+        self.process_name = process_name
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stack(self) -> List[_Frame]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name: str, sign: Optional[str] = None, concurrent: bool = False):
+        """Kontekst mierzący etap; concurrent=True dla etapów nakładających się w jednym wątku (asyncio),
+        dla których mierzony jest tylko czas rzeczywisty"""
+        if not self.enabled:
+            return _NULL_STAGE
+        if concurrent:
+            return self._concurrent_stage(name, sign)
+        return self._stage(name, sign)
+
+    @contextmanager
+    def _stage(self, name: str, sign: Optional[str]):
+        stack = self._stack()
+        current = tracemalloc.get_traced_memory()[0]
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, _traced_peak())
+        if _CAN_RESET_PEAK:
+            tracemalloc.reset_peak()
+        frame = _Frame(current)
+        stack.append(frame)
+        # Czas CPU bieżącego wątku: praca innych wątków procesu (np. pompujących wyjście Inkscape) nie jest doliczana
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            end, cpu_end = time.perf_counter(), time.thread_time()
+            frame.peak = max(frame.peak, _traced_peak())
+            stack.pop()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, frame.peak)
+            self._record(name, sign, start, end, cpu_end - cpu_start, frame.peak - frame.start_memory)
+
+    @contextmanager
+    def _concurrent_stage(self, name: str, sign: Optional[str]):
+        self._concurrent_ids += 1
+        event_id = self._concurrent_ids
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, sign, start, time.perf_counter(), None, None, event_id)
+
+    def _record(self, name, sign, start, end, cpu, peak, event_id=None):
+        self.events.append({
+            'name': name,
+            'sign': sign,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'process': self.process_name,
+            'start': start,
+            'wall': end - start,
+            'cpu': cpu,
+            'peak': peak,
+            'id': event_id,
+        })
+
+    def wrap(self, func, name: Optional[str] = None):
+        """Owiń funkcję tak, aby każde wywołanie było etapem (nazwa funkcji zostaje zachowana)
+
+        Szczyt pamięci (tracemalloc) jest wspólny dla procesu — owinięte funkcje wywoływać kolejno, nie w wątkach.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.stage(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def pop_events(self) -> List[Dict]:
+        """Pobierz i wyczyść zdarzenia (do przekazania z procesu roboczego)"""
+        events, self.events = self.events, []
+        return events
+
+    def merge(self, events: List[Dict]):
+        """Dołącz zdarzenia z procesu roboczego"""
+        self.events.extend(events)
+
+    def summary(self) -> List[Dict]:
+        """Statystyki etapów posortowane malejąco według łącznego czasu rzeczywistego"""
+        stages: Dict[str, Dict] = {}
+        for event in self.events:
+            row = stages.setdefault(event['name'], {'name': event['name'], 'count': 0, 'wall': 0.0, 'max_wall': 0.0,
+                                                    'cpu': 0.0, 'peak': 0})
+            row['count'] += 1
+            row['wall'] += event['wall']
+            row['max_wall'] = max(row['max_wall'], event['wall'])
+            row['cpu'] += event['cpu'] or 0.0
+            row['peak'] = max(row['peak'], event['peak'] or 0)
+        return sorted(stages.values(), key=lambda row: row['wall'], reverse=True)
+
+    def slowest_signs(self, limit: int = 10) -> List[Dict]:
+        """Znaki o najdłuższym łącznym czasie etapów wykonywanych tylko dla nich"""
+        signs: Dict[str, Dict] = {}
+        for event in self.events:
+            if event['sign'] and not event['id']:
+                row = signs.setdefault(event['sign'], {'sign': event['sign'], 'wall': 0.0, 'cpu': 0.0, 'peak': 0})
+                if event['name'] == 'sign':
+                    row['wall'] += event['wall']
+                    row['cpu'] += event['cpu'] or 0.0
+                row['peak'] = max(row['peak'], event['peak'] or 0)
+        return sorted(signs.values(), key=lambda row: row['wall'], reverse=True)[:limit]
+
+    def print_summary(self, title: str = "PROFIL PRZEBIEGU"):
+        """Wypisz tabelę etapów oraz najwolniejsze znaki"""
+        ConsoleStyle.print_section(title, icon='⏱')
+        print_if_not_quiet(f"{'etap':<30}{'liczba':>8}{'wall [s]':>12}{'max [s]':>10}{'cpu [s]':>10}{'peak [MiB]':>12}")
+        for row in self.summary():
+            print_if_not_quiet(f"{row['name']:<30}{row['count']:>8}{row['wall']:>12.3f}{row['max_wall']:>10.3f}"
+                               f"{row['cpu']:>10.3f}{row['peak'] / 1048576:>12.2f}")
+
+        slowest = self.slowest_signs()
+        if slowest:
+            ConsoleStyle.print_section(f"NAJWOLNIEJSZE ZNAKI [{len(slowest)}]", "-")
+            for row in slowest:
+                print_if_not_quiet(f"{row['sign']:<30}{row['wall']:>12.3f}{row['cpu']:>10.3f}"
+                                   f"{row['peak'] / 1048576:>12.2f}")
+
+    def write_trace(self, trace_path: str = DEFAULT_TRACE_PATH):
+        """Zapisz zdarzenia jako Chrome Trace Event Format (etapy: "X", etapy współbieżne: para "b"/"e")"""
+        origin = min((event['start'] for event in self.events), default=0.0)
+        trace_events = []
+        processes = {}
+        for event in self.events:
+            processes.setdefault(event['pid'], event['process'])
+            timestamp = (event['start'] - origin) * 1e6
+            args = {'sign': event['sign']} if event['sign'] else {}
+            if event['id']:
+                common = {'name': event['name'], 'cat': 'concurrent', 'id': event['id'], 'pid': event['pid'],
+                          'tid': event['tid']}
+                trace_events.append({**common, 'ph': 'b', 'ts': timestamp, 'args': args})
+                trace_events.append({**common, 'ph': 'e', 'ts': timestamp + event['wall'] * 1e6})
+                continue
+            args.update(cpu_ms=round(event['cpu'] * 1e3, 3), peak_kib=round(event['peak'] / 1024, 1))
+            trace_events.append({'name': event['name'], 'cat': 'stage', 'ph': 'X', 'ts': timestamp,
+                                 'dur': event['wall'] * 1e6, 'pid': event['pid'], 'tid': event['tid'], 'args': args})
+        for pid, process_name in processes.items():
+            trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': process_name}})
+
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        print_if_not_quiet(ConsoleStyle.success(f"Zapisano ślad [{trace_path}] ({len(self.events)} zdarzeń)"))
+
+    def finish(self, trace_path: str = DEFAULT_TRACE_PATH):
+        """Wypisz podsumowanie i zapisz ślad (jeśli pomiary były włączone)"""
+        if not self.enabled:
+            return
+        self.print_summary()
+        self.write_trace(trace_path)
+
+
+_profiler = None
+
+
+def get_profiler() -> Profiler:
+    """Pobierz profiler bieżącego procesu (singleton pattern)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def stage(name: str, sign: Optional[str] = None, concurrent: bool = False):
+    """Skrót: etap mierzony przez profiler bieżącego procesu"""
+    return get_profiler().stage(name, sign, concurrent)
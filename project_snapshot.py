@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Migawka projektu dla weryfikacji: jedno przejście os.scandir po drzewie projektu i każdy plik parsowany najwyżej raz,
+współdzielona przez wszystkie sprawdzenia verify_all.py
+
+Fakty wyciągane z plików (identyfikatory, geometrie, tekstury, wymiary, klucze tłumaczeń) i wyniki sprawdzeń
+pojedynczych plików trafiają do trwałej pamięci podręcznej (.build-cache/verify_facts.json) kluczowanej skrótem
+zawartości; w trybie changed_only parsowane są tylko pliki zmienione od poprzedniego przebiegu.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from build_cache import BUILD_CACHE_DIR
+from emitter import atomic_open
+from model_index import ModelIndex
+from staging import STAGE_DIR
+
+DATABASE_PATH = "database.json"
+BLOCKS_DIR = "BP/blocks/"
+ITEMS_DIR = "BP/items/"
+BLOCK_MODELS_DIR = "RP/models/blocks/"
+TEXTURES_DIR = "RP/textures/"
+TERRAIN_TEXTURE_PATH = "RP/textures/terrain_texture.json"
+ITEM_TEXTURE_PATH = "RP/textures/item_texture.json"
+LANGUAGES_PATH = "RP/texts/languages.json"
+CRAFTING_CATALOG_PATH = "BP/item_catalog/crafting_item_catalog.json"
+
+FACTS_CACHE_PATH = os.path.join(BUILD_CACHE_DIR, "verify_facts.json")
+# Zmiana sposobu wyciągania faktów wymaga podniesienia wersji (unieważnia całą pamięć podręczną)
+FACTS_CACHE_VERSION = 2
+
+# Katalogi pomijane przy przejściu (nazwa katalogu na dowolnym poziomie, nie fragment ścieżki — 'distance/'
+# nie jest 'dist/'); pamięć podręczna i drzewo robocze budowania zależą od lokalnego stanu, nie od projektu
+SKIPPED_DIRS = frozenset(('.git', '.idea', '__pycache__', 'venv', 'dist', BUILD_CACHE_DIR, STAGE_DIR))
+
+
+class ProjectSnapshot:
+    """Lista plików projektu z jednego przejścia os.scandir oraz leniwie parsowane pliki JSON i .lang
+
+    Ścieżki względne w postaci 'BP/blocks/a/a_1.block.json' (separator '/'), katalogi z '/' na końcu.
+    Wynik parsowania (także wyjątek) zapamiętywany jest per plik, więc każdy plik czytany jest najwyżej raz.
+    """
+
+    def __init__(self, root: str = ".", changed_only: bool = False, facts_cache_path: str = FACTS_CACHE_PATH):
+        self.root = root
+        self.changed_only = changed_only
+        self.facts_cache_path = facts_cache_path
+        self._facts_entries: Optional[Dict[str, Dict]] = None
+        self._facts_dirty = False
+        self._named_facts: Dict[Tuple[str, str], Dict[str, Dict]] = {}
+        self._facts_lock = threading.RLock()
+        self.facts_reused = 0
+        self.facts_extracted = 0
+        self.files: Set[str] = set()
+        self.dirs: Set[str] = set()
+        # Katalogi w kolejności przejścia (od góry) z liczbą plików — statystyka plików projektu
+        self.dir_file_counts: List[Tuple[str, int]] = []
+        self._json: Dict[str, Tuple[Any, Optional[BaseException]]] = {}
+        # Wartości właściwości liczonych leniwie (functools.cached_property wymaga Pythona 3.8)
+        self._memo: Dict[str, Any] = {}
+        self._scan("")
+
+    def _scan(self, relative_dir: str):
+        directory = os.path.join(self.root, relative_dir) if relative_dir else self.root
+        subdirs = []
+        file_count = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name not in SKIPPED_DIRS:
+                        subdirs.append(f"{relative_dir}{entry.name}/")
+                else:
+                    self.files.add(f"{relative_dir}{entry.name}")
+                    file_count += 1
+        self.dir_file_counts.append((relative_dir, file_count))
+        for subdir in subdirs:
+            self.dirs.add(subdir)
+            self._scan(subdir)
+
+    def _memoized(self, name: str, compute: Callable[[], Any]) -> Any:
+        with self._facts_lock:
+            if name not in self._memo:
+                self._memo[name] = compute()
+            return self._memo[name]
+
+    def exists(self, path: str) -> bool:
+        """Czy plik lub katalog ('.../') istniał w chwili przejścia"""
+        path = path.replace(os.sep, '/')
+        if path.endswith('/'):
+            return path in self.dirs
+        return os.path.normpath(path).replace(os.sep, '/') in self.files
+
+    def files_in(self, directory: str, suffix: str = "") -> List[str]:
+        """Pliki w katalogu i podkatalogach (posortowane), opcjonalnie tylko z danym rozszerzeniem"""
+        return sorted(path for path in self.files if path.startswith(directory) and path.endswith(suffix))
+
+    def load_json(self, path: str) -> Any:
+        """Sparsuj plik JSON raz; brak pliku → FileNotFoundError, błąd składni → json.JSONDecodeError"""
+        if path not in self._json:
+            try:
+                with open(os.path.join(self.root, path), 'r', encoding='utf-8') as f:
+                    self._json[path] = (json.load(f), None)
+            except (OSError, ValueError) as e:
+                self._json[path] = (None, e)
+        data, error = self._json[path]
+        if error is not None:
+            raise error
+        return data
+
+    def load_optional_json(self, path: str, default: Any = None) -> Any:
+        """Jak load_json, ale brak pliku zwraca wartość domyślną"""
+        if not self.exists(path):
+            return default
+        return self.load_json(path)
+
+    # ===== FAKTY PLIKÓW =====
+
+    @property
+    def facts_entries(self) -> Dict[str, Dict]:
+        if self._facts_entries is None:
+            self._facts_entries = {}
+            path = os.path.join(self.root, self.facts_cache_path)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        cache = json.load(f)
+                    if cache.get('version') == FACTS_CACHE_VERSION:
+                        self._facts_entries = cache.get('files', {})
+                except (OSError, ValueError):
+                    # Uszkodzona pamięć podręczna oznacza po prostu pełną weryfikację
+                    self._facts_entries = {}
+        return self._facts_entries
+
+    def file_facts(self, path: str, extract: Callable[[str], Any]) -> Any:
+        """Fakty pliku wyciągnięte przez extract(path) (wynik musi dać się zapisać jako JSON)
+
+        W trybie changed_only plik z tym samym rozmiarem i mtime albo z tym samym skrótem zawartości nie jest
+        parsowany — fakty pochodzą z pamięci podręcznej. Każdy przebieg zapisuje fakty do pamięci podręcznej,
+        więc pełna weryfikacja przygotowuje następną przyrostową. Jeden plik może mieć fakty kilku rodzajów
+        (nazwa funkcji extract), ważne tak długo, jak jego zawartość.
+        """
+        kind = extract.__name__
+        stat = os.stat(os.path.join(self.root, path))
+        with self._facts_lock:
+            entry = self.facts_entries.get(path)
+            fresh = entry is not None and self._is_fresh(path, entry, stat)
+            if self.changed_only and fresh and kind in entry['facts']:
+                self.facts_reused += 1
+                return entry['facts'][kind]
+
+        facts = extract(path)
+        # Zapis przez JSON ujednolica typy (krotki → listy) między przebiegiem pełnym a przyrostowym
+        facts = json.loads(json.dumps(facts))
+        with self._facts_lock:
+            if not fresh:
+                entry = self.facts_entries[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                                    'hash': self._file_hash(path), 'facts': {}}
+            entry['facts'][kind] = facts
+            self._facts_dirty = True
+            self.facts_extracted += 1
+        return facts
+
+    def _is_fresh(self, path: str, entry: Dict, stat: os.stat_result) -> bool:
+        """Czy wpis opisuje bieżącą zawartość pliku (ten sam rozmiar i mtime albo ten sam skrót)"""
+        if entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return True
+        if entry['size'] != stat.st_size or entry['hash'] != self._file_hash(path):
+            return False
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self._facts_dirty = True
+        return True
+
+    def facts_in(self, directory: str, suffix: str, extract: Callable[[str], Any]) -> Dict[str, Any]:
+        """Fakty wszystkich plików z katalogu: nazwa pliku bez rozszerzenia → fakty (pliki bez faktów pominięte)"""
+        with self._facts_lock:
+            key = (directory, suffix)
+            if key not in self._named_facts:
+                named_facts = {}
+                for path in self.files_in(directory, suffix):
+                    facts = self.file_facts(path, extract)
+                    if facts is not None:
+                        named_facts[os.path.basename(path)[:-len(suffix)]] = facts
+                self._named_facts[key] = named_facts
+            return self._named_facts[key]
+
+    def _file_hash(self, path: str) -> str:
+        with open(os.path.join(self.root, path), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def save_facts(self) -> bool:
+        """Zapisz pamięć podręczną faktów atomowo (bez wpisów plików, których już nie ma), jeśli coś się zmieniło"""
+        with self._facts_lock:
+            stale = [path for path in self.facts_entries if path not in self.files]
+            for path in stale:
+                del self.facts_entries[path]
+            if not self._facts_dirty and not stale:
+                return False
+
+            with atomic_open(os.path.join(self.root, self.facts_cache_path), 'w', encoding='utf-8') as f:
+                json.dump({'version': FACTS_CACHE_VERSION, 'files': dict(sorted(self.facts_entries.items()))}, f)
+
+            self._facts_dirty = False
+            return True
+
+    @property
+    def model_dimensions(self) -> Dict[str, Tuple[int, int]]:
+        """Wymiary tekstur modeli RP/models/blocks/**/*.geo.json (texture_width, texture_height) z opisu geometrii"""
+        return self._memoized('model_dimensions', self._compute_model_dimensions)
+
+    def _compute_model_dimensions(self) -> Dict[str, Tuple[int, int]]:
+        return {model_name: tuple(dimensions)
+                for model_name, dimensions in self.facts_in(BLOCK_MODELS_DIR, '.geo.json',
+                                                            self._extract_model_dimensions).items()}
+
+    @property
+    def model_index(self) -> ModelIndex:
+        """Indeks nazw modeli z wymiarami (dokładne i najbliższe dopasowanie)"""
+        return self._memoized('model_index', self._compute_model_index)
+
+    def _compute_model_index(self) -> ModelIndex:
+        return ModelIndex(self.model_dimensions)
+
+    def _extract_model_dimensions(self, path: str) -> Optional[List[int]]:
+        geometries = (self.load_json(path) or {}).get('minecraft:geometry')
+        if isinstance(geometries, list) and geometries:
+            description = geometries[0].get('description', {})
+            width, height = description.get('texture_width'), description.get('texture_height')
+            if width and height:
+                return [width, height]
+        return None
+
+    @property
+    def png_files(self) -> Set[str]:
+        """Pliki PNG w RP/textures/ jako ścieżki względem RP/ ('textures/...')"""
+        return self._memoized('png_files', self._compute_png_files)
+
+    def _compute_png_files(self) -> Set[str]:
+        return {path[len('RP/'):] for path in self.files_in(TEXTURES_DIR, '.png')}
+
+    @property
+    def database(self) -> Optional[Dict]:
+        """database.json (None, jeśli plik nie istnieje)"""
+        return self._memoized('database', self._compute_database)
+
+    def _compute_database(self) -> Optional[Dict]:
+        return self.load_optional_json(DATABASE_PATH)
+
+    @property
+    def database_categories(self) -> Dict[str, str]:
+        """block_id → kategoria w bazie danych"""
+        return self._memoized('database_categories', self._compute_database_categories)
+
+    def _compute_database_categories(self) -> Dict[str, str]:
+        if not self.database:
+            return {}
+        return {block_id: category for category, category_data in self.database['categories'].items()
+                for block_id in category_data['blocks']}
+
+    def lang_keys(self, lang_name: str) -> List[str]:
+        """Klucze pliku RP/texts/{lang_name}.lang w kolejności z pliku"""
+        return self.file_facts(f"RP/texts/{lang_name}.lang", self._extract_lang_keys)
+
+    def _extract_lang_keys(self, path: str) -> List[str]:
+        keys = []
+        with open(os.path.join(self.root, path), 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and '=' in line:
+                    keys.append(line.split('=', 1)[0].strip())
+        return keys
+
+    @property
+    def catalog_groups(self) -> List[str]:
+        """Nazwy grup katalogu crafting (group_identifier.name)"""
+        return self._memoized('catalog_groups', self._compute_catalog_groups)
+
+    def _compute_catalog_groups(self) -> List[str]:
+        catalog = self.load_json(CRAFTING_CATALOG_PATH)
+        return [group['group_identifier']['name']
+                for category in catalog['minecraft:crafting_items_catalog']['categories']
+                for group in category.get('groups', [])
+                if 'group_identifier' in group and 'name' in group['group_identifier']]
+
+
+_snapshot = None
+_changed_only = False
+
+
+def set_changed_only(enabled: bool = True):
+    """Weryfikacja przyrostowa: fakty niezmienionych plików z pamięci podręcznej (przed pierwszym użyciem migawki)"""
+    global _changed_only
+    _changed_only = enabled
+
+
+def get_project_snapshot() -> ProjectSnapshot:
+    """Pobierz migawkę bieżącego katalogu projektu, tworzoną przy pierwszym użyciu (singleton pattern)"""
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = ProjectSnapshot(changed_only=_changed_only)
+    return _snapshot
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Porównanie silników rasteryzacji na całej bazie danych: czas, szczytowe zużycie pamięci i różnica względem Inkscape
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from console_utils import ConsoleStyle, print_if_not_quiet
+from rasterizers import RASTERIZERS, available_rasterizers, create_rasterizer
+from sign_catalog import SignCatalog
+
+try:
+    from PIL import Image, ImageChops
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import resource
+except ImportError:
+    # Windows: brak getrusage — szczytowe zużycie pamięci nie jest mierzone
+    resource = None
+
+REFERENCE_RASTERIZER = "inkscape"
+DEFAULT_TOLERANCE = 0.01
+
+
+def collect_jobs(database_path="database.json", limit=None):
+    """Znaki z lokalnym plikiem SVG: [(sign_id, svg_path, width, height)]"""
+    from road_sign_processor import get_averse_svg_path, scale_size_from_mm_to_px
+
+    jobs = []
+    for sign in SignCatalog.load(database_path):
+        svg_path = get_averse_svg_path(sign.sign_id)
+        if os.path.exists(svg_path):
+            jobs.append((sign.sign_id, svg_path, scale_size_from_mm_to_px(sign.sign_width),
+                         scale_size_from_mm_to_px(sign.sign_height)))
+    return jobs[:limit] if limit else jobs
+
+
+def peak_rss_kb():
+    """Szczytowe RSS procesu i jego zakończonych procesów potomnych (KiB)"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # macOS podaje ru_maxrss w bajtach, Linux w KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_worker(rasterizer_name, output_dir, database_path, limit):
+    """Wyrenderuj wszystkie znaki jednym silnikiem i wypisz wynik jako JSON (uruchamiane w osobnym procesie)"""
+    jobs = collect_jobs(database_path, limit)
+    os.makedirs(output_dir, exist_ok=True)
+    rasterizer = create_rasterizer(rasterizer_name)
+    failures = {}
+    started = time.perf_counter()
+    try:
+        for sign_id, svg_path, width, height in jobs:
+            success, error = rasterizer.render(svg_path, os.path.join(output_dir, f"{sign_id}.png"), width, height)
+            if not success:
+                failures[sign_id] = (error or "").strip()[:200]
+    finally:
+        # Zamknięcie silnika kończy procesy potomne, dzięki czemu wliczają się do RUSAGE_CHILDREN
+        rasterizer.close()
+    wall_time = time.perf_counter() - started
+    json.dump({
+        'rasterizer': rasterizer_name,
+        'files': len(jobs),
+        'rendered': len(jobs) - len(failures),
+        'failures': failures,
+        'wall_time': round(wall_time, 3),
+        'peak_rss_kb': peak_rss_kb(),
+    }, sys.stdout)
+
+
+def compare_images(reference_path, candidate_path):
+    """Średnia i maksymalna różnica kanałów RGBA (0–1); None, gdy obrazów nie da się porównać"""
+    with Image.open(reference_path) as reference, Image.open(candidate_path) as candidate:
+        reference = reference.convert('RGBA')
+        candidate = candidate.convert('RGBA')
+        if reference.size != candidate.size:
+            return 1.0, 1.0
+        difference = ImageChops.difference(reference, candidate)
+        histogram = difference.histogram()
+        pixels = reference.size[0] * reference.size[1] * 4
+        total = sum(value * count for channel in range(4)
+                    for value, count in enumerate(histogram[channel * 256:(channel + 1) * 256]))
+        maximum = max(band_max for _, band_max in difference.getextrema())
+        return total / pixels / 255, maximum / 255
+
+
+def compare_with_reference(output_root, result, reference_files, tolerance):
+    """Dopisz do wyniku różnicę pikseli względem renderów silnika referencyjnego"""
+    differences = []
+    over_tolerance = []
+    for file_name in reference_files:
+        candidate_path = os.path.join(output_root, result['rasterizer'], file_name)
+        if not os.path.exists(candidate_path):
+            continue
+        mean_difference, _ = compare_images(os.path.join(output_root, REFERENCE_RASTERIZER, file_name), candidate_path)
+        differences.append(mean_difference)
+        if mean_difference > tolerance:
+            over_tolerance.append(file_name[:-len('.png')])
+    result['compared'] = len(differences)
+    result['mean_difference'] = round(sum(differences) / len(differences), 5) if differences else None
+    result['max_difference'] = round(max(differences), 5) if differences else None
+    result['over_tolerance'] = over_tolerance
+
+
+def run_benchmark(rasterizer_names, output_root, database_path, limit, tolerance):
+    """Uruchom każdy silnik w osobnym procesie (osobny pomiar pamięci) i porównaj wyniki"""
+    results = []
+    for rasterizer_name in rasterizer_names:
+        ConsoleStyle.print_section(f"SILNIK [{rasterizer_name}]")
+        command = [sys.executable, os.path.abspath(__file__), '--worker', rasterizer_name,
+                   '--output-dir', os.path.join(output_root, rasterizer_name), '--database', database_path]
+        if limit:
+            command += ['--limit', str(limit)]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print_if_not_quiet(ConsoleStyle.error(f"Silnik [{rasterizer_name}] zakończył się błędem: {completed.stderr.strip()}"))
+            continue
+        result = json.loads(completed.stdout)
+        print_if_not_quiet(ConsoleStyle.info(
+            f"Wyrenderowano [{result['rendered']}/{result['files']}] plików w [{result['wall_time']:.2f}s]"))
+        results.append(result)
+
+    reference = next((result for result in results if result['rasterizer'] == REFERENCE_RASTERIZER), None)
+    if reference and PIL_AVAILABLE:
+        reference_files = [f"{sign_id}.png" for sign_id in
+                           sorted({job[0] for job in collect_jobs(database_path, limit)} - set(reference['failures']))]
+        for result in results:
+            compare_with_reference(output_root, result, reference_files, tolerance)
+    elif not PIL_AVAILABLE:
+        print_if_not_quiet(ConsoleStyle.warning("PIL not available - pixel comparison will be skipped"))
+    else:
+        print_if_not_quiet(ConsoleStyle.warning(f"Brak renderów [{REFERENCE_RASTERIZER}] - porównanie pikseli pominięte"))
+    return results
+
+
+def print_results(results, tolerance):
+    """Tabela wyników posortowana po czasie oraz rekomendacja najszybszego wiernego silnika"""
+    ConsoleStyle.print_section("WYNIKI")
+    results = sorted(results, key=lambda result: result['wall_time'])
+    for result in results:
+        rss = f"{result['peak_rss_kb'] / 1024:.0f} MiB" if result['peak_rss_kb'] else "n/a"
+        difference = "n/a" if result.get('mean_difference') is None else \
+            f"{result['mean_difference']:.4f} (max {result['max_difference']:.4f}, >{tolerance}: {len(result['over_tolerance'])})"
+        print_if_not_quiet(ConsoleStyle.info(
+            f"{result['rasterizer']:<10} czas [{result['wall_time']:>8.2f}s]  RSS [{rss:>8}]  "
+            f"błędy [{result['files'] - result['rendered']}]  różnica [{difference}]"))
+
+    faithful = [result for result in results if result['rendered'] == result['files']
+                and (result['rasterizer'] == REFERENCE_RASTERIZER or
+                     (result.get('mean_difference') is not None and not result['over_tolerance']))]
+    if faithful:
+        print_if_not_quiet(ConsoleStyle.success(f"Najszybszy wierny silnik: [{faithful[0]['rasterizer']}]"))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Porównuje silniki rasteryzacji SVG→PNG na wszystkich znakach z lokalnym plikiem SVG",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Przykłady użycia:
+  python3 rasterizer_benchmark.py  # wszystkie dostępne silniki
+  python3 rasterizer_benchmark.py --rasterizers inkscape cairosvg --limit 50
+  python3 rasterizer_benchmark.py --json benchmark.json  # zapisz wyniki do pliku
+
+Pliki SVG muszą być wcześniej pobrane (python3 road_sign_processor.py all)
+        """
+    )
+    parser.add_argument('--rasterizers', nargs='+', choices=list(RASTERIZERS),
+                        help='Silniki do porównania (domyślnie wszystkie dostępne)')
+    parser.add_argument('--database', default='database.json', help='Ścieżka do bazy danych')
+    parser.add_argument('--limit', type=int, help='Renderuj tylko pierwsze N znaków')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Dopuszczalna średnia różnica pikseli względem Inkscape (domyślnie {DEFAULT_TOLERANCE})')
+    parser.add_argument('--output-dir', help='Katalog na rendery (domyślnie katalog tymczasowy)')
+    parser.add_argument('--json', help='Zapisz wyniki do pliku JSON')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.output_dir, args.database, args.limit)
+        return
+
+    rasterizer_names = args.rasterizers or available_rasterizers()
+    if REFERENCE_RASTERIZER not in rasterizer_names and REFERENCE_RASTERIZER in available_rasterizers():
+        rasterizer_names.insert(0, REFERENCE_RASTERIZER)
+    if not rasterizer_names:
+        print_if_not_quiet(ConsoleStyle.error("Brak dostępnych silników rasteryzacji"))
+        sys.exit(1)
+
+    ConsoleStyle.print_section("PORÓWNANIE SILNIKÓW RASTERYZACJI")
+    with tempfile.TemporaryDirectory(prefix='rasterizer_benchmark.') as temp_dir:
+        output_root = args.output_dir or temp_dir
+        results = run_benchmark(rasterizer_names, output_root, args.database, args.limit, args.tolerance)
+    print_results(results, args.tolerance)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print_if_not_quiet(ConsoleStyle.success(f"Zapisano wyniki [{args.json}]"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Wymienne silniki rasteryzacji SVG→PNG: inkscape (--shell), rsvg-convert i cairosvg (w procesie) oraz atrapa
+do pomiarów wydajności (stub)
+"""
+import abc
+import io
+import os
+import shutil
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from build_cache import get_tool_versions
+from emitter import atomic_open
+from inkscape_worker import STDOUT_FILENAME, ExportJob, InkscapeError, InkscapeShell
+from profiler import stage
+
+try:
+    import cairosvg
+    CAIROSVG_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError: pakiet zainstalowany, ale brak biblioteki cairo
+    cairosvg = None
+    CAIROSVG_AVAILABLE = False
+
+DEFAULT_RASTERIZER = "inkscape"
+
+
+class RasterizerError(Exception):
+    """Nie udało się wyrenderować pliku SVG"""
+
+
+def save_png(image: Image.Image, png_path: str, canvas_size: Optional[Tuple[int, int]] = None):
+    """Zapisz obraz jako PNG RGBA, wyśrodkowany na przezroczystym płótnie (tak jak `magick -gravity center -extent`)"""
+    image = image.convert('RGBA')
+    if canvas_size and canvas_size != image.size:
+        with stage("pad"):
+            canvas = Image.new('RGBA', canvas_size, (0, 0, 0, 0))
+            canvas.paste(image, ((canvas_size[0] - image.size[0]) // 2, (canvas_size[1] - image.size[1]) // 2))
+            image = canvas
+
+    with atomic_open(png_path) as f:
+        image.save(f, format='PNG')
+
+
+class Rasterizer(abc.ABC):
+    """Silnik rasteryzacji: render() zapisuje PNG RGBA o dokładnie zadanych wymiarach"""
+
+    name = None
+    # False dla atrapy, która nie czyta pliku SVG (pomijana przy porównywaniu silników)
+    renders_svg = True
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def versions(self) -> Dict[str, str]:
+        """Wersje narzędzi, od których zależy wynik (wejście manifestu budowania)"""
+        return {}
+
+    @abc.abstractmethod
+    def render_image(self, svg_path: str, width: int, height: int) -> Image.Image:
+        """Wyrenderuj plik do obrazu w pamięci; błąd zgłaszany jako RasterizerError"""
+
+    def render(self, svg_path: str, png_path: str, width: int, height: int,
+               canvas_size: Optional[Tuple[int, int]] = None) -> Tuple[bool, Optional[str]]:
+        """Wyrenderuj plik (opcjonalnie wyśrodkowany na większym płótnie) i zapisz jednym kodowaniem PNG
+
+        Zwraca (sukces, komunikat błędu).
+        """
+        try:
+            image = self.render_image(svg_path, width, height)
+        except RasterizerError as e:
+            return False, str(e)
+        try:
+            save_png(image, png_path, canvas_size)
+        except OSError as e:
+            return False, f"Nie udało się zapisać [{png_path}]: {e}"
+        return True, None
+
+    def close(self):
+        pass
+
+
+class InkscapeRasterizer(Rasterizer):
+    """Inkscape w trybie powłoki; bez niego osobny proces inkscape dla pliku"""
+
+    name = "inkscape"
+
+    def __init__(self):
+        self._shell: Optional[InkscapeShell] = None
+        self.shell_error: Optional[str] = None
+
+    @classmethod
+    def available(cls) -> bool:
+        return shutil.which('inkscape') is not None
+
+    def versions(self) -> Dict[str, str]:
+        return get_tool_versions('inkscape')
+
+    def _get_shell(self) -> Optional[InkscapeShell]:
+        if self._shell is None and self.shell_error is None:
+            shell = InkscapeShell()
+            try:
+                shell.start()
+            except InkscapeError as e:
+                self.shell_error = str(e)
+                return None
+            self._shell = shell
+        return self._shell
+
+    def _export(self, svg_path: str, png_path: str, width: int, height: int) -> Tuple[bool, Optional[str]]:
+        shell = self._get_shell()
+        if shell:
+            result = shell.export(ExportJob(svg_path, png_path, width, height))
+            return result.success, result.error
+
+        # Plik docelowy podmieniany atomowo, tak jak w trybie powłoki (nie nadpisuje dowiązań do poprzedniej wersji)
+        temp_path = os.path.join(os.path.dirname(png_path) or '.', f".{os.path.basename(png_path)}.inkscape.png")
+        try:
+            result = subprocess.run(self._command_line(svg_path, temp_path, width, height),
+                                    capture_output=True, text=True)
+            if result.returncode != 0 or not os.path.exists(temp_path):
+                return False, result.stderr
+            os.replace(temp_path, png_path)
+        except OSError as e:
+            return False, str(e)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return True, result.stderr
+
+    @staticmethod
+    def _command_line(svg_path: str, png_path: str, width: int, height: int) -> List[str]:
+        return [
+            'inkscape', '--export-type=png',
+            '--export-filename=' + png_path,
+            '--export-width=' + str(width),
+            '--export-height=' + str(height),
+            '--export-background-opacity=0',
+            '--export-background=transparent',
+            '--export-png-color-mode=RGBA_8', svg_path
+        ]
+
+    def render_image(self, svg_path: str, width: int, height: int) -> Image.Image:
+        # Inkscape wypisuje PNG na standardowe wyjście — obraz trafia do pamięci bez pliku pośredniego
+        shell = self._get_shell()
+        if shell:
+            result = shell.export_data(svg_path, width, height)
+            if not result.success:
+                raise RasterizerError(result.error)
+            png_data = result.data
+        else:
+            try:
+                result = subprocess.run(self._command_line(svg_path, STDOUT_FILENAME, width, height),
+                                        capture_output=True)
+            except OSError as e:
+                raise RasterizerError(str(e)) from e
+            if result.returncode != 0 or not result.stdout:
+                raise RasterizerError(result.stderr.decode('utf-8', errors='replace'))
+            png_data = result.stdout
+        return Image.open(io.BytesIO(png_data))
+
+    def render(self, svg_path: str, png_path: str, width: int, height: int,
+               canvas_size: Optional[Tuple[int, int]] = None) -> Tuple[bool, Optional[str]]:
+        if not canvas_size or canvas_size == (width, height):
+            # Plik zapisany przez Inkscape jest wynikiem — bez ponownego kodowania PNG
+            return self._export(svg_path, png_path, width, height)
+        # Płótno dopełniane jest w pamięci i zapisywane jednym kodowaniem PNG, bez magick i plików pośrednich
+        return super().render(svg_path, png_path, width, height, canvas_size)
+
+    def close(self):
+        if self._shell:
+            self._shell.close()
+            self._shell = None
+
+
+class RsvgRasterizer(Rasterizer):
+    """rsvg-convert (librsvg) — lekki proces bez GTK, uruchamiany dla każdego pliku"""
+
+    name = "rsvg"
+
+    @classmethod
+    def available(cls) -> bool:
+        return shutil.which('rsvg-convert') is not None
+
+    def versions(self) -> Dict[str, str]:
+        return get_tool_versions('rsvg-convert')
+
+    def render_image(self, svg_path: str, width: int, height: int) -> Image.Image:
+        # PNG odbierany ze standardowego wyjścia, bez pliku pośredniego
+        try:
+            result = subprocess.run(['rsvg-convert', '--format=png', f'--width={width}', f'--height={height}', svg_path],
+                                    capture_output=True)
+        except OSError as e:
+            raise RasterizerError(str(e)) from e
+        if result.returncode != 0:
+            raise RasterizerError(result.stderr.decode('utf-8', errors='replace'))
+        return Image.open(io.BytesIO(result.stdout))
+
+
+class CairoSvgRasterizer(Rasterizer):
+    """cairosvg — rasteryzacja w procesie Pythona, bez uruchamiania procesów"""
+
+    name = "cairosvg"
+
+    @classmethod
+    def available(cls) -> bool:
+        return CAIROSVG_AVAILABLE
+
+    def versions(self) -> Dict[str, str]:
+        return {'cairosvg': cairosvg.__version__ if cairosvg else "unavailable"}
+
+    def render_image(self, svg_path: str, width: int, height: int) -> Image.Image:
+        if not CAIROSVG_AVAILABLE:
+            raise RasterizerError("cairosvg nie jest zainstalowany")
+        try:
+            png_data = cairosvg.svg2png(url=svg_path, output_width=width, output_height=height)
+        except Exception as e:
+            raise RasterizerError(str(e)) from e
+        return Image.open(io.BytesIO(png_data))
+
+
+class StubRasterizer(Rasterizer):
+    """Przezroczysty obraz zadanych wymiarów bez czytania pliku SVG — pomiar narzutu samego procesora
+    (pipeline_benchmark.py), niezależnie od zewnętrznych narzędzi"""
+
+    name = "stub"
+    renders_svg = False
+
+    def render_image(self, svg_path: str, width: int, height: int) -> Image.Image:
+        return Image.new('RGBA', (width, height), (0, 0, 0, 0))
+
+
+RASTERIZERS = {rasterizer.name: rasterizer for rasterizer in
+               (InkscapeRasterizer, RsvgRasterizer, CairoSvgRasterizer, StubRasterizer)}
+
+
+def create_rasterizer(name: str = DEFAULT_RASTERIZER) -> Rasterizer:
+    """Utwórz silnik rasteryzacji o podanej nazwie"""
+    try:
+        return RASTERIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Nieznany silnik rasteryzacji [{name}] (dostępne: {', '.join(RASTERIZERS)})") from None
+
+
+def available_rasterizers() -> List[str]:
+    """Nazwy silników renderujących SVG, które można uruchomić w tym środowisku"""
+    return [name for name, rasterizer in RASTERIZERS.items() if rasterizer.renders_svg and rasterizer.available()]
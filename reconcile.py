@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Uzgadnianie plików wynikowych z bazą danych: usuwane są tylko pliki i wpisy, których baza już nie opisuje
+"""
+import os
+from typing import Dict, Iterable, List, Set
+
+from build_plan import BuildPlan
+from console_utils import ConsoleStyle, print_if_not_quiet
+from model_registry import MODELS_DIR
+from sign_catalog import SignCatalog
+
+BLOCKS_DIR = "BP/blocks"
+AVERSE_TEXTURES_DIR = "RP/textures/blocks/averse"
+REVERSE_TEXTURES_DIR = "RP/textures/blocks/reverse"
+
+# Prefiksy kluczy generowanych przez procesor (terrain_texture.json i pliki .lang)
+AVERSE_TERRAIN_PREFIX = "polish_road_sign:"
+REVERSE_TERRAIN_PREFIX = "polish_road_sign_back:"
+SIGN_LANG_PREFIX = "tile.polish_road_sign:"
+GROUP_LANG_PREFIX = "polish_road_sign:"
+
+MODEL_FILE_PREFIX = "road_sign_"
+MODEL_FILE_SUFFIX = ".geo.json"
+BLOCK_FILE_SUFFIX = ".block.json"
+
+
+def get_block_path(sign_id):
+    """Ścieżka definicji bloku znaku"""
+    category = sign_id.split('_')[0]
+    return f"{BLOCKS_DIR}/{category.lower()}/{sign_id}{BLOCK_FILE_SUFFIX}"
+
+
+def get_averse_png_path(sign_id):
+    """Ścieżka tekstury awersu znaku"""
+    category = sign_id.split('_')[0]
+    return f"{AVERSE_TEXTURES_DIR}/{category.lower()}/{sign_id}.png"
+
+
+def get_reverse_texture_path(reverse_texture_name):
+    """Ścieżka tekstury rewersu"""
+    return f"{REVERSE_TEXTURES_DIR}/{reverse_texture_name}.png"
+
+
+def get_model_path(model_name):
+    """Ścieżka modelu 3D"""
+    return f"{MODELS_DIR}/{model_name}{MODEL_FILE_SUFFIX}"
+
+
+def get_terrain_entries(catalog: SignCatalog, plan: BuildPlan) -> Dict[str, str]:
+    """Oczekiwane wpisy terrain_texture.json: klucz → ścieżka tekstury względem RP/"""
+    entries = {f"{AVERSE_TERRAIN_PREFIX}{sign.sign_id}": get_averse_png_path(sign.sign_id)[len("RP/"):]
+               for sign in catalog}
+    entries.update((f"{REVERSE_TERRAIN_PREFIX}{name}", get_reverse_texture_path(name)[len("RP/"):])
+                   for name in plan.reverse_textures)
+    return entries
+
+
+def get_lang_keys(data: Dict) -> Set[str]:
+    """Klucze tłumaczeń, które generuje baza danych (grupy kategorii i nazwy bloków)"""
+    keys = set()
+    for category_key, category_data in data['categories'].items():
+        keys.add(f"{GROUP_LANG_PREFIX}{category_data.get('crafting_group', category_key)}")
+        keys.update(f"{SIGN_LANG_PREFIX}{sign_id}.name" for sign_id in category_data['blocks'])
+    return keys
+
+
+def is_generated_lang_key(key: str) -> bool:
+    """Czy klucz tłumaczenia należy do procesora (a nie został dopisany ręcznie)"""
+    return key.startswith(SIGN_LANG_PREFIX) or key.startswith(GROUP_LANG_PREFIX)
+
+
+def _scan(directory: str, suffix: str, prefix: str = "", recursive: bool = False) -> Iterable[str]:
+    """Pliki wynikowe w katalogu (opcjonalnie w jego podkatalogach kategorii)"""
+    if not os.path.isdir(directory):
+        return
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if recursive and entry.is_dir():
+                yield from _scan(entry.path, suffix, prefix)
+            elif entry.is_file() and entry.name.startswith(prefix) and entry.name.endswith(suffix):
+                yield f"{directory}/{entry.name}"
+
+
+class OutputSet:
+    """Pliki i wpisy terrain_texture.json, które powinny istnieć dla bieżącej bazy danych"""
+
+    def __init__(self, catalog: SignCatalog):
+        plan = BuildPlan(catalog)
+        self.files: Set[str] = set()
+        for sign in catalog:
+            self.files.add(get_block_path(sign.sign_id))
+            self.files.add(get_averse_png_path(sign.sign_id))
+        self.files.update(get_model_path(model_name) for model_name in plan.models)
+        self.files.update(get_reverse_texture_path(name) for name in plan.reverse_textures)
+        self.terrain_entries = get_terrain_entries(catalog, plan)
+
+    @staticmethod
+    def existing_files() -> Set[str]:
+        """Pliki wynikowe obecne na dysku (SVG nie są wynikiem — nigdy nie są usuwane)"""
+        files = set(_scan(BLOCKS_DIR, BLOCK_FILE_SUFFIX, recursive=True))
+        files.update(_scan(AVERSE_TEXTURES_DIR, '.png', recursive=True))
+        files.update(_scan(REVERSE_TEXTURES_DIR, '.png'))
+        files.update(_scan(MODELS_DIR, MODEL_FILE_SUFFIX, MODEL_FILE_PREFIX))
+        return files
+
+
+class ReconcileReport:
+    """Różnica między oczekiwanym a zastanym stanem plików wynikowych"""
+
+    def __init__(self, desired: OutputSet, existing_files: Set[str], terrain_paths: Dict[str, str]):
+        self.desired = desired
+        self.orphan_files: List[str] = sorted(existing_files - desired.files)
+        self.missing_files: List[str] = sorted(desired.files - existing_files)
+        self.orphan_terrain_keys: List[str] = sorted(
+            key for key in terrain_paths
+            if (key.startswith(AVERSE_TERRAIN_PREFIX) or key.startswith(REVERSE_TERRAIN_PREFIX))
+            and key not in desired.terrain_entries)
+        # Wpisy wskazujące inną ścieżkę niż oczekiwana są usuwane i dodawane ponownie podczas budowania
+        self.stale_terrain_keys: List[str] = sorted(
+            key for key, path in terrain_paths.items()
+            if key in desired.terrain_entries and path != desired.terrain_entries[key])
+        self.removed_count = 0
+
+    @property
+    def up_to_date(self) -> bool:
+        return not (self.orphan_files or self.missing_files or self.orphan_terrain_keys or self.stale_terrain_keys)
+
+    def print_report(self, dry_run: bool = False):
+        for path in self.orphan_files:
+            print_if_not_quiet(ConsoleStyle.warning(
+                f"{'Do usunięcia' if dry_run else 'Usunięto'} [{path}] (nie istnieje w bazie)"))
+        for key in self.orphan_terrain_keys + self.stale_terrain_keys:
+            print_if_not_quiet(ConsoleStyle.warning(
+                f"{'Do usunięcia' if dry_run else 'Usunięto'} [{key}] z terrain_texture.json"))
+        ConsoleStyle.print_stats({
+            "Oczekiwane pliki": len(self.desired.files),
+            "Brakujące pliki (do zbudowania)": len(self.missing_files),
+            "Osierocone pliki": len(self.orphan_files),
+            "Osierocone wpisy terrain_texture.json": len(self.orphan_terrain_keys),
+            "Nieaktualne wpisy terrain_texture.json": len(self.stale_terrain_keys),
+        }, "UZGADNIANIE PLIKÓW WYNIKOWYCH")
+
+
+def reconcile_outputs(catalog: SignCatalog, terrain_registry, build_cache, model_registry,
+                      dry_run: bool = False) -> ReconcileReport:
+    """Usuń pliki i wpisy, których nie opisuje baza danych; reszta jest budowana przyrostowo według manifestu
+
+    Nie usuwa niczego, co baza nadal opisuje — brakujące i nieaktualne artefakty tworzy dopiero budowanie.
+    """
+    ConsoleStyle.print_section("UZGADNIANIE Z BAZĄ DANYCH")
+    desired = OutputSet(catalog)
+    terrain_paths = {key: entry.get('textures') for key, entry in terrain_registry.texture_data.items()}
+    report = ReconcileReport(desired, OutputSet.existing_files(), terrain_paths)
+
+    if not dry_run:
+        for path in report.orphan_files:
+            os.remove(path)
+            report.removed_count += 1
+            file_name = os.path.basename(path)
+            if path.startswith(MODELS_DIR + "/"):
+                model_registry.forget(file_name[:-len(MODEL_FILE_SUFFIX)])
+            elif path.startswith(REVERSE_TEXTURES_DIR + "/"):
+                build_cache.forget(f"reverse:{file_name[:-len('.png')]}")
+            elif path.startswith(AVERSE_TEXTURES_DIR + "/"):
+                build_cache.forget(f"averse:{file_name[:-len('.png')]}")
+            else:
+                build_cache.forget(f"block:{file_name[:-len(BLOCK_FILE_SUFFIX)]}")
+        for key in report.orphan_terrain_keys + report.stale_terrain_keys:
+            terrain_registry.remove(key)
+            report.removed_count += 1
+
+    report.print_report(dry_run)
+    if report.up_to_date:
+        print_if_not_quiet(ConsoleStyle.success("Pliki wynikowe są zgodne z bazą danych"))
+    print_if_not_quiet(ConsoleStyle.divider())
+    return report
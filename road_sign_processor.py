@@ -1,18 +1,132 @@
 #!/usr/bin/env python3
 import json
 import os
-import subprocess
 import re
 import sys
-import time
-import tempfile
 import argparse
+import asyncio
+import atexit
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from natsort import natsorted
 from console_utils import ConsoleStyle, print_if_not_quiet
+from build_cache import BuildCache, content_hash, file_hash, file_sha1
+from build_plan import (BuildPlan, get_model_name, get_reverse_texture_for_shape, get_texture_canvas_size,
+                        scale_size_from_mm_to_px)
+from downloader import DEFAULT_CONCURRENCY, DEFAULT_RATE, AsyncDownloader, DownloadError, DownloadSettings
+from emitter import Emitter
+from image_metadata import ImageMetadataIndex
+from model_registry import MODEL_CREATED, MODEL_UNCHANGED, ModelRegistry
+from PIL import Image
+from reconcile import (get_block_path, get_lang_keys, get_reverse_texture_path, is_generated_lang_key,
+                       reconcile_outputs)
+from profiler import DEFAULT_TRACE_PATH, get_profiler, stage
+from rasterizers import DEFAULT_RASTERIZER, RASTERIZERS, create_rasterizer, save_png
+from schema_validation import SchemaValidationError
+from shape_masks import DEFAULT_SUPERSAMPLE, SHAPE_MASKS_VERSION, reverse_texture, reverse_textures
+from sign_catalog import SignCatalog
+from staging import StagingError, staged_output
+from svg_metadata import SvgMetadataStore
+from terrain_registry import TerrainTextureRegistry
+from wikimedia_api import ImageInfoResolver
 
+# Wpisy terrain_texture.json odkładane w procesie roboczym (ustawiane w _process_sign_task)
+_deferred_terrain_updates = None
 
-def scale_size_from_mm_to_px(value):
-    return value // 5
+# Zapis generowanych plików z pominięciem niezmienionych (patrz get_emitter)
+_emitter = None
+
+
+def get_emitter():
+    """Pobierz wspólny zapis plików wynikowych i jego liczniki dla bieżącego procesu (singleton pattern)"""
+    global _emitter
+    if _emitter is None:
+        _emitter = Emitter()
+    return _emitter
+
+
+# Wpisy terrain_texture.json zapisywane raz na koniec przebiegu (patrz get_terrain_registry)
+_terrain_registry = None
+
+
+def get_terrain_registry():
+    """Pobierz rejestr terrain_texture.json dla bieżącego przebiegu (singleton pattern)"""
+    global _terrain_registry
+    if _terrain_registry is None:
+        _terrain_registry = TerrainTextureRegistry(emitter=get_emitter())
+    return _terrain_registry
+
+
+# Manifest przyrostowego budowania (patrz get_build_cache)
+_build_cache = None
+
+
+def get_build_cache():
+    """Pobierz manifest przyrostowego budowania dla bieżącego procesu (singleton pattern)"""
+    global _build_cache
+    if _build_cache is None:
+        _build_cache = BuildCache()
+    return _build_cache
+
+
+# Modele 3D wczytane z dysku i utworzone w bieżącym przebiegu (patrz get_model_registry)
+_model_registry = None
+
+
+def get_model_registry():
+    """Pobierz rejestr modeli 3D dla bieżącego przebiegu (singleton pattern)"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry(emitter=get_emitter())
+    return _model_registry
+
+
+# Metadane pobranych plików SVG (patrz get_svg_metadata)
+_svg_metadata = None
+
+
+def get_svg_metadata():
+    """Pobierz magazyn metadanych plików SVG (singleton pattern)"""
+    global _svg_metadata
+    if _svg_metadata is None:
+        _svg_metadata = SvgMetadataStore()
+    return _svg_metadata
+
+
+# Wymiary tekstur PNG odczytane z nagłówków (patrz get_image_index)
+_image_index = None
+
+
+def get_image_index():
+    """Pobierz indeks nagłówków plików PNG (singleton pattern)"""
+    global _image_index
+    if _image_index is None:
+        _image_index = ImageMetadataIndex()
+    return _image_index
+
+
+# Silnik rasteryzacji SVG→PNG wybrany dla przebiegu (patrz get_rasterizer)
+_rasterizer_name = DEFAULT_RASTERIZER
+_rasterizer = None
+
+
+def set_rasterizer(name):
+    """Wybierz silnik rasteryzacji dla bieżącego procesu"""
+    global _rasterizer_name, _rasterizer
+    if _rasterizer is not None:
+        _rasterizer.close()
+    _rasterizer_name = name
+    _rasterizer = None
+
+
+def get_rasterizer():
+    """Pobierz silnik rasteryzacji dla bieżącego procesu (singleton pattern)"""
+    global _rasterizer
+    if _rasterizer is None:
+        _rasterizer = create_rasterizer(_rasterizer_name)
+        atexit.register(_rasterizer.close)
+    return _rasterizer
 
 
 def scale_size_from_mm_to_msu(value):
@@ -43,52 +157,14 @@ def normalize_sign_id(sign_code):
     return normalized
 
 
-def find_sign_in_database(sign_id, data):
-    """Znajdź znak w bazie danych"""
-    categories = list(data['categories'].keys())
-    for category in categories:
-        if sign_id in data['categories'][category]['blocks']:
-            return data['categories'][category]['blocks'][sign_id]
-    return None
-
-
-def get_category_for_sign(sign_id, data):
-    """Pobierz kategorię dla znaku"""
-    categories = list(data['categories'].keys())
-    for category in categories:
-        if sign_id in data['categories'][category]['blocks']:
-            return category
-    return None
-
-
-def get_reverse_texture_for_shape(sign_shape, sign_width, sign_height):
-    """Pobierz nazwę tekstury tła na podstawie kształtu znaku"""
-    shape_to_background = {
-        'triangle': f'triangle_{sign_width}x{sign_height}',
-        'inverted_triangle': f'inverted_triangle_{sign_width}x{sign_height}',
-        'circle': f'circle_{sign_width}x{sign_height}',
-        'square': f'square_{sign_width}x{sign_height}',
-        'diamond': f'diamond_{sign_width}x{sign_height}',
-        'octagon': f'octagon_{sign_width}x{sign_height}',
-        'rectangle': f'rectangle_{sign_width}x{sign_height}'
-    }
-
-    return shape_to_background.get(sign_shape, f'rectangle_{sign_width}x{sign_height}')
-
-
 def get_image_dimensions(png_path):
-    """Pobierz wymiary obrazka PNG — ulepszona wersja"""
-    # Najpierw spróbuj z identify (szybsze)
-    result = subprocess.run(['identify', '-format', '%wx%h', png_path],
-                            capture_output=True, text=True, timeout=10)
-    if result.returncode == 0:
-        dimensions = result.stdout.strip()
-        model_width, model_height = map(int, dimensions.split('x'))
-        return model_width, model_height
-
-    # Fallback: użyj PIL, jeśli identify nie działa
+    """Pobierz wymiary obrazka PNG z nagłówka IHDR (indeks metadanych), bez uruchamiania procesów"""
+    width, height = get_image_index().dimensions(png_path)
+    if width is not None:
+        return width, height
+
+    # Fallback: użyj PIL dla plików, które nie mają poprawnego nagłówka PNG
     try:
-        from PIL import Image
         with Image.open(png_path) as img:
             return img.size[0], img.size[1]
     except Exception as e:
@@ -96,6 +172,20 @@ def get_image_dimensions(png_path):
     return None, None
 
 
+def is_texture_up_to_date(cache_key, cache_inputs, png_path, target_width, target_height):
+    """Sprawdź w manifeście, czy tekstura powstała z tych samych danych wejściowych"""
+    cache = get_build_cache()
+    if cache.is_fresh(cache_key, cache_inputs):
+        return True
+
+    # Tekstury sprzed wprowadzenia manifestu przyjmij, jeśli mają oczekiwane wymiary
+    if cache_key not in cache.entries and os.path.exists(png_path) \
+            and get_image_dimensions(png_path) == get_texture_canvas_size(target_width, target_height):
+        cache.record(cache_key, cache_inputs, [png_path])
+        return True
+    return False
+
+
 def calculate_vertical_position(alignment, model_height):
     """Oblicz pozycję Y na podstawie wyrównania"""
     if alignment == "top":
@@ -179,293 +269,160 @@ def create_model_template(model_name, sign_width, sign_height, target_width, tar
 
 def create_model_if_needed(sign_shape, sign_width, sign_height, target_width, target_height, vertical_alignment="bottom"):
     """Twórz model 3D, jeśli nie istnieje"""
-    model_name = f"road_sign_{sign_shape}_{sign_width}x{sign_height}_{vertical_alignment}"
-    model_path = f"RP/models/blocks/{model_name}.geo.json"
+    model_name = get_model_name(sign_shape, sign_width, sign_height, vertical_alignment)
 
-    if os.path.exists(model_path):
+    if get_model_registry().exists(model_name):
         print_if_not_quiet(ConsoleStyle.success(f"Model [{model_name}] już istnieje!"))
         return model_name
 
     # Twórz model na podstawie szablonu
     template = create_model_template(model_name, sign_width, sign_height, target_width, target_height, vertical_alignment)
-
-    with open(model_path, 'w') as f:
-        json.dump(template, f, indent=2)
+    get_model_registry().update(model_name, template)
 
     print_if_not_quiet(ConsoleStyle.success(f"Utworzono model [{model_name}]"))
     return model_name
 
 
 def update_model_if_needed(sign_shape, sign_width, sign_height, target_width, target_height, vertical_alignment="bottom"):
-    """Zaktualizuj model 3D, jeśli wymiary się zmieniły"""
+    """Zaktualizuj model 3D, jeśli jego szablon się zmienił"""
     ConsoleStyle.print_section("TWORZENIE MODELU")
 
-    model_name = f"road_sign_{sign_shape}_{sign_width}x{sign_height}_{vertical_alignment}"
-    model_path = f"RP/models/blocks/{model_name}.geo.json"
-
-    if not os.path.exists(model_path):
-        print_if_not_quiet(ConsoleStyle.info(f"Model nie istnieje, tworzę nowy [{model_name}]"))
-        return create_model_if_needed(sign_shape, sign_width, sign_height, target_width, target_height, vertical_alignment)
-
-    # Sprawdź, czy wymiary modelu są aktualne
-    try:
-        with open(model_path, 'r') as f:
-            model_data = json.load(f)
-
-        # Pobierz aktualne wymiary z modelu
-        if (model_data.get("minecraft:geometry") and
-                len(model_data["minecraft:geometry"]) > 0 and
-                model_data["minecraft:geometry"][0].get("description") and
-                "texture_width" in model_data["minecraft:geometry"][0]["description"] and
-                "texture_height" in model_data["minecraft:geometry"][0]["description"]):
-
-            current_width = model_data["minecraft:geometry"][0]["description"]["texture_width"]
-            current_height = model_data["minecraft:geometry"][0]["description"]["texture_height"]
-
-            # Sprawdź, czy wymiary się zmieniły
-            if current_width == target_width and current_height == target_height:
-                print_if_not_quiet(ConsoleStyle.success(f"Model ma aktualne wymiary [{model_name}]"))
-                return model_name
-            else:
-                print_if_not_quiet(ConsoleStyle.info(f"Aktualizuję model [{model_name}] z wymiarów [{current_width}x{current_height}] na [{target_width}x{target_height}]"))
-        else:
-            print_if_not_quiet(ConsoleStyle.warning(f"Nieprawidłowa struktura modelu, tworzę nowy [{model_name}]"))
-            return create_model_if_needed(sign_shape, sign_width, sign_height, target_width, target_height, vertical_alignment)
-
-    except Exception as e:
-        print_if_not_quiet(ConsoleStyle.warning(f"Błąd odczytu modelu [{model_name}]: {e}"))
-        return create_model_if_needed(sign_shape, sign_width, sign_height, target_width, target_height, vertical_alignment)
-
-    # Aktualizuj model z nowymi wymiarami
+    model_name = get_model_name(sign_shape, sign_width, sign_height, vertical_alignment)
     template = create_model_template(model_name, sign_width, sign_height, target_width, target_height, vertical_alignment)
 
-    with open(model_path, 'w') as f:
-        json.dump(template, f, indent=2)
-
-    print_if_not_quiet(ConsoleStyle.success(f"Zaktualizowano model [{model_name}]"))
+    # Rejestr porównuje szablon z modelem na dysku (wczytanym raz) i zapisuje plik tylko przy różnicy
+    status, previous = get_model_registry().update(model_name, template)
+    if status == MODEL_UNCHANGED:
+        print_if_not_quiet(ConsoleStyle.success(f"Model jest aktualny [{model_name}]"))
+    elif status == MODEL_CREATED:
+        print_if_not_quiet(ConsoleStyle.success(f"Utworzono model [{model_name}]"))
+    else:
+        try:
+            current_description = previous["minecraft:geometry"][0]["description"]
+            target_description = template["minecraft:geometry"][0]["description"]
+            print_if_not_quiet(ConsoleStyle.info(
+                f"Aktualizuję model [{model_name}] z wymiarów [{current_description.get('texture_width')}x{current_description.get('texture_height')}]"
+                f" na [{target_description['texture_width']}x{target_description['texture_height']}]"))
+        except (KeyError, IndexError, TypeError, AttributeError):
+            print_if_not_quiet(ConsoleStyle.warning(f"Nieprawidłowa struktura modelu, utworzono nowy [{model_name}]"))
+        print_if_not_quiet(ConsoleStyle.success(f"Zaktualizowano model [{model_name}]"))
     return model_name
 
 
-def create_reverse_texture_if_needed(sign_shape, sign_width, sign_height, texture_width, texture_height,
-                                        force_rebuild=False):
-    """Twórz teksturę tła, jeśli nie istnieje"""
-    ConsoleStyle.print_section("TWORZENIE TEKSTURY REWERSU")
+def get_reverse_texture_cache_inputs(sign_shape, texture_width, texture_height):
+    """Wejścia manifestu budowania dla tekstury rewersu"""
+    return {
+        'shape': sign_shape,
+        'width': texture_width,
+        'height': texture_height,
+        'shape_masks': {'version': SHAPE_MASKS_VERSION, 'supersample': DEFAULT_SUPERSAMPLE},
+    }
 
-    # Pobierz odpowiednią teksturę tła na podstawie kształtu
-    reverse_texture_name = get_reverse_texture_for_shape(sign_shape, sign_width, sign_height)
-    reverse_texture_dir = f"RP/textures/blocks/reverse/"
-    reverse_texture_path = f"{reverse_texture_dir}{reverse_texture_name}.png"
 
-    if os.path.exists(reverse_texture_path) and not force_rebuild:
-        print_if_not_quiet(ConsoleStyle.success(f"Tekstura tła już istnieje [{reverse_texture_name}]"))
-        return reverse_texture_name
+def write_reverse_texture(reverse_texture_name, rgba):
+    """Zapisz teksturę rewersu (tablica RGBA) jako PNG"""
+    save_png(Image.fromarray(rgba, 'RGBA'), get_reverse_texture_path(reverse_texture_name))
 
-    # Utwórz katalog, jeśli nie istnieje
-    os.makedirs(os.path.dirname(reverse_texture_dir), exist_ok=True)
 
-    # Sprawdź, czy trzeba zrobić kwadrat (width < height)
-    if texture_width < texture_height:
-        # Użyj większego wymiaru jako kwadrat
-        square_size = texture_height
-        print_if_not_quiet(
-            f"  📐 Tworzę kwadratową teksturę tła [{square_size}x{square_size}] z wycentrowanym kształtem [{texture_width}x{texture_height}]")
+def create_reverse_textures(plan, force_rebuild=False):
+    """Wygeneruj jednym wywołaniem wszystkie brakujące lub nieaktualne tekstury rewersu z planu"""
+    ConsoleStyle.print_section("TWORZENIE TEKSTUR REWERSU")
+    pending = {}
+    for artifact in plan.reverse_textures.values():
+        texture_width, texture_height = artifact.target_width, artifact.target_height
+        cache_inputs = get_reverse_texture_cache_inputs(artifact.sign_shape, texture_width, texture_height)
+        if not force_rebuild and is_texture_up_to_date(f"reverse:{artifact.name}", cache_inputs,
+                                                       get_reverse_texture_path(artifact.name),
+                                                       texture_width, texture_height):
+            continue
+        pending[artifact.name] = ((artifact.sign_shape, texture_width, texture_height,
+                                   get_texture_canvas_size(texture_width, texture_height)), cache_inputs)
 
-        # Twórz neutralną białą teksturę tła w formacie sRGB z kanałem alpha zgodnie z kształtem
-        try:
-            if sign_shape == 'triangle':
-                # Trójkąt — szary kolor w kształcie trójkąta wycentrowany w kwadracie
-                subprocess.run(['magick', '-size', f'{square_size}x{square_size}', 'xc:transparent',
-                                '-fill', '#808080', '-gravity', 'center',
-                                '-draw',
-                                f'polygon {square_size // 2},{square_size // 2 - texture_height // 2} {square_size // 2 - texture_width // 2},{square_size // 2 + texture_height // 2} {square_size // 2 + texture_width // 2},{square_size // 2 + texture_height // 2}',
-                                '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'inverted_triangle':
-                # Odwrócony trójkąt — szary kolor w kształcie odwróconego trójkąta wycentrowany w kwadracie
-                subprocess.run(['magick', '-size', f'{square_size}x{square_size}', 'xc:transparent',
-                                '-fill', '#808080', '-gravity', 'center',
-                                '-draw',
-                                f'polygon {square_size // 2 - texture_width // 2},{square_size // 2 - texture_height // 2} {square_size // 2 + texture_width // 2},{square_size // 2 - texture_height // 2} {square_size // 2},{square_size // 2 + texture_height // 2}',
-                                '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'circle':
-                # Koło — szary kolor w kształcie koła wycentrowany w kwadracie
-                subprocess.run(['magick', '-size', f'{square_size}x{square_size}', 'xc:transparent',
-                                '-fill', '#808080', '-gravity', 'center',
-                                '-draw',
-                                f'circle {square_size // 2},{square_size // 2} {square_size // 2},{square_size // 2 - min(texture_width, texture_height) // 2}',
-                                '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'square':
-                # Kwadrat — szary kolor w kształcie kwadratu wycentrowany w kwadracie
-                subprocess.run(['magick', '-size', f'{square_size}x{square_size}', 'xc:transparent',
-                                '-fill', '#808080', '-gravity', 'center',
-                                '-draw',
-                                f'rectangle {square_size // 2 - texture_width // 2},{square_size // 2 - texture_height // 2} {square_size // 2 + texture_width // 2},{square_size // 2 + texture_height // 2}',
-                                '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'diamond':
-                # Romb — szary kolor w kształcie rombu wycentrowany w kwadracie
-                subprocess.run(['magick', '-size', f'{square_size}x{square_size}', 'xc:transparent',
-                                '-fill', '#808080', '-gravity', 'center',
-                                '-draw',
-                                f'polygon {square_size // 2},{square_size // 2 - texture_height // 2} {square_size // 2 + texture_width // 2},{square_size // 2} {square_size // 2},{square_size // 2 + texture_height // 2} {square_size // 2 - texture_width // 2},{square_size // 2}',
-                                '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'octagon':
-                # Ośmiokąt — szary kolor w kształcie ośmiokąta wycentrowany w kwadracie
-                margin = min(texture_width, texture_height) // 4
-                subprocess.run(['magick', '-size', f'{square_size}x{square_size}', 'xc:transparent',
-                                '-fill', '#808080', '-gravity', 'center',
-                                '-draw',
-                                f'polygon {square_size // 2 - texture_width // 2 + margin},{square_size // 2 - texture_height // 2} {square_size // 2 + texture_width // 2 - margin},{square_size // 2 - texture_height // 2} {square_size // 2 + texture_width // 2},{square_size // 2 - texture_height // 2 + margin} {square_size // 2 + texture_width // 2},{square_size // 2 + texture_height // 2 - margin} {square_size // 2 + texture_width // 2 - margin},{square_size // 2 + texture_height // 2} {square_size // 2 - texture_width // 2 + margin},{square_size // 2 + texture_height // 2} {square_size // 2 - texture_width // 2},{square_size // 2 + texture_height // 2 - margin} {square_size // 2 - texture_width // 2},{square_size // 2 - texture_height // 2 + margin}',
-                                '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            else:
-                # Domyślnie prostokąt wycentrowany w kwadracie
-                subprocess.run(['magick', '-size', f'{square_size}x{square_size}', 'xc:transparent',
-                                '-fill', '#808080', '-gravity', 'center',
-                                '-draw',
-                                f'rectangle {square_size // 2 - texture_width // 2},{square_size // 2 - texture_height // 2} {square_size // 2 + texture_width // 2},{square_size // 2 + texture_height // 2}',
-                                '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-
-            print_if_not_quiet(ConsoleStyle.success(f"Utworzono kwadratową teksturę tła [{reverse_texture_name}] (kształt: {sign_shape})"))
-        except subprocess.CalledProcessError as e:
-            print_if_not_quiet(ConsoleStyle.warning(f"Błąd tworzenia tekstury tła [{reverse_texture_name}]: {e}"))
-            return None
-    else:
-        # Użyj oryginalnych wymiarów
-        print_if_not_quiet(ConsoleStyle.info(f"Używam oryginalnych wymiarów tekstury tła [{texture_width}x{texture_height}]"))
+    if not pending:
+        print_if_not_quiet(ConsoleStyle.success(f"Wszystkie tekstury tła są aktualne [{len(plan.reverse_textures)}]"))
+        return
 
-        # Twórz neutralną szarą teksturę tła w formacie sRGB z kanałem alpha zgodnie z kształtem
+    # Neutralne szare tekstury tła w formacie sRGB z kanałem alpha zgodnie z kształtem
+    textures = reverse_textures(spec for spec, _ in pending.values())
+    for reverse_texture_name, (spec, cache_inputs) in pending.items():
         try:
-            if sign_shape == 'triangle':
-                # Trójkąt — szary kolor w kształcie trójkąta
-                subprocess.run(
-                    ['magick', '-size', f'{texture_width}x{texture_height}', 'xc:transparent', '-fill', '#808080',
-                     '-draw', f'polygon {texture_width // 2},0 0,{texture_height} {texture_width},{texture_height}',
-                     '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'inverted_triangle':
-                # Odwrócony trójkąt — szary kolor w kształcie odwróconego trójkąta
-                subprocess.run(
-                    ['magick', '-size', f'{texture_width}x{texture_height}', 'xc:transparent', '-fill', '#808080',
-                     '-draw', f'polygon 0,0 {texture_width},0 {texture_width // 2},{texture_height}', '-alpha', 'on',
-                     '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'circle':
-                # Koło — szary kolor w kształcie koła
-                subprocess.run(
-                    ['magick', '-size', f'{texture_width}x{texture_height}', 'xc:transparent', '-fill', '#808080',
-                     '-draw', f'circle {texture_width // 2},{texture_height // 2} {texture_width // 2},0', '-alpha',
-                     'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'square':
-                # Kwadrat — szary kolor w kształcie kwadratu
-                subprocess.run(
-                    ['magick', '-size', f'{texture_width}x{texture_height}', 'xc:transparent', '-fill', '#808080',
-                     '-draw', f'rectangle 0,0 {texture_width - 1},{texture_height - 1}', '-alpha', 'on', '-define',
-                     'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'diamond':
-                # Romb — szary kolor w kształcie rombu
-                subprocess.run(
-                    ['magick', '-size', f'{texture_width}x{texture_height}', 'xc:transparent', '-fill', '#808080',
-                     '-draw',
-                     f'polygon {texture_width // 2},0 {texture_width},{texture_height // 2} {texture_width // 2},{texture_height} 0,{texture_height // 2}',
-                     '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            elif sign_shape == 'octagon':
-                # Ośmiokąt — szary kolor w kształcie ośmiokąta
-                margin = min(texture_width, texture_height) // 4
-                subprocess.run(
-                    ['magick', '-size', f'{texture_width}x{texture_height}', 'xc:transparent', '-fill', '#808080',
-                     '-draw',
-                     f'polygon {margin},0 {texture_width - margin},0 {texture_width},{margin} {texture_width},{texture_height - margin} {texture_width - margin},{texture_height} {margin},{texture_height} 0,{texture_height - margin} 0,{margin}',
-                     '-alpha', 'on', '-define', 'png:color-type=6', reverse_texture_path], check=True)
-            else:
-                # Domyślnie prostokąt
-                subprocess.run(
-                    ['magick', '-size', f'{texture_width}x{texture_height}', 'xc:transparent', '-fill', '#808080',
-                     '-draw', f'rectangle 0,0 {texture_width - 1},{texture_height - 1}', '-alpha', 'on', '-define',
-                     'png:color-type=6', reverse_texture_path], check=True)
-
-            print_if_not_quiet(ConsoleStyle.success(f"Utworzono teksturę tła [{reverse_texture_name}] (kształt: {sign_shape})"))
-        except subprocess.CalledProcessError as e:
+            write_reverse_texture(reverse_texture_name, textures[spec])
+        except OSError as e:
             print_if_not_quiet(ConsoleStyle.warning(f"Błąd tworzenia tekstury tła [{reverse_texture_name}]: {e}"))
-            return None
+            plan.failed.add(reverse_texture_name)
+            continue
+        get_build_cache().record(f"reverse:{reverse_texture_name}", cache_inputs,
+                                 [get_reverse_texture_path(reverse_texture_name)])
+        print_if_not_quiet(ConsoleStyle.success(f"Utworzono teksturę tła [{reverse_texture_name}] (kształt: {spec[0]})"))
+    print_if_not_quiet(ConsoleStyle.info(
+        f"Utworzono [{len(pending) - len(plan.failed)}] z [{len(plan.reverse_textures)}] tekstur tła"))
+
+
+def create_models(plan):
+    """Utwórz lub zaktualizuj każdy model z planu dokładnie raz"""
+    for artifact in plan.models.values():
+        try:
+            update_model_if_needed(artifact.sign_shape, artifact.sign_width, artifact.sign_height, artifact.target_width,
+                                   artifact.target_height, artifact.vertical_alignment)
+        except SchemaValidationError as e:
+            # Znaki tego modelu kończą się błędem, pozostałe modele i znaki są budowane dalej
+            print_if_not_quiet(ConsoleStyle.error(f"Model [{artifact.name}] niezgodny ze schematem: {e}"))
+            plan.failed.add(artifact.name)
 
-    terrain_path = "RP/textures/terrain_texture.json"
 
-    with open(terrain_path, 'r') as f:
-        terrain = json.load(f)
+def build_shared_artifacts(plan, force_rebuild=False):
+    """Zbuduj artefakty współdzielone przez znaki, zanim rozpocznie się praca per znak"""
+    if not plan.signs:
+        return
+    with stage("reverse_textures"):
+        create_reverse_textures(plan, force_rebuild)
+    with stage("models"):
+        create_models(plan)
 
-    # Sprawdź, czy już istnieje
-    if f"polish_road_sign_back:{reverse_texture_name}" in terrain["texture_data"]:
-        print_if_not_quiet(ConsoleStyle.success(f"Tekstura tła [{reverse_texture_name}] już istnieje w terrain_texture.json"))
-        return reverse_texture_name
 
-    # Dodaj wpis tekstury tła
-    terrain["texture_data"][f"polish_road_sign_back:{reverse_texture_name}"] = {
-        "textures": f"textures/blocks/reverse/{reverse_texture_name}.png"
-    }
+def add_reverse_texture_to_terrain(reverse_texture_name):
+    """Dodaj teksturę tła do terrain_texture.json"""
+    if _deferred_terrain_updates is not None:
+        _deferred_terrain_updates.append((add_reverse_texture_to_terrain, reverse_texture_name))
+        return
 
-    with open(terrain_path, 'w') as f:
-        json.dump(terrain, f, indent=2)
+    # Sprawdź, czy już istnieje
+    if not get_terrain_registry().add(f"polish_road_sign_back:{reverse_texture_name}",
+                                      f"textures/blocks/reverse/{reverse_texture_name}.png"):
+        print_if_not_quiet(ConsoleStyle.success(f"Tekstura tła [{reverse_texture_name}] już istnieje w terrain_texture.json"))
+        return
 
     print_if_not_quiet(ConsoleStyle.success(f"Dodano teksturę tła [{reverse_texture_name}] do terrain_texture.json"))
 
-    return reverse_texture_name
-
 
 def add_averse_texture_to_terrain(sign_id):
     """Dodaj teksturę znaku do terrain_texture.json"""
-    terrain_path = "RP/textures/terrain_texture.json"
-    category = sign_id.split('_')[0]
+    if _deferred_terrain_updates is not None:
+        _deferred_terrain_updates.append((add_averse_texture_to_terrain, sign_id))
+        return
 
-    with open(terrain_path, 'r') as f:
-        terrain = json.load(f)
+    category = sign_id.split('_')[0]
 
     # Sprawdź, czy już istnieje
-    if f"polish_road_sign:{sign_id}" in terrain["texture_data"]:
+    if not get_terrain_registry().add(f"polish_road_sign:{sign_id}",
+                                      f"textures/blocks/averse/{category.lower()}/{sign_id}.png"):
         print_if_not_quiet(ConsoleStyle.success(f"Tekstura znaku [{sign_id}] już istnieje w terrain_texture.json"))
         return
 
-    # Dodaj wpis tekstury znaku
-    terrain["texture_data"][f"polish_road_sign:{sign_id}"] = {
-        "textures": f"textures/blocks/averse/{category.lower()}/{sign_id}.png"
-    }
-
-    with open(terrain_path, 'w') as f:
-        json.dump(terrain, f, indent=2)
-
     print_if_not_quiet(ConsoleStyle.success(f"Dodano teksturę znaku [{sign_id}] do terrain_texture.json"))
 
 
 def get_model_dimensions(model_name):
     """Pobierz wymiary modelu z pliku geometry"""
-    model_path = f"RP/models/blocks/{model_name}.geo.json"
-
-    if not os.path.exists(model_path):
-        print_if_not_quiet(ConsoleStyle.warning(f"Nie znaleziono modelu [{model_path}]"))
+    if not get_model_registry().exists(model_name):
+        print_if_not_quiet(ConsoleStyle.warning(f"Nie znaleziono modelu [{get_model_registry().model_path(model_name)}]"))
         return None, None
 
-    try:
-        with open(model_path, 'r') as f:
-            model_data = json.load(f)
-
-        # Pobierz wymiary z pierwszego cuba
-        if (model_data.get("minecraft:geometry") and
-                len(model_data["minecraft:geometry"]) > 0 and
-                model_data["minecraft:geometry"][0].get("bones") and
-                len(model_data["minecraft:geometry"][0]["bones"]) > 0 and
-                model_data["minecraft:geometry"][0]["bones"][0].get("cubes") and
-                len(model_data["minecraft:geometry"][0]["bones"][0]["cubes"]) > 0):
-
-            cube = model_data["minecraft:geometry"][0]["bones"][0]["cubes"][0]
-            size = cube["size"]
-
-            # Oblicz wymiary
-            model_width = size[0]
-            model_height = size[1]
-
-            return model_width, model_height
-        else:
-            print_if_not_quiet(ConsoleStyle.warning(f"Nieprawidłowa struktura modelu [{model_path}]"))
-            return None, None
-
-    except Exception as e:
-        print_if_not_quiet(ConsoleStyle.warning(f"Błąd odczytu modelu [{model_name}]: {e}"))
-        return None, None
+    # Pobierz wymiary z pierwszego cuba
+    model_width, model_height = get_model_registry().dimensions(model_name)
+    if model_width is None:
+        print_if_not_quiet(ConsoleStyle.warning(f"Nieprawidłowa struktura modelu [{get_model_registry().model_path(model_name)}]"))
+    return model_width, model_height
 
 
 def create_block_template(sign_id, model_name, reverse_texture_name, model_width, model_height, vertical_alignment="bottom"):
@@ -564,29 +521,14 @@ def create_block_template(sign_id, model_name, reverse_texture_name, model_width
     }
 
 
-def process_sign(sign_id, wikipedia_file_page, sign_width, sign_height, database_path, skip_download=False,
-                 force_rebuild=False):
-    """Przetwórz pojedynczy znak z automatycznym tworzeniem modeli i tekstur"""
-
-    # Pobierz dane znaku z bazy danych
-    with open(database_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    sign_data = find_sign_in_database(sign_id, data)
-    if not sign_data:
-        print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono znaku [{sign_id}] w bazie danych"))
-        return False
-
-    # Pobierz kategorię
-    category = get_category_for_sign(sign_id, data)
-    if not category:
-        print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono kategorii dla znaku [{sign_id}]"))
-        return False
-
-    # Pobierz kształt znaku z bazy danych
-    sign_shape = sign_data.get('sign_shape', 'rectangle')
-    # Pobierz wyrównanie w pionie (domyślnie "bottom")
-    vertical_alignment = sign_data.get('vertical_alignment', 'bottom')
+def process_sign(sign, model_name, reverse_texture_name, skip_download=False, force_rebuild=False):
+    """Przetwórz pojedynczy znak: tekstura awersu i blok (model i tekstura tła powstają wcześniej, z planu)"""
+    sign_id = sign.sign_id
+    sign_shape = sign.sign_shape
+    sign_width = sign.sign_width
+    sign_height = sign.sign_height
+    vertical_alignment = sign.vertical_alignment
+    wikipedia_file_page = sign.wikipedia_file_page
     target_width = scale_size_from_mm_to_px(sign_width)
     target_height = scale_size_from_mm_to_px(sign_height)
     ConsoleStyle.print_section(f"Przetwarzanie znaku [{sign_id}]")
@@ -595,14 +537,21 @@ def process_sign(sign_id, wikipedia_file_page, sign_width, sign_height, database
     if not create_averse_texture_if_needed(sign_id, target_width, target_height, wikipedia_file_page, skip_download, force_rebuild):
         return False
 
-    # Utwórz teksturę tła, jeśli nie istnieje
-    reverse_texture_name = create_reverse_texture_if_needed(sign_shape, sign_width, sign_height, target_width,
-                                                               target_height, force_rebuild)
+    if not model_name or not reverse_texture_name:
+        print_if_not_quiet(ConsoleStyle.error(f"Brak modelu lub tekstury tła dla znaku [{sign_id}]"))
+        return False
 
-    # Automatycznie twórz lub aktualizuj model i teksturę tła
-    model_name = update_model_if_needed(sign_shape, sign_width, sign_height, target_width, target_height, vertical_alignment)
+    # Wpis dodaje pierwszy znak w kolejności, tak jak przy przetwarzaniu szeregowym
+    add_reverse_texture_to_terrain(reverse_texture_name)
 
-    return update_block_if_needed(sign_id, model_name, reverse_texture_name, sign_width, sign_height, vertical_alignment)
+    with stage("block", sign_id):
+        try:
+            return update_block_if_needed(sign_id, model_name, reverse_texture_name, sign_width, sign_height,
+                                          vertical_alignment)
+        except SchemaValidationError as e:
+            # Błąd jednego znaku nie może przerwać przebiegu (w puli procesów zatrzymałby executor.map)
+            print_if_not_quiet(ConsoleStyle.error(f"Blok [{sign_id}] niezgodny ze schematem: {e}"))
+            return False
 
 
 def create_averse_texture_if_needed(sign_id, target_width, target_height, wikipedia_file_page, skip_download=False, force_rebuild=False):
@@ -619,18 +568,33 @@ def create_averse_texture_if_needed(sign_id, target_width, target_height, wikipe
     if not svg_path:
         return False
 
-    # Usuń istniejącą teksturę, jeśli force_rebuild = True
+    cache_key = f"averse:{sign_id}"
+    cache_inputs = {
+        'svg': file_hash(svg_path),
+        'width': target_width,
+        'height': target_height,
+        'rasterizer': get_rasterizer().name,
+        'tools': get_rasterizer().versions(),
+    }
+
+    # Usuń istniejącą teksturę, jeśli force_rebuild = True lub zmieniły się dane wejściowe
     if os.path.exists(png_path):
         if force_rebuild:
             os.remove(png_path)
             print_if_not_quiet(ConsoleStyle.warning(f"Usunięto istniejącą teksturę [{png_path}]"))
-        else:
+        elif is_texture_up_to_date(cache_key, cache_inputs, png_path, target_width, target_height):
             print_if_not_quiet(ConsoleStyle.success(f"Tekstura znaku już istnieje [{png_path}]"))
+            add_averse_texture_to_terrain(sign_id)
             return True
+        else:
+            print_if_not_quiet(ConsoleStyle.process(f"Dane wejściowe tekstury zmieniły się, przebudowuję [{png_path}]"))
 
-    if not convert_svg_to_png(svg_path, png_path, target_width, target_height):
+    with stage("rasterize", sign_id):
+        converted = convert_svg_to_png(svg_path, png_path, target_width, target_height)
+    if not converted:
         print_if_not_quiet(ConsoleStyle.error(f"Nie udało się skonwertować SVG dla {sign_id}"))
         return False
+    get_build_cache().record(cache_key, cache_inputs, [png_path])
     print_if_not_quiet(ConsoleStyle.success(f"Utworzono teksturę znaku [{png_path}] ({target_width}x{target_height})"))
 
     # Dodaj teksturę znaku do terrain_texture.json
@@ -639,48 +603,123 @@ def create_averse_texture_if_needed(sign_id, target_width, target_height, wikipe
     return True
 
 
-def get_svg(target_dir, sign_id, wikipedia_file_page, skip_download=False):
+def get_svg(target_dir, sign_id, wikipedia_file_page, skip_download=False, download_settings=None):
     # Ścieżka do lokalnego pliku SVG
     svg_path = f"{target_dir}/{sign_id}.svg"
 
-    if skip_download:
-        # Sprawdź, czy lokalny plik SVG istnieje
-        if not os.path.exists(svg_path):
-            print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono lokalnego pliku SVG [{svg_path}]"))
+    if not skip_download:
+        # Pobierz stronę Wikipedii i plik SVG do katalogu cache obok PNG
+        if not asyncio.run(download_sign_svgs([(sign_id, wikipedia_file_page, svg_path)], download_settings)):
             return False
-        print_if_not_quiet(ConsoleStyle.info(f"Używam lokalnego SVG [{svg_path}]"))
+        return svg_path
+
+    # Sprawdź, czy lokalny plik SVG istnieje
+    if not os.path.exists(svg_path):
+        print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono lokalnego pliku SVG [{svg_path}]"))
+        return False
+    print_if_not_quiet(ConsoleStyle.info(f"Używam lokalnego SVG [{svg_path}]"))
+    return svg_path
+
+
+# Wynik etapu pobierania dla znaku
+SVG_DOWNLOADED = 'downloaded'
+SVG_UNCHANGED = 'unchanged'
+
+
+async def revalidate_sign_svg(downloader, sign_id, svg_path):
+    """Zapytanie warunkowe o zapamiętaną wersję SVG; zwraca status lub None, gdy potrzebne pełne pobranie"""
+    metadata = get_svg_metadata().get(sign_id)
+    try:
+        with stage("download", sign_id, concurrent=True):
+            response = await downloader.download(metadata['url'], svg_path,
+                                                 headers=get_svg_metadata().conditional_headers(sign_id))
+    except DownloadError as e:
+        print_if_not_quiet(ConsoleStyle.warning(f"Nie udało się sprawdzić SVG dla [{sign_id}]: {e}"))
+        return None
+
+    if response.status == 304:
+        get_svg_metadata().touch(sign_id)
+        print_if_not_quiet(ConsoleStyle.success(f"SVG bez zmian [{svg_path}]"))
+        return SVG_UNCHANGED
+
+    get_svg_metadata().record(sign_id, metadata['page'], metadata['url'], hashlib.sha1(response.body).hexdigest(),
+                              response.headers.get('etag'), response.headers.get('last-modified'))
+    print_if_not_quiet(ConsoleStyle.success(f"Pobrano zmieniony SVG [{svg_path}]"))
+    return SVG_DOWNLOADED
+
+
+async def fetch_sign_svg(downloader, sign_id, wikipedia_file_page, svg_path, image_info=None):
+    """Pobierz plik SVG znaku; bez informacji z API adres SVG odczytywany jest ze strony pliku"""
+    if image_info:
+        # Plik w cache jest identyczny z plikiem w repozytorium — nie ma czego pobierać
+        if image_info.matches_file(svg_path):
+            print_if_not_quiet(ConsoleStyle.success(f"SVG jest aktualny [{svg_path}]"))
+            return SVG_UNCHANGED
+        svg_url = image_info.url
     else:
         # Pobierz stronę Wikipedii (użyj bezpośredniego linku do pliku)
-        html_content = download_wikipedia_page(wikipedia_file_page)
-        if not html_content:
-            print_if_not_quiet(ConsoleStyle.error(f"Nie udało się pobrać strony dla [{sign_id}]"))
-            return False
+        try:
+            with stage("resolve_url", sign_id, concurrent=True):
+                html_content = await downloader.fetch_text(wikipedia_file_page)
+        except DownloadError as e:
+            print_if_not_quiet(ConsoleStyle.error(f"Nie udało się pobrać strony dla [{sign_id}]: {e}"))
+            return None
 
         # Wyciągnij link do SVG z pliku
         svg_url = extract_svg_url(html_content)
         if not svg_url:
             print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono linku SVG dla [{sign_id}]"))
-            return False
-
-        # Pobierz SVG do katalogu cache obok PNG
-        if not download_svg(svg_url, svg_path):
-            print_if_not_quiet(ConsoleStyle.error(f"Nie udało się pobrać SVG dla [{sign_id}]"))
-            return False
-
-        print_if_not_quiet(ConsoleStyle.success(f"Pobrano SVG [{svg_path}]"))
-    return svg_path
-
+            return None
 
-def download_wikipedia_page(url):
-    """Pobierz stronę Wikipedii"""
     try:
-        result = subprocess.run(['curl', '-A', 'Mozilla/5.0', '-L', '--insecure', url],
-                                capture_output=True, text=True, timeout=30)
-        return result.stdout
-    except Exception as e:
-        print_if_not_quiet(ConsoleStyle.warning(f"Błąd pobierania strony: {e}"))
+        with stage("download", sign_id, concurrent=True):
+            response = await downloader.download(svg_url, svg_path, image_info.sha1 if image_info else None)
+    except DownloadError as e:
+        print_if_not_quiet(ConsoleStyle.error(f"Nie udało się pobrać SVG dla [{sign_id}]: {e}"))
         return None
 
+    get_svg_metadata().record(sign_id, wikipedia_file_page, svg_url, hashlib.sha1(response.body).hexdigest(),
+                              response.headers.get('etag'), response.headers.get('last-modified'))
+    print_if_not_quiet(ConsoleStyle.success(f"Pobrano SVG [{svg_path}]"))
+    return SVG_DOWNLOADED
+
+
+def can_revalidate_svg(sign_id, wikipedia_file_page, svg_path):
+    """Czy lokalny SVG odpowiada zapamiętanej wersji, o którą można zapytać warunkowo"""
+    metadata = get_svg_metadata().get(sign_id)
+    return bool(metadata and metadata.get('page') == wikipedia_file_page
+                and get_svg_metadata().conditional_headers(sign_id)
+                and file_sha1(svg_path) == metadata.get('sha1'))
+
+
+async def download_sign_svgs(downloads, download_settings=None, sync=False):
+    """Pobierz współbieżnie pliki SVG [(sign_id, wikipedia_file_page, svg_path)]; zwraca {sign_id: status}"""
+    async with AsyncDownloader(download_settings) as downloader:
+        statuses = {}
+        if sync:
+            # Najpierw zapytania warunkowe o pliki znane z poprzednich pobrań
+            known = [(sign_id, svg_path) for sign_id, wikipedia_file_page, svg_path in downloads
+                     if can_revalidate_svg(sign_id, wikipedia_file_page, svg_path)]
+            results = await asyncio.gather(*(revalidate_sign_svg(downloader, sign_id, svg_path)
+                                             for sign_id, svg_path in known))
+            statuses = {sign_id: status for (sign_id, _), status in zip(known, results) if status}
+            downloads = [download for download in downloads if download[0] not in statuses]
+
+        # Adresy SVG i sumy SHA-1 dla pozostałych znaków: jedno zapytanie API na 50 plików
+        resolver = ImageInfoResolver(downloader)
+        with stage("resolve_url", concurrent=True):
+            image_infos = await resolver.resolve(wikipedia_file_page for _, wikipedia_file_page, _ in downloads)
+        for error in resolver.errors:
+            print_if_not_quiet(ConsoleStyle.warning(f"Błąd zapytania imageinfo: {error}"))
+        print_if_not_quiet(ConsoleStyle.info(
+            f"Rozwiązano [{len(image_infos)}/{len(downloads)}] adresów SVG w [{resolver.query_count}] zapytaniach API"))
+
+        results = await asyncio.gather(*(
+            fetch_sign_svg(downloader, sign_id, wikipedia_file_page, svg_path, image_infos.get(wikipedia_file_page))
+            for sign_id, wikipedia_file_page, svg_path in downloads))
+        statuses.update((sign_id, status) for (sign_id, _, _), status in zip(downloads, results) if status)
+    return statuses
+
 
 def extract_svg_url(html_content):
     """Wyciągnij link do pliku SVG z HTML — ulepszona wersja"""
@@ -715,86 +754,27 @@ def extract_svg_url(html_content):
     return None
 
 
-def download_svg(svg_url, output_path):
-    """Pobierz plik SVG"""
-    try:
-        result = subprocess.run(['curl', '-A', 'Mozilla/5.0', '-L', '--insecure', svg_url, '-o', output_path],
-                                capture_output=True, timeout=30)
-        return result.returncode == 0
-    except Exception as e:
-        print_if_not_quiet(ConsoleStyle.warning(f"Błąd pobierania SVG: {e}"))
-        return False
-
-
 def convert_svg_to_png(svg_path, png_path, target_width, target_height):
     """Konwertuj SVG na PNG z określoną szerokością"""
-    try:
-        # Sprawdź, czy trzeba dodać padding (width < height)
-        if target_width < target_height:
-            # Dodaj padding wokół obrazka
-            padding = (target_height - target_width) // 2
-            new_width = target_height
-            new_height = target_height
-            print_if_not_quiet(ConsoleStyle.info(f"Dodaję padding wokół obrazka [{new_width}x{new_height}] (padding: {padding}px)"))
-
-            # Najpierw konwertuj SVG do oryginalnych wymiarów
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                temp_png = temp_file.name
-
-            result = subprocess.run([
-                'inkscape', '--export-type=png',
-                '--export-filename=' + temp_png,
-                '--export-width=' + str(target_width),
-                '--export-height=' + str(target_height),
-                '--export-background-opacity=0',
-                '--export-background=transparent',
-                '--export-png-color-mode=RGBA_8', svg_path
-            ], capture_output=True, text=True)
-
-            if result.returncode == 0:
-                # Dodaj padding z jawnie ustawioną przeroczystością
-                subprocess.run([
-                    'magick', temp_png, '-gravity', 'center', '-background', 'none',
-                    '-extent', f'{new_width}x{new_height}',
-                    '-alpha', 'on', png_path
-                ], check=True)
-
-                # Usuń plik tymczasowy
-                os.remove(temp_png)
-
-                return True
-            else:
-                print_if_not_quiet(ConsoleStyle.error(f"Błąd konwersji SVG: {result.stderr}"))
-                return False
-        else:
-            # Użyj oryginalnych wymiarów
-            print_if_not_quiet(ConsoleStyle.info(f"Używam oryginalnych wymiarów [{target_width}x{target_height}]"))
-            result = subprocess.run([
-                'inkscape', '--export-type=png',
-                '--export-filename=' + png_path,
-                '--export-width=' + str(target_width),
-                '--export-height=' + str(target_height),
-                '--export-background-opacity=0',
-                '--export-background=transparent',
-                '--export-png-color-mode=RGBA_8', svg_path
-            ], capture_output=True, text=True)
-
-            if result.returncode == 0:
-                return True
-            else:
-                print_if_not_quiet(ConsoleStyle.error(f"Błąd konwersji SVG: {result.stderr}"))
-                return False
+    canvas_width, canvas_height = get_texture_canvas_size(target_width, target_height)
+    # Sprawdź, czy trzeba dodać padding (width < height)
+    if (canvas_width, canvas_height) != (target_width, target_height):
+        padding = (canvas_width - target_width) // 2
+        print_if_not_quiet(ConsoleStyle.info(f"Dodaję padding wokół obrazka [{canvas_width}x{canvas_height}] (padding: {padding}px)"))
+    else:
+        print_if_not_quiet(ConsoleStyle.info(f"Używam oryginalnych wymiarów [{target_width}x{target_height}]"))
 
-    except subprocess.CalledProcessError as e:
-        print_if_not_quiet(ConsoleStyle.error(f"Błąd konwersji SVG: {e}"))
-        return False
+    # Obraz renderowany jest od razu na docelowe płótno — jeden zapis PNG, bez plików tymczasowych
+    success, error = get_rasterizer().render(svg_path, png_path, target_width, target_height,
+                                             (canvas_width, canvas_height))
+    if not success:
+        print_if_not_quiet(ConsoleStyle.error(f"Błąd konwersji SVG: {error}"))
+    return success
 
 
 def update_block_if_needed(sign_id, model_name, reverse_texture_name, sign_width, sign_height, vertical_alignment="bottom"):
     ConsoleStyle.print_section("TWORZENIE BLOKU")
-    category = sign_id.split('_')[0]
-    category_lower = category.lower()
-    block_path = f"BP/blocks/{category_lower}/{sign_id}.block.json"
+    block_path = get_block_path(sign_id)
     new_block = False
     # Utwórz lub zaktualizuj definicję bloku
     if not os.path.exists(block_path):
@@ -809,10 +789,16 @@ def update_block_if_needed(sign_id, model_name, reverse_texture_name, sign_width
 
     # Twórz blok na podstawie szablonu
     block_template = create_block_template(sign_id, model_name, reverse_texture_name, cube_width, cube_height, vertical_alignment)
+    cache_key = f"block:{sign_id}"
+    cache_inputs = {'template': content_hash(block_template)}
 
-    # Zapisz blok
-    with open(block_path, 'w') as f:
-        json.dump(block_template, f, indent=2)
+    if get_build_cache().is_fresh(cache_key, cache_inputs):
+        print_if_not_quiet(ConsoleStyle.success(f"Blok jest aktualny [{sign_id}] ({cube_width}x{cube_height})"))
+        return True
+
+    # Zapisz blok (plik o tej samej zawartości nie jest nadpisywany)
+    get_emitter().write_json(block_path, block_template)
+    get_build_cache().record(cache_key, cache_inputs, [block_path])
 
     if new_block:
         print_if_not_quiet(ConsoleStyle.success(f"Utworzono blok [{sign_id}] ({cube_width}x{cube_height})"))
@@ -821,201 +807,6 @@ def update_block_if_needed(sign_id, model_name, reverse_texture_name, sign_width
     return True
 
 
-def cleanup_category_files(data, category):
-    """Usuń pliki dla konkretnej kategorii"""
-    ConsoleStyle.print_section(f"CZYSZCZENIE KATEGORII {category}")
-
-    category_lower = category.lower()
-    removed_count = 0
-
-    # Usuń bloki dla kategorii
-    block_dir = f"BP/blocks/{category_lower}"
-    if os.path.exists(block_dir):
-        for file in os.listdir(block_dir):
-            if file.endswith('.block.json'):
-                os.remove(os.path.join(block_dir, file))
-                print_if_not_quiet(ConsoleStyle.warning(f"Usunięto blok [{category_lower}/{file}]"))
-                removed_count += 1
-
-    # Usuń tekstury PNG dla kategorii (zachowaj SVG)
-    texture_dir = f"RP/textures/blocks/averse/{category_lower}"
-    if os.path.exists(texture_dir):
-        for file in os.listdir(texture_dir):
-            if file.endswith('.png'):
-                os.remove(os.path.join(texture_dir, file))
-                print_if_not_quiet(ConsoleStyle.warning(f"Usunięto teksturę [{category_lower}/{file}]"))
-                removed_count += 1
-
-    # Usuń wpisy z terrain_texture.json dla znaków z tej kategorii
-    terrain_path = "RP/textures/terrain_texture.json"
-    if os.path.exists(terrain_path):
-        with open(terrain_path, 'r') as f:
-            terrain_data = json.load(f)
-
-        # Usuń wpisy dla znaków z tej kategorii
-        keys_to_remove = []
-        for key in terrain_data['texture_data']:
-            if key.startswith(f'polish_road_sign:{category_lower}_'):
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            del terrain_data['texture_data'][key]
-            print_if_not_quiet(ConsoleStyle.warning(f"Usunięto [{key}] z terrain_texture.json"))
-            removed_count += 1
-
-        with open(terrain_path, 'w') as f:
-            json.dump(terrain_data, f, indent=2)
-
-    if removed_count > 0:
-        print_if_not_quiet(ConsoleStyle.success(f"Czyszczenie kategorii [{category}] zakończone - usunięto {removed_count} plików"))
-    else:
-        print_if_not_quiet(ConsoleStyle.info(f"Brak plików do usunięcia w kategorii [{category}]"))
-    print_if_not_quiet(ConsoleStyle.divider())
-
-
-def cleanup_orphaned_files(data):
-    """Usuń pliki dla znaków, które nie istnieją w bazie danych"""
-    ConsoleStyle.print_section("CZYSZCZENIE OSIEROCONYCH PLIKÓW")
-
-    # Zbierz wszystkie znaki z bazy danych
-    database_blocks = set()
-    for category in data['categories'].values():
-        database_blocks.update(category['blocks'].keys())
-    
-    print_if_not_quiet(ConsoleStyle.info(f"Znaki w bazie danych: {len(database_blocks)}"))
-    
-    removed_count = 0
-    
-    # Sprawdź i usuń bloki dla nieistniejących znaków
-    for category in data['categories'].keys():
-        category_lower = category.lower()
-        block_dir = f"BP/blocks/{category_lower}"
-        if os.path.exists(block_dir):
-            for file in os.listdir(block_dir):
-                if file.endswith('.block.json'):
-                    sign_id = file.replace('.block.json', '')
-                    if sign_id not in database_blocks:
-                        os.remove(os.path.join(block_dir, file))
-                        print_if_not_quiet(ConsoleStyle.warning(f"Usunięto blok [{category_lower}/{file}] (nie istnieje w bazie)"))
-                        removed_count += 1
-
-    # Sprawdź i usuń tekstury dla nieistniejących znaków
-    for category in data['categories'].keys():
-        category_lower = category.lower()
-        texture_dir = f"RP/textures/blocks/averse/{category_lower}"
-        if os.path.exists(texture_dir):
-            for file in os.listdir(texture_dir):
-                if file.endswith('.png'):
-                    sign_id = file.replace('.png', '')
-                    if sign_id not in database_blocks:
-                        os.remove(os.path.join(texture_dir, file))
-                        print_if_not_quiet(ConsoleStyle.warning(f"Usunięto teksturę [{category_lower}/{file}] (nie istnieje w bazie)"))
-                        removed_count += 1
-
-    # Usuń wpisy z terrain_texture.json dla nieistniejących znaków
-    terrain_path = "RP/textures/terrain_texture.json"
-    if os.path.exists(terrain_path):
-        with open(terrain_path, 'r') as f:
-            terrain_data = json.load(f)
-
-        keys_to_remove = []
-        for key in terrain_data['texture_data']:
-            if key.startswith('polish_road_sign:'):
-                sign_id = key.replace('polish_road_sign:', '')
-                if sign_id not in database_blocks:
-                    keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            del terrain_data['texture_data'][key]
-            print_if_not_quiet(ConsoleStyle.warning(f"Usunięto [{key}] z terrain_texture.json (nie istnieje w bazie)"))
-            removed_count += 1
-
-        with open(terrain_path, 'w') as f:
-            json.dump(terrain_data, f, indent=2)
-
-    if removed_count > 0:
-        print_if_not_quiet(ConsoleStyle.success(f"Czyszczenie zakończone - usunięto {removed_count} plików"))
-    else:
-        print_if_not_quiet(ConsoleStyle.info("Brak plików do usunięcia"))
-    print_if_not_quiet(ConsoleStyle.divider())
-
-def cleanup_all_files(data):
-    """Usuń wszystkie istniejące bloki, modele, tekstury PNG i ich definicje"""
-    ConsoleStyle.print_section("CZYSZCZENIE WSZYSTKICH PLIKÓW")
-
-    # Pobierz kategorie z bazy danych
-    categories = list(data['categories'].keys())
-    print_if_not_quiet(ConsoleStyle.info(f"Znalezione kategorie: {', '.join(categories)}"))
-
-    removed_count = 0
-
-    # Usuń wszystkie bloki
-    for category in categories:
-        category_lower = category.lower()
-        block_dir = f"BP/blocks/{category_lower}"
-        if os.path.exists(block_dir):
-            for file in os.listdir(block_dir):
-                if file.endswith('.block.json'):
-                    os.remove(os.path.join(block_dir, file))
-                    print_if_not_quiet(ConsoleStyle.warning(f"Usunięto blok [{category_lower}/{file}]"))
-                    removed_count += 1
-
-    # Usuń wszystkie modele 3D
-    models_dir = "RP/models/blocks"
-    if os.path.exists(models_dir):
-        for file in os.listdir(models_dir):
-            if file.startswith('road_sign_') and file.endswith('.geo.json'):
-                os.remove(os.path.join(models_dir, file))
-                print_if_not_quiet(ConsoleStyle.warning(f"Usunięto model [{file}]"))
-                removed_count += 1
-
-    # Usuń wszystkie tekstury PNG (zachowaj SVG)
-    for category in categories:
-        category_lower = category.lower()
-        texture_dir = f"RP/textures/blocks/averse/{category_lower}"
-        if os.path.exists(texture_dir):
-            for file in os.listdir(texture_dir):
-                if file.endswith('.png'):
-                    os.remove(os.path.join(texture_dir, file))
-                    print_if_not_quiet(ConsoleStyle.warning(f"Usunięto teksturę [{category_lower}/{file}]"))
-                    removed_count += 1
-
-    # Usuń tekstury tła
-    sign_backs_dir = "RP/textures/blocks/reverse"
-    if os.path.exists(sign_backs_dir):
-        for file in os.listdir(sign_backs_dir):
-            if file.endswith('.png'):
-                os.remove(os.path.join(sign_backs_dir, file))
-                print_if_not_quiet(ConsoleStyle.warning(f"Usunięto teksturę tła [{file}]"))
-                removed_count += 1
-
-    # Wyczyść terrain_texture.json (zachowaj tylko nie-polish_road_sign wpisy)
-    terrain_path = "RP/textures/terrain_texture.json"
-    if os.path.exists(terrain_path):
-        with open(terrain_path, 'r') as f:
-            terrain_data = json.load(f)
-
-        # Usuń wszystkie polish_road_sign wpisy
-        keys_to_remove = []
-        for key in terrain_data['texture_data']:
-            if key.startswith('polish_road_sign'):
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            del terrain_data['texture_data'][key]
-            print_if_not_quiet(ConsoleStyle.warning(f"Usunięto [{key}] z terrain_texture.json"))
-            removed_count += 1
-
-        with open(terrain_path, 'w') as f:
-            json.dump(terrain_data, f, indent=2)
-
-    if removed_count > 0:
-        print_if_not_quiet(ConsoleStyle.success(f"Czyszczenie zakończone - usunięto {removed_count} plików"))
-    else:
-        print_if_not_quiet(ConsoleStyle.info("Brak plików do usunięcia"))
-    print_if_not_quiet(ConsoleStyle.divider())
-
-
 def get_all_languages(data):
     """Dynamicznie wykryj wszystkie języki z bazy danych"""
     langs = set()
@@ -1047,6 +838,7 @@ def update_language_files(data):
                 for lang in sign['translations']:
                     lang_map[lang][f'tile.polish_road_sign:{sign_id}.name'] = sign['translations'][lang]
     # Zapisz pliki
+    generated_keys = get_lang_keys(data)
     for lang in lang_map:
         lang_file = f"RP/texts/{lang}.lang"
         existing_content = {}
@@ -1057,13 +849,16 @@ def update_language_files(data):
                     if '=' in line:
                         key, value = line.split('=', 1)
                         existing_content[key] = value
+        # Usuń tłumaczenia znaków i kategorii, których nie ma już w bazie danych
+        existing_content = {key: value for key, value in existing_content.items()
+                            if not is_generated_lang_key(key) or key in generated_keys}
         existing_content.update(lang_map[lang])
         # Naturalne sortowanie
         sorted_keys = natsorted(existing_content.keys())
-        with open(lang_file, 'w', encoding='utf-8') as f:
-            for key in sorted_keys:
-                f.write(f"{key}={existing_content[key]}\n")
+        if get_emitter().write_text(lang_file, ''.join(f"{key}={existing_content[key]}\n" for key in sorted_keys)):
             print_if_not_quiet(ConsoleStyle.success(f"Zaktualizowano [{lang_file}] ({len(lang_map[lang])} tłumaczeń)"))
+        else:
+            print_if_not_quiet(ConsoleStyle.success(f"Plik jest aktualny [{lang_file}] ({len(lang_map[lang])} tłumaczeń)"))
         total_translations += len(lang_map[lang])
     
     print_if_not_quiet(ConsoleStyle.info(f"Łącznie zaktualizowano {len(languages)} języków i {total_translations} tłumaczeń"))
@@ -1093,15 +888,193 @@ def update_crafting_catalog(data):
     for category in catalog["minecraft:crafting_items_catalog"]["categories"]:
         category["groups"] = groups
     
-    with open(catalog_path, 'w', encoding='utf-8') as f:
-        json.dump(catalog, f, indent=2, ensure_ascii=False)
-    
-    print_if_not_quiet(ConsoleStyle.success(f"Zaktualizowano [{catalog_path}]"))
+    try:
+        written = get_emitter().write_json(catalog_path, catalog, ensure_ascii=False)
+    except SchemaValidationError as e:
+        print_if_not_quiet(ConsoleStyle.error(f"Katalog crafting niezgodny ze schematem, plik bez zmian: {e}"))
+        return
+    if written:
+        print_if_not_quiet(ConsoleStyle.success(f"Zaktualizowano [{catalog_path}]"))
+    else:
+        print_if_not_quiet(ConsoleStyle.success(f"Plik jest aktualny [{catalog_path}]"))
     print_if_not_quiet(ConsoleStyle.info(f"Łącznie {len(groups)} kategorii i {total_items} znaków"))
 
 def update_all_related_files(data):
-    update_language_files(data)
-    update_crafting_catalog(data)
+    with stage("lang"):
+        update_language_files(data)
+    with stage("catalog"):
+        update_crafting_catalog(data)
+
+
+def _init_sign_worker(quiet_mode, rasterizer_name, profile=False):
+    """Przygotuj proces roboczy puli przetwarzania znaków"""
+    global _build_cache, _emitter, _image_index, _rasterizer_name, _rasterizer
+    ConsoleStyle.set_quiet_mode(quiet_mode)
+    # Zdarzenia odziedziczone po procesie głównym (fork) zostały już zapisane tam
+    get_profiler().pop_events()
+    if profile:
+        get_profiler().enable(f"worker {os.getpid()}")
+    _build_cache = None
+    _emitter = None
+    _image_index = None
+    # Każdy proces roboczy tworzy własny silnik (np. proces Inkscape) przy pierwszym eksporcie
+    _rasterizer_name = rasterizer_name
+    _rasterizer = None
+
+
+def _process_sign_task(task, skip_download, force_rebuild):
+    """Przetwórz znak w procesie roboczym, odraczając zapis terrain_texture.json i manifestu do procesu głównego"""
+    global _deferred_terrain_updates
+    sign, model_name, reverse_texture_name = task
+    _deferred_terrain_updates = []
+    try:
+        with stage("sign", sign.sign_id):
+            result = process_sign(sign, model_name, reverse_texture_name, skip_download, force_rebuild)
+        deferred_updates = _deferred_terrain_updates
+    finally:
+        _deferred_terrain_updates = None
+    return (result, deferred_updates, get_build_cache().pop_updates(), get_emitter().pop_counts(),
+            get_profiler().pop_events())
+
+
+def get_averse_svg_path(sign_id):
+    """Ścieżka pliku SVG znaku w katalogu tekstur awersu"""
+    category = sign_id.split('_')[0]
+    return f"RP/textures/blocks/averse/{category.lower()}/{sign_id}.svg"
+
+
+def download_signs_svgs(signs, download_settings=None, sync=False):
+    """Etap pobierania: wszystkie pliki SVG współbieżnie, z limitem zapytań; zwraca {sign_id: status}"""
+    ConsoleStyle.print_section("POBIERANIE PLIKÓW SVG")
+    downloads = [(sign.sign_id, sign.wikipedia_file_page, get_averse_svg_path(sign.sign_id)) for sign in signs]
+    try:
+        with stage("download_all"):
+            statuses = asyncio.run(download_sign_svgs(downloads, download_settings, sync))
+    finally:
+        get_svg_metadata().save()
+    changed_count = sum(1 for status in statuses.values() if status == SVG_DOWNLOADED)
+    print_if_not_quiet(ConsoleStyle.info(
+        f"Pobrano [{changed_count}] plików SVG, bez zmian [{len(statuses) - changed_count}], błędy [{len(signs) - len(statuses)}]"))
+    return statuses
+
+
+def process_signs(signs, skip_download=False, force_rebuild=False, jobs=1, download_settings=None, sync=False):
+    """Przetwórz listę znaków szeregowo lub w puli procesów (wyniki w kolejności znaków)"""
+    results = {}
+    pending_signs = signs
+    if not skip_download and signs:
+        # Rasteryzacja korzysta już z lokalnych plików SVG; znaki bez pobranego SVG kończą się błędem
+        statuses = download_signs_svgs(signs, download_settings, sync)
+        results = {sign.sign_id: False for sign in signs if sign.sign_id not in statuses}
+        # --sync decyduje tylko o pobieraniu; o przebudowie znaku decyduje manifest budowania, którego klucze
+        # obejmują skrót SVG i wpis bazy danych (wymiary, wyrównanie, kategoria)
+        pending_signs = [sign for sign in signs if sign.sign_id in statuses]
+
+    # Model i tekstura tła są współdzielone przez znaki o tym samym kształcie i wymiarach — każdy powstaje raz
+    plan = BuildPlan(pending_signs)
+    build_shared_artifacts(plan, force_rebuild)
+    tasks = [(sign, *plan.shared_artifacts(sign.sign_id)) for sign in pending_signs]
+
+    if jobs <= 1 or len(tasks) <= 1:
+        for sign, model_name, reverse_texture_name in tasks:
+            with stage("sign", sign.sign_id):
+                results[sign.sign_id] = process_sign(sign, model_name, reverse_texture_name, True, force_rebuild)
+    else:
+        print_if_not_quiet(ConsoleStyle.process(f"Przetwarzanie [{len(tasks)}] znaków w [{jobs}] procesach"))
+        worker = partial(_process_sign_task, skip_download=True, force_rebuild=force_rebuild)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_sign_worker,
+                                 initargs=(ConsoleStyle.QUIET_MODE, _rasterizer_name,
+                                           get_profiler().enabled)) as executor:
+            # Wpisy terrain_texture.json nanoszone są w kolejności znaków, tak jak w trybie szeregowym
+            for sign, (result, deferred_updates, cache_updates, emitter_counts, profile_events) in zip(
+                    pending_signs, executor.map(worker, tasks)):
+                for update_func, argument in deferred_updates:
+                    update_func(argument)
+                get_build_cache().merge(cache_updates)
+                get_emitter().merge(emitter_counts)
+                get_profiler().merge(profile_events)
+                results[sign.sign_id] = result
+    return [results[sign.sign_id] for sign in signs]
+
+
+def resolve_requested_signs(catalog, blocks):
+    """Pozycje wskazane w linii poleceń ("all", "category:X" lub kody) jako (identyfikator, rekord lub None);
+    None, jeśli nie ma wskazanej kategorii"""
+    if len(blocks) == 1 and blocks[0].lower() == 'all':
+        return [(sign.sign_id, sign) for sign in catalog]
+    if len(blocks) == 1 and blocks[0].lower().startswith('category:'):
+        category = catalog.find_category(blocks[0].lower().replace('category:', ''))
+        if not category:
+            return None
+        return [(sign.sign_id, sign) for sign in catalog.signs_in_category(category)]
+    return [(sign_id, catalog.get(sign_id)) for sign_id in map(normalize_sign_id, blocks)]
+
+
+def select_requested_signs(catalog, blocks):
+    """Znaki wskazane w linii poleceń, które mają link do pliku Wikipedii (te same, które przetworzy przebieg)"""
+    return [sign for _, sign in resolve_requested_signs(catalog, blocks) or [] if sign and sign.wikipedia_file_page]
+
+
+def report_requested_signs(catalog, blocks, entries):
+    """Wypisz, co zostanie przetworzone (kategorie lub kody) i które znaki są pomijane"""
+    request = blocks[0].lower() if len(blocks) == 1 else ''
+    if request == 'all':
+        print_if_not_quiet(ConsoleStyle.info("Przetwarzanie wszystkich znaków z bazy danych..."))
+        for category in catalog.categories:
+            ConsoleStyle.print_section(f"Kategoria [{category}]")
+            for sign in catalog.signs_in_category(category):
+                if not sign.wikipedia_file_page:
+                    print_if_not_quiet(ConsoleStyle.warning(f"{sign.sign_id}: brak linku do pliku Wikipedii"))
+    elif request.startswith('category:'):
+        category = catalog.find_category(request.replace('category:', ''))
+        print_if_not_quiet(ConsoleStyle.info(f"Przetwarzanie kategorii [{category}]..."))
+        print_if_not_quiet(ConsoleStyle.info(f"Znaleziono [{len(entries)}] znaków w kategorii [{category}]"))
+        for sign_id, sign in entries:
+            if not sign.wikipedia_file_page:
+                print_if_not_quiet(ConsoleStyle.warning(f"{sign_id}: brak linku do pliku Wikipedii"))
+    else:
+        for sign_code, (sign_id, sign) in zip(blocks, entries):
+            print_if_not_quiet(ConsoleStyle.info(f"Kod: {sign_code} → {sign_id}"))
+            if not sign:
+                print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono znaku [{sign_id}] w bazie danych"))
+            elif not sign.wikipedia_file_page:
+                print_if_not_quiet(ConsoleStyle.warning(f"{sign_id}: brak linku do pliku Wikipedii"))
+            else:
+                print_if_not_quiet(ConsoleStyle.info(f"Docelowe wymiary: {sign.sign_width}x{sign.sign_height}"))
+
+
+def process_requested_signs(catalog, blocks, skip_download=False, force_rebuild=False, jobs=1, download_settings=None,
+                            sync=False):
+    """Przetwórz znaki wskazane w linii poleceń; zwraca (sukcesy, wszystkie, błędy) lub None"""
+    entries = resolve_requested_signs(catalog, blocks)
+    if entries is None:
+        category_param = blocks[0].lower().replace('category:', '')
+        print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono kategorii [{category_param.upper()}] w bazie danych"))
+        print_if_not_quiet(ConsoleStyle.info(f"Dostępne kategorie: {', '.join(catalog.categories)}"))
+        return None
+    report_requested_signs(catalog, blocks, entries)
+
+    # Zbiór znaków do przetworzenia to dokładnie select_requested_signs — ten sam, który pokazuje --plan
+    signs = select_requested_signs(catalog, blocks)
+    # Znak bez linku jest błędem tylko wtedy, gdy wskazano go kodem ("all" i kategorie tylko go pomijają)
+    by_codes = not (len(blocks) == 1 and (blocks[0].lower() == 'all' or blocks[0].lower().startswith('category:')))
+
+    # Zachowaj kolejność błędów taką, jak przy przetwarzaniu znak po znaku
+    success_count = 0
+    errors = []
+    results = iter(process_signs(signs, skip_download, force_rebuild, jobs, download_settings, sync))
+    for sign_id, sign in entries:
+        if not sign:
+            errors.append(f"{sign_id}: nie znaleziono w bazie")
+        elif not sign.wikipedia_file_page:
+            if by_codes:
+                errors.append(f"{sign_id}: brak linku do pliku Wikipedii")
+        elif next(results):
+            success_count += 1
+        else:
+            errors.append(f"{sign_id}: błąd przetwarzania")
+
+    return success_count, len(entries), errors
 
 
 def main():
@@ -1126,16 +1099,47 @@ Przykłady użycia:
   python3 road_sign_processor.py all -f  # wymuś przebudowanie wszystkich tekstur (skrót)
   python3 road_sign_processor.py a_1 --quiet  # tryb cichy (tylko błędy)
   python3 road_sign_processor.py a_1 -q  # tryb cichy (tylko błędy) (skrót)
-
-Skrypt automatycznie usuwa pliki dla znaków, które nie istnieją w bazie danych
+  python3 road_sign_processor.py all --jobs 8  # przetwórz wszystkie znaki w 8 procesach
+  python3 road_sign_processor.py all -j 0  # jeden proces na każdy rdzeń procesora
+  python3 road_sign_processor.py all --sync  # pobierz tylko pliki SVG zmienione w Wikimedia Commons
+  python3 road_sign_processor.py all --download-jobs 8 --rate 4  # pobieraj 8 plików naraz, do 4 zapytań/s
+  python3 road_sign_processor.py a_1 --base-url http://127.0.0.1:8000  # pobieraj z lokalnego serwera
+  python3 road_sign_processor.py all -s --rasterizer cairosvg  # rasteryzuj w procesie Pythona (cairosvg)
+  python3 rasterizer_benchmark.py  # porównaj silniki rasteryzacji na całej bazie danych
+  python3 pipeline_benchmark.py --rasterizer stub  # czas całego potoku na syntetycznych bazach 1k/10k/50k znaków
+  python3 road_sign_processor.py all --stage  # przerwany przebieg nie zmienia BP/ i RP/
+  python3 road_sign_processor.py all -s --profile  # czasy etapów i znaków + trace.json (Perfetto)
+  python3 road_sign_processor.py all --plan  # pokaż plan budowania i pliki do usunięcia bez zmian w plikach
+
+Skrypt automatycznie usuwa pliki dla znaków, które nie istnieją w bazie danych (pozostałych plików nie usuwa)
+Niezmienione tekstury, modele i bloki są pomijane na podstawie manifestu .build-cache/manifest.json
         """
     )
 
     parser.add_argument('blocks', nargs='+', help='Kody znaków do przetworzenia (np. a_1, b_5) lub "all" dla wszystkich znaków, lub "category:X" dla kategorii')
-    parser.add_argument('--skip-download', '-s', action='store_true', help='Tryb offline - użyj lokalnych plików SVG')
+    download_mode = parser.add_mutually_exclusive_group()
+    download_mode.add_argument('--skip-download', '-s', action='store_true', help='Tryb offline - użyj lokalnych plików SVG')
+    download_mode.add_argument('--sync', action='store_true',
+                               help='Pobierz tylko pliki SVG zmienione od ostatniego pobrania (przebudowa według manifestu)')
     parser.add_argument('--force-rebuild', '-f', action='store_true', help='Wymuś przebudowanie tekstur')
     parser.add_argument('--quiet', '-q', action='store_true', help='Tryb cichy (tylko błędy)')
-    
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Liczba równoległych procesów przetwarzania znaków (0 = liczba rdzeni)')
+    parser.add_argument('--download-jobs', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Liczba równoczesnych pobrań (domyślnie {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f'Limit zapytań HTTP na sekundę (domyślnie {DEFAULT_RATE}, 0 = bez limitu)')
+    parser.add_argument('--base-url',
+                        help='Adres serwera zastępujący wikipedia.org i wikimedia.org (np. lokalny serwer testowy)')
+    parser.add_argument('--rasterizer', choices=list(RASTERIZERS), default=DEFAULT_RASTERIZER,
+                        help=f'Silnik rasteryzacji SVG→PNG (domyślnie {DEFAULT_RASTERIZER})')
+    parser.add_argument('--stage', action='store_true',
+                        help='Buduj w drzewie roboczym (.build-stage/) i podmień BP/ i RP/ dopiero po udanym przebiegu')
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_TRACE_PATH, metavar='TRACE',
+                        help=f'Mierz czas i pamięć etapów; podsumowanie i ślad Chrome Trace (domyślnie {DEFAULT_TRACE_PATH})')
+    parser.add_argument('--plan', action='store_true',
+                        help='Tryb próbny: wypisz wspólne modele i tekstury tła oraz liczbę artefaktów, bez budowania')
+
     args = parser.parse_args()
 
     database_path = "database.json"
@@ -1149,6 +1153,8 @@ Skrypt automatycznie usuwa pliki dla znaków, które nie istnieją w bazie danyc
     if skip_download:
         print_if_not_quiet(ConsoleStyle.info("Tryb offline: pomijam pobieranie plików SVG z internetu"))
         print_if_not_quiet(ConsoleStyle.info("Używam lokalnych plików SVG"))
+    if args.sync:
+        print_if_not_quiet(ConsoleStyle.info("Tryb synchronizacji: pobieram tylko pliki SVG zmienione od ostatniego pobrania"))
 
     # Sprawdź flagę --force-rebuild / -f
     force_rebuild = args.force_rebuild
@@ -1160,134 +1166,61 @@ Skrypt automatycznie usuwa pliki dla znaków, które nie istnieją w bazie danyc
     if quiet_mode:
         ConsoleStyle.set_quiet_mode(True)
 
-    # Wczytaj bazę danych
-    with open(database_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    ConsoleStyle.print_section("PRZETWARZANIE ZNAKÓW DROGOWYCH")
-
-    success_count = 0
-    total_count = 0
-    errors = []
-
-    # Sprawdź, czy przetwarzamy wszystkie znaki
-    if len(args.blocks) == 1 and args.blocks[0].lower() == 'all':
-        print_if_not_quiet(ConsoleStyle.info("Przetwarzanie wszystkich znaków z bazy danych..."))
-
-        # Wyczyść wszystkie pliki przed przetwarzaniem
-        cleanup_all_files(data)
-
-        # Pobierz kategorie z bazy danych
-        categories = list(data['categories'].keys())
-        for category in categories:
-            if category in data['categories']:
-                ConsoleStyle.print_section(f"Kategoria [{category}]")
-                blocks = data['categories'][category]['blocks']
-
-                for sign_id in blocks:
-                    total_count += 1
-
-                    # Sprawdź, czy znak ma link do pliku Wikipedii
-                    if 'wikipedia_file_page' not in blocks[sign_id]:
-                        print_if_not_quiet(ConsoleStyle.warning(f"{sign_id}: brak linku do pliku Wikipedii"))
-                        continue
-
-                    wikipedia_file_page = blocks[sign_id]['wikipedia_file_page']
-                    sign_width = int(blocks[sign_id].get('sign_width', 900))
-                    sign_height = int(blocks[sign_id].get('sign_height', 900))
-
-                    if process_sign(sign_id, wikipedia_file_page, sign_width, sign_height, database_path, skip_download,
-                                    force_rebuild):
-                        success_count += 1
-                    else:
-                        errors.append(f"{sign_id}: błąd przetwarzania")
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    if args.profile:
+        get_profiler().enable("road_sign_processor")
+        # Ścieżka bezwzględna: w trybie --stage przebieg pracuje w innym katalogu
+        atexit.register(get_profiler().finish, os.path.abspath(args.profile))
+    set_rasterizer(args.rasterizer)
+    if not get_rasterizer().available():
+        print_if_not_quiet(ConsoleStyle.warning(f"Silnik rasteryzacji [{args.rasterizer}] może być niedostępny"))
+    download_settings = DownloadSettings(base_url=args.base_url, concurrency=args.download_jobs, rate=args.rate)
 
-                    # Dodaj delay między requestami (tylko jeśli nie pomijamy pobierania)
-                    if not skip_download:
-                        time.sleep(1)
-
-    # Sprawdź, czy przetwarzamy konkretną kategorię
-    elif len(args.blocks) == 1 and args.blocks[0].lower().startswith('category:'):
-        category_param = args.blocks[0].lower().replace('category:', '')
-        category = category_param.upper()
-
-        if category not in data['categories']:
-            print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono kategorii [{category}] w bazie danych"))
-            print_if_not_quiet(ConsoleStyle.info(f"Dostępne kategorie: {', '.join(list(data['categories'].keys()))}"))
-            return
-
-        print_if_not_quiet(ConsoleStyle.info(f"Przetwarzanie kategorii [{category}]..."))
-
-        # Wyczyść pliki dla tej kategorii przed przetwarzaniem
-        cleanup_category_files(data, category)
-
-        blocks = data['categories'][category]['blocks']
-        print_if_not_quiet(ConsoleStyle.info(f"Znaleziono [{len(blocks)}] znaków w kategorii [{category}]"))
-
-        for sign_id in blocks:
-            total_count += 1
-
-            # Sprawdź, czy znak ma link do pliku Wikipedii
-            if 'wikipedia_file_page' not in blocks[sign_id]:
-                print_if_not_quiet(ConsoleStyle.warning(f"{sign_id}: brak linku do pliku Wikipedii"))
-                continue
-
-            wikipedia_file_page = blocks[sign_id]['wikipedia_file_page']
-            sign_width = int(blocks[sign_id].get('sign_width', 900))
-            sign_height = int(blocks[sign_id].get('sign_height', 900))
-
-            if process_sign(sign_id, wikipedia_file_page, sign_width, sign_height, database_path, skip_download,
-                            force_rebuild):
-                success_count += 1
-            else:
-                errors.append(f"{sign_id}: błąd przetwarzania")
-
-            # Dodaj delay między requestami (tylko jeśli nie pomijamy pobierania)
-            if not skip_download:
-                time.sleep(1)
-    else:
-        # Przetwórz podane znaki
-        for sign_code in args.blocks:
-            total_count += 1
-
-            # Normalizuj kod znaku
-            sign_id = normalize_sign_id(sign_code)
-            print_if_not_quiet(ConsoleStyle.info(f"Kod: {sign_code} → {sign_id}"))
-
-            # Znajdź znak w bazie
-            sign_data = find_sign_in_database(sign_id, data)
-            if not sign_data:
-                print_if_not_quiet(ConsoleStyle.error(f"Nie znaleziono znaku [{sign_id}] w bazie danych"))
-                errors.append(f"{sign_id}: nie znaleziono w bazie")
-                continue
-
-            # Sprawdź, czy znak ma link do pliku Wikipedii
-            if 'wikipedia_file_page' not in sign_data:
-                print_if_not_quiet(ConsoleStyle.warning(f"{sign_id}: brak linku do pliku Wikipedii"))
-                errors.append(f"{sign_id}: brak linku do pliku Wikipedii")
-                continue
-
-            wikipedia_file_page = sign_data['wikipedia_file_page']
-            sign_width = int(sign_data.get('sign_width', 900))
-            sign_height = int(sign_data.get('sign_height', 900))
-
-            print_if_not_quiet(ConsoleStyle.info(f"Docelowe wymiary: {sign_width}x{sign_height}"))
-
-            if process_sign(sign_id, wikipedia_file_page, sign_width, sign_height, database_path, skip_download,
-                            force_rebuild):
-                success_count += 1
-            else:
-                errors.append(f"{sign_id}: błąd przetwarzania")
-
-    # Wyświetl podsumowanie
-    ConsoleStyle.print_summary(success_count, total_count, errors)
+    # Wczytaj bazę danych
+    catalog = SignCatalog.load(database_path)
 
-    # Wyczyść pliki dla znaków, które nie istnieją w bazie danych
-    cleanup_orphaned_files(data)
+    if args.plan:
+        reconcile_outputs(catalog, get_terrain_registry(), get_build_cache(), get_model_registry(), dry_run=True)
+        BuildPlan(select_requested_signs(catalog, args.blocks)).print_plan()
+        return
 
-    # Aktualizuj pliki językowe i katalog crafting
-    if success_count > 0:
-        update_all_related_files(data)
+    # W trybie --stage przebieg pracuje na drzewie roboczym, a BP/ i RP/ podmieniane są dopiero po sukcesie
+    try:
+        with staged_output(args.stage):
+            try:
+                # Usuń tylko pliki znaków, których nie ma w bazie; pozostałe artefakty budowane są przyrostowo
+                with stage("reconcile"):
+                    reconcile_outputs(catalog, get_terrain_registry(), get_build_cache(), get_model_registry())
+
+                ConsoleStyle.print_section("PRZETWARZANIE ZNAKÓW DROGOWYCH")
+                outcome = process_requested_signs(catalog, args.blocks, skip_download, force_rebuild, jobs,
+                                                  download_settings, args.sync)
+                if outcome is None:
+                    return
+                success_count, total_count, errors = outcome
+
+                # Wyświetl podsumowanie
+                ConsoleStyle.print_summary(success_count, total_count, errors)
+            finally:
+                # Zapisz terrain_texture.json, manifest budowania i indeks obrazów raz, także po przerwanym przebiegu
+                with stage("terrain"):
+                    if get_terrain_registry().flush():
+                        print_if_not_quiet(ConsoleStyle.success(f"Zapisano [{get_terrain_registry().terrain_path}]"))
+                with stage("build_cache"):
+                    get_build_cache().save()
+                    get_image_index().save()
+
+            # Aktualizuj pliki językowe i katalog crafting
+            if success_count > 0:
+                update_all_related_files(catalog.data)
+    except StagingError as e:
+        print_if_not_quiet(ConsoleStyle.error(f"Drzewo robocze odrzucone, BP/ i RP/ pozostały bez zmian: {e}"))
+        sys.exit(1)
+
+    ConsoleStyle.print_stats({
+        "Zapisane pliki": get_emitter().written,
+        "Pominięte pliki (bez zmian)": get_emitter().skipped,
+    }, "ZAPIS PLIKÓW WYNIKOWYCH")
 
     print_if_not_quiet(ConsoleStyle.divider())
     print_if_not_quiet(ConsoleStyle.success("Wszystkie operacje zakończone pomyślnie!"))
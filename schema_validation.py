@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Walidacja plików JSON dodatku (bloki, geometrie, manifesty, katalog crafting) schematami kompilowanymi raz do kodu Pythona
+
+Kompilator obsługuje podzbiór JSON Schema używany przez schematy poniżej: type, enum, required, properties,
+additionalProperties, minProperties, items, minItems, maxItems, pattern, minimum. Każdy schemat zamieniany jest
+na źródło funkcji walidującej (jak w fastjsonschema), która zbiera wszystkie błędy dokumentu ze ścieżkami
+w postaci '$.minecraft:block.components.minecraft:geometry'.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+NAMESPACED_ID_PATTERN = r'^[a-z0-9_.\-]+:[a-z0-9_.\-]+$'
+UUID_PATTERN = r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+
+VEC2 = {'type': 'array', 'minItems': 2, 'maxItems': 2, 'items': {'type': 'number'}}
+VEC3 = {'type': 'array', 'minItems': 3, 'maxItems': 3, 'items': {'type': 'number'}}
+VERSION = {'type': 'array', 'minItems': 3, 'maxItems': 3, 'items': {'type': 'integer', 'minimum': 0}}
+FORMAT_VERSION = {'type': 'string', 'pattern': r'^\d+\.\d+\.\d+$'}
+MENU_CATEGORIES = ['construction', 'equipment', 'items', 'nature', 'none']
+
+BOX_SCHEMA = {
+    'type': ['object', 'boolean'],
+    'properties': {
+        'origin': VEC3,
+        'size': VEC3,
+    },
+}
+
+# Bloki w postaci tworzonej przez create_block_template (road_sign_processor.py)
+BLOCK_SCHEMA = {
+    'type': 'object',
+    'required': ['format_version', 'minecraft:block'],
+    'properties': {
+        'format_version': FORMAT_VERSION,
+        'minecraft:block': {
+            'type': 'object',
+            'required': ['description', 'components'],
+            'properties': {
+                'description': {
+                    'type': 'object',
+                    'required': ['identifier'],
+                    'properties': {
+                        'identifier': {'type': 'string', 'pattern': NAMESPACED_ID_PATTERN},
+                        'menu_category': {
+                            'type': 'object',
+                            'required': ['category'],
+                            'properties': {'category': {'type': 'string', 'enum': MENU_CATEGORIES}},
+                        },
+                        'traits': {'type': 'object'},
+                    },
+                },
+                'components': {
+                    'type': 'object',
+                    'required': ['minecraft:geometry', 'minecraft:material_instances'],
+                    'properties': {
+                        'minecraft:collision_box': BOX_SCHEMA,
+                        'minecraft:selection_box': BOX_SCHEMA,
+                        'minecraft:geometry': {'type': ['string', 'object']},
+                        'minecraft:material_instances': {
+                            'type': 'object',
+                            'minProperties': 1,
+                            'additionalProperties': {
+                                'type': 'object',
+                                'properties': {
+                                    'texture': {'type': 'string'},
+                                    'render_method': {'type': 'string'},
+                                },
+                            },
+                        },
+                        'minecraft:destructible_by_mining': {
+                            'type': ['object', 'boolean'],
+                            'properties': {'seconds_to_destroy': {'type': 'number', 'minimum': 0}},
+                        },
+                        'minecraft:destructible_by_explosion': {
+                            'type': ['object', 'boolean'],
+                            'properties': {'explosion_resistance': {'type': 'number', 'minimum': 0}},
+                        },
+                    },
+                },
+                'permutations': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'required': ['condition', 'components'],
+                        'properties': {
+                            'condition': {'type': 'string'},
+                            'components': {'type': 'object'},
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+# Geometrie w postaci tworzonej przez create_model_template (road_sign_processor.py)
+GEOMETRY_SCHEMA = {
+    'type': 'object',
+    'required': ['format_version', 'minecraft:geometry'],
+    'properties': {
+        'format_version': FORMAT_VERSION,
+        'minecraft:geometry': {
+            'type': 'array',
+            'minItems': 1,
+            'items': {
+                'type': 'object',
+                'required': ['description', 'bones'],
+                'properties': {
+                    'description': {
+                        'type': 'object',
+                        'required': ['identifier', 'texture_width', 'texture_height'],
+                        'properties': {
+                            'identifier': {'type': 'string', 'pattern': r'^geometry\.'},
+                            'texture_width': {'type': 'integer', 'minimum': 1},
+                            'texture_height': {'type': 'integer', 'minimum': 1},
+                            'visible_bounds_width': {'type': 'number'},
+                            'visible_bounds_height': {'type': 'number'},
+                            'visible_bounds_offset': VEC3,
+                        },
+                    },
+                    'item_display_transforms': {
+                        'type': 'object',
+                        'additionalProperties': {
+                            'type': 'object',
+                            'properties': {'rotation': VEC3, 'scale': VEC3, 'translation': VEC3},
+                        },
+                    },
+                    'bones': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'required': ['name'],
+                            'properties': {
+                                'name': {'type': 'string'},
+                                'cubes': {
+                                    'type': 'array',
+                                    'items': {
+                                        'type': 'object',
+                                        'required': ['origin', 'size'],
+                                        'properties': {
+                                            'origin': VEC3,
+                                            'size': VEC3,
+                                            'uv': {
+                                                'type': ['object', 'array'],
+                                                'additionalProperties': {
+                                                    'type': 'object',
+                                                    'required': ['uv'],
+                                                    'properties': {'uv': VEC2, 'uv_size': VEC2},
+                                                },
+                                            },
+                                        },
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+MANIFEST_SCHEMA = {
+    'type': 'object',
+    'required': ['format_version', 'header', 'modules'],
+    'properties': {
+        'format_version': {'type': 'integer', 'minimum': 1},
+        'header': {
+            'type': 'object',
+            'required': ['name', 'description', 'uuid', 'version', 'min_engine_version'],
+            'properties': {
+                'name': {'type': 'string'},
+                'description': {'type': 'string'},
+                'uuid': {'type': 'string', 'pattern': UUID_PATTERN},
+                'version': VERSION,
+                'min_engine_version': VERSION,
+            },
+        },
+        'modules': {
+            'type': 'array',
+            'minItems': 1,
+            'items': {
+                'type': 'object',
+                'required': ['type', 'uuid', 'version'],
+                'properties': {
+                    'type': {'type': 'string', 'enum': ['data', 'resources', 'script', 'client_data', 'interface',
+                                                        'world_template', 'skin_pack', 'javascript']},
+                    'uuid': {'type': 'string', 'pattern': UUID_PATTERN},
+                    'version': VERSION,
+                },
+            },
+        },
+        'dependencies': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'uuid': {'type': 'string', 'pattern': UUID_PATTERN},
+                    'version': VERSION,
+                },
+            },
+        },
+        'metadata': {
+            'type': 'object',
+            'properties': {
+                'authors': {'type': 'array', 'items': {'type': 'string'}},
+                'url': {'type': 'string'},
+                'license': {'type': 'string'},
+            },
+        },
+    },
+}
+
+# Katalog crafting w postaci uzupełnianej przez update_crafting_catalog (road_sign_processor.py)
+CATALOG_SCHEMA = {
+    'type': 'object',
+    'required': ['format_version', 'minecraft:crafting_items_catalog'],
+    'properties': {
+        'format_version': FORMAT_VERSION,
+        'minecraft:crafting_items_catalog': {
+            'type': 'object',
+            'required': ['categories'],
+            'properties': {
+                'categories': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'required': ['category_name'],
+                        'properties': {
+                            'category_name': {'type': 'string', 'enum': MENU_CATEGORIES},
+                            'groups': {
+                                'type': 'array',
+                                'items': {
+                                    'type': 'object',
+                                    'required': ['items'],
+                                    'properties': {
+                                        'group_identifier': {
+                                            'type': 'object',
+                                            'required': ['name'],
+                                            'properties': {
+                                                'icon': {'type': 'string', 'pattern': NAMESPACED_ID_PATTERN},
+                                                'name': {'type': 'string', 'pattern': NAMESPACED_ID_PATTERN},
+                                            },
+                                        },
+                                        'items': {
+                                            'type': 'array',
+                                            'items': {'type': 'string', 'pattern': NAMESPACED_ID_PATTERN},
+                                        },
+                                    },
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+SCHEMAS = {
+    'block': BLOCK_SCHEMA,
+    'geometry': GEOMETRY_SCHEMA,
+    'manifest': MANIFEST_SCHEMA,
+    'catalog': CATALOG_SCHEMA,
+}
+
+# Rodzaj schematu według ścieżki (także w drzewie roboczym --stage, stąd dopasowanie od granicy katalogu)
+SCHEMA_PATHS = [
+    ('block', re.compile(r'(^|/)BP/blocks/.+\.block\.json$')),
+    ('geometry', re.compile(r'(^|/)RP/models/blocks/.+\.geo\.json$')),
+    ('manifest', re.compile(r'(^|/)(BP|RP)/manifest\.json$')),
+    ('catalog', re.compile(r'(^|/)BP/item_catalog/crafting_item_catalog\.json$')),
+]
+
+# Sprawdzenia typów JSON → wyrażenia Pythona (bool nie jest liczbą w JSON Schema)
+TYPE_CHECKS = {
+    'object': "isinstance({0}, dict)",
+    'array': "isinstance({0}, list)",
+    'string': "isinstance({0}, str)",
+    'integer': "(isinstance({0}, int) and not isinstance({0}, bool))",
+    'number': "(isinstance({0}, (int, float)) and not isinstance({0}, bool))",
+    'boolean': "isinstance({0}, bool)",
+    'null': "{0} is None",
+}
+
+
+class SchemaValidationError(ValueError):
+    """Dokument niezgodny ze schematem (lista błędów ze ścieżkami w errors)"""
+
+    def __init__(self, path: str, errors: List[str]):
+        super().__init__(f"{path} does not match the {schema_kind_for_path(path)} schema: {'; '.join(errors)}")
+        self.path = path
+        self.errors = errors
+
+
+class _SchemaCompiler:
+    """Generator źródła funkcji walidującej: każdy węzeł schematu staje się blokiem if-ów na zmiennej lokalnej"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: Dict[str, Any] = {}
+        self._counter = 0
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _constant(self, value) -> str:
+        name = self._name('_c')
+        self.constants[name] = value
+        return name
+
+    def _emit(self, indent: int, line: str):
+        self.lines.append('    ' * indent + line)
+
+    def _error(self, indent: int, path: str, message: str):
+        # Ścieżka to szablon f-stringu z indeksami/kluczami pętli; składana tylko przy błędzie
+        self._emit(indent, f"errors.append(f{(path + ': ' + message)!r})")
+
+    def compile(self, schema: Dict, name: str) -> Callable[[Any], List[str]]:
+        self._emit(0, f"def {name}(data):")
+        self._emit(1, "errors = []")
+        self._node(schema, 'data', '$', 1)
+        self._emit(1, "return errors")
+        source = '\n'.join(self.lines) + '\n'
+        namespace = dict(self.constants)
+        exec(compile(source, f"<schema {name}>", 'exec'), namespace)
+        validator = namespace[name]
+        validator.source = source
+        return validator
+
+    def _node(self, schema: Dict, var: str, path: str, indent: int):
+        types = schema.get('type')
+        if types:
+            types = [types] if isinstance(types, str) else list(types)
+            self._emit(indent, f"if not ({' or '.join(TYPE_CHECKS[t].format(var) for t in types)}):")
+            self._error(indent + 1, path, f"expected {' or '.join(types)}")
+            self._emit(indent, "else:")
+            indent += 1
+            self._emit(indent, "pass")
+
+        if 'enum' in schema:
+            allowed = self._constant(tuple(schema['enum']))
+            self._emit(indent, f"if {var} not in {allowed}:")
+            self._error(indent + 1, path, f"{{{var}!r}} is not one of {_escape(str(list(schema['enum'])))}")
+
+        self._object_keywords(schema, types, var, path, indent)
+        self._array_keywords(schema, types, var, path, indent)
+        self._scalar_keywords(schema, types, var, path, indent)
+
+    def _guard(self, types: Optional[List[str]], json_type: str, var: str, indent: int) -> Optional[int]:
+        """Wcięcie dla słów kluczowych danego typu (z warunkiem isinstance, jeśli typ nie jest jedyny)"""
+        if types == [json_type]:
+            return indent
+        if types is not None and json_type not in types:
+            return None
+        self._emit(indent, f"if {TYPE_CHECKS[json_type].format(var)}:")
+        self._emit(indent + 1, "pass")
+        return indent + 1
+
+    def _object_keywords(self, schema, types, var, path, indent):
+        keywords = ('required', 'properties', 'additionalProperties', 'minProperties')
+        if not any(keyword in schema for keyword in keywords):
+            return
+        indent = self._guard(types, 'object', var, indent)
+        if indent is None:
+            return
+
+        for key in schema.get('required', []):
+            self._emit(indent, f"if {key!r} not in {var}:")
+            self._error(indent + 1, path, f"missing required property {_escape(repr(key))}")
+
+        if 'minProperties' in schema:
+            self._emit(indent, f"if len({var}) < {schema['minProperties']}:")
+            self._error(indent + 1, path, f"expected at least {schema['minProperties']} properties")
+
+        properties = schema.get('properties', {})
+        for key, subschema in properties.items():
+            value = self._name('v')
+            self._emit(indent, f"if {key!r} in {var}:")
+            self._emit(indent + 1, f"{value} = {var}[{key!r}]")
+            self._node(subschema, value, f"{path}.{_escape(key)}", indent + 1)
+
+        additional = schema.get('additionalProperties', True)
+        if additional is not True:
+            key, value = self._name('k'), self._name('v')
+            known = self._constant(frozenset(properties))
+            self._emit(indent, f"for {key}, {value} in {var}.items():")
+            self._emit(indent + 1, f"if {key} in {known}:")
+            self._emit(indent + 2, "continue")
+            if additional is False:
+                self._error(indent + 1, path, f"unexpected property {{{key}!r}}")
+            else:
+                self._node(additional, value, f"{path}.{{{key}}}", indent + 1)
+
+    def _array_keywords(self, schema, types, var, path, indent):
+        if not any(keyword in schema for keyword in ('items', 'minItems', 'maxItems')):
+            return
+        indent = self._guard(types, 'array', var, indent)
+        if indent is None:
+            return
+
+        if 'minItems' in schema:
+            self._emit(indent, f"if len({var}) < {schema['minItems']}:")
+            self._error(indent + 1, path, f"expected at least {schema['minItems']} items")
+        if 'maxItems' in schema:
+            self._emit(indent, f"if len({var}) > {schema['maxItems']}:")
+            self._error(indent + 1, path, f"expected at most {schema['maxItems']} items")
+        if 'items' in schema:
+            index, value = self._name('i'), self._name('v')
+            self._emit(indent, f"for {index}, {value} in enumerate({var}):")
+            self._node(schema['items'], value, f"{path}[{{{index}}}]", indent + 1)
+
+    def _scalar_keywords(self, schema, types, var, path, indent):
+        if 'pattern' in schema:
+            string_indent = self._guard(types, 'string', var, indent)
+            if string_indent is not None:
+                pattern = self._constant(re.compile(schema['pattern']))
+                self._emit(string_indent, f"if not {pattern}.search({var}):")
+                self._error(string_indent + 1, path,
+                            f"{{{var}!r}} does not match {_escape(schema['pattern'])}")
+        if 'minimum' in schema:
+            number_types = [t for t in (types or ['number']) if t in ('integer', 'number')]
+            if number_types:
+                number_indent = self._guard(types, number_types[0], var, indent)
+                self._emit(number_indent, f"if {var} < {schema['minimum']!r}:")
+                self._error(number_indent + 1, path, f"{{{var}!r}} is less than {schema['minimum']!r}")
+
+
+def _escape(text: str) -> str:
+    """Tekst stały w szablonie f-stringu ścieżki/komunikatu"""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def compile_schema(schema: Dict, name: str = 'validate') -> Callable[[Any], List[str]]:
+    """Skompiluj schemat do funkcji data → lista błędów ('$.ścieżka: opis'); źródło w atrybucie .source"""
+    return _SchemaCompiler().compile(schema, name)
+
+
+@lru_cache(maxsize=None)
+def get_validator(kind: str) -> Callable[[Any], List[str]]:
+    """Skompilowany walidator schematu danego rodzaju (kompilacja raz na proces)"""
+    return compile_schema(SCHEMAS[kind], f"validate_{kind}")
+
+
+def schema_kind_for_path(path: str) -> Optional[str]:
+    """Rodzaj schematu pliku ('block', 'geometry', 'manifest', 'catalog') lub None"""
+    path = path.replace(os.sep, '/')
+    for kind, pattern in SCHEMA_PATHS:
+        if pattern.search(path):
+            return kind
+    return None
+
+
+def validate_document(path: str, data: Any) -> List[str]:
+    """Błędy dokumentu względem schematu dobranego do ścieżki (pusta lista, gdy schemat nie dotyczy pliku)"""
+    kind = schema_kind_for_path(path)
+    if kind is None:
+        return []
+    return get_validator(kind)(data)
+
+
+def validate_documents(documents: Iterable[Tuple[str, Any]]) -> Dict[str, List[str]]:
+    """Zwaliduj partię dokumentów (ścieżka, dane); zwraca ścieżka → błędy tylko dla plików z błędami"""
+    results = {}
+    for path, data in documents:
+        errors = validate_document(path, data)
+        if errors:
+            results[path] = errors
+    return results
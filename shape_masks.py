@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Maski kształtów znaków rysowane w NumPy: jedyne źródło geometrii tekstur rewersu
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Zmiana geometrii lub sposobu rysowania wymaga podbicia wersji (wejście manifestu budowania)
+SHAPE_MASKS_VERSION = 1
+DEFAULT_SUPERSAMPLE = 4
+REVERSE_COLOR = (0x80, 0x80, 0x80)
+
+Point = Tuple[float, float]
+Box = Tuple[float, float, float, float]
+
+
+def _triangle(left, top, right, bottom, cx, cy, width, height) -> List[Point]:
+    return [(cx, top), (left, bottom), (right, bottom)]
+
+
+def _inverted_triangle(left, top, right, bottom, cx, cy, width, height) -> List[Point]:
+    return [(left, top), (right, top), (cx, bottom)]
+
+
+def _rectangle(left, top, right, bottom, cx, cy, width, height) -> List[Point]:
+    return [(left, top), (right, top), (right, bottom), (left, bottom)]
+
+
+def _diamond(left, top, right, bottom, cx, cy, width, height) -> List[Point]:
+    return [(cx, top), (right, cy), (cx, bottom), (left, cy)]
+
+
+def _octagon(left, top, right, bottom, cx, cy, width, height) -> List[Point]:
+    margin = min(width, height) // 4
+    return [(left + margin, top), (right - margin, top), (right, top + margin), (right, bottom - margin),
+            (right - margin, bottom), (left + margin, bottom), (left, bottom - margin), (left, top + margin)]
+
+
+# Kształty wielokątne: funkcja (ramka, środek, wymiary kształtu) → wierzchołki w kolejności obwodu
+POLYGON_SHAPES = {
+    'triangle': _triangle,
+    'inverted_triangle': _inverted_triangle,
+    'square': _rectangle,
+    'rectangle': _rectangle,
+    'diamond': _diamond,
+    'octagon': _octagon,
+}
+CIRCLE_SHAPES = {'circle'}
+SHAPES = sorted(set(POLYGON_SHAPES) | CIRCLE_SHAPES)
+DEFAULT_SHAPE = 'rectangle'
+
+
+def shape_box(width: int, height: int, canvas_size: Tuple[int, int]) -> Tuple[Box, Point]:
+    """Ramka (left, top, right, bottom) i środek kształtu w×h wyśrodkowanego na płótnie"""
+    canvas_width, canvas_height = canvas_size
+    left = (canvas_width - width) / 2
+    top = (canvas_height - height) / 2
+    return (left, top, left + width, top + height), (canvas_width / 2, canvas_height / 2)
+
+
+def _sample_grid(canvas_size: Tuple[int, int], supersample: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Współrzędne punktów próbkowania: supersample×supersample na piksel"""
+    canvas_width, canvas_height = canvas_size
+    xs = (np.arange(canvas_width * supersample, dtype=np.float64) + 0.5) / supersample
+    ys = (np.arange(canvas_height * supersample, dtype=np.float64) + 0.5) / supersample
+    return xs[np.newaxis, :], ys[:, np.newaxis]
+
+
+def _polygon_inside(points: List[Point], xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Punkty wewnątrz wielokąta wypukłego (test półpłaszczyzn, niezależny od kierunku obiegu)"""
+    positive = np.ones((ys.shape[0], xs.shape[1]), dtype=bool)
+    negative = np.ones_like(positive)
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        cross = (x2 - x1) * (ys - y1) - (y2 - y1) * (xs - x1)
+        positive &= cross >= 0
+        negative &= cross <= 0
+    return positive | negative
+
+
+def shape_mask(shape: str, width: int, height: int, canvas_size: Optional[Tuple[int, int]] = None,
+               supersample: int = DEFAULT_SUPERSAMPLE) -> np.ndarray:
+    """Pokrycie pikseli (0–1, float32) przez kształt w×h wyśrodkowany na płótnie
+
+    supersample > 1 wygładza krawędzie: każdy piksel to średnia z supersample² próbek.
+    Nieznane kształty rysowane są jako prostokąt.
+    """
+    canvas_size = canvas_size or (width, height)
+    supersample = max(1, int(supersample))
+    (left, top, right, bottom), (cx, cy) = shape_box(width, height, canvas_size)
+    xs, ys = _sample_grid(canvas_size, supersample)
+
+    if shape in CIRCLE_SHAPES:
+        radius = min(width, height) / 2
+        inside = (xs - cx) ** 2 + (ys - cy) ** 2 <= radius ** 2
+    else:
+        polygon = POLYGON_SHAPES.get(shape, POLYGON_SHAPES[DEFAULT_SHAPE])
+        inside = _polygon_inside(polygon(left, top, right, bottom, cx, cy, width, height), xs, ys)
+
+    canvas_width, canvas_height = canvas_size
+    return inside.reshape(canvas_height, supersample, canvas_width, supersample).mean(axis=(1, 3), dtype=np.float32)
+
+
+def reverse_texture(shape: str, width: int, height: int, canvas_size: Optional[Tuple[int, int]] = None,
+                    supersample: int = DEFAULT_SUPERSAMPLE) -> np.ndarray:
+    """Tekstura rewersu: szary kształt na przezroczystym tle jako tablica RGBA (uint8, wiersze × kolumny × 4)"""
+    coverage = shape_mask(shape, width, height, canvas_size, supersample)
+    rgba = np.empty(coverage.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = REVERSE_COLOR
+    rgba[..., 3] = np.rint(coverage * 255).astype(np.uint8)
+    return rgba
+
+
+def reverse_textures(specs: Iterable[Tuple[str, int, int, Tuple[int, int]]],
+                     supersample: int = DEFAULT_SUPERSAMPLE) -> Dict[Tuple[str, int, int, Tuple[int, int]], np.ndarray]:
+    """Wygeneruj wiele tekstur naraz; powtarzające się specyfikacje (kształt, w, h, płótno) liczone są raz"""
+    textures = {}
+    for spec in specs:
+        if spec not in textures:
+            shape, width, height, canvas_size = spec
+            textures[spec] = reverse_texture(shape, width, height, canvas_size, supersample)
+    return textures
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Katalog znaków drogowych wczytywany jednorazowo z bazy danych database.json
+"""
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_SIGN_SIZE = 900
+DEFAULT_SIGN_SHAPE = 'rectangle'
+DEFAULT_VERTICAL_ALIGNMENT = 'bottom'
+
+
+class SignRecord:
+    """Zwarty rekord znaku z bazy danych z przeliczonymi wymiarami"""
+
+    __slots__ = ('sign_id', 'category', 'code', 'wikipedia_file_page', 'sign_width', 'sign_height', 'sign_shape',
+                 'vertical_alignment', 'translations')
+
+    def __init__(self, sign_id: str, category: str, code: Optional[str], wikipedia_file_page: Optional[str],
+                 sign_width: int, sign_height: int, sign_shape: str, vertical_alignment: str,
+                 translations: Dict[str, str]):
+        self.sign_id = sign_id
+        self.category = category
+        self.code = code
+        self.wikipedia_file_page = wikipedia_file_page
+        self.sign_width = sign_width
+        self.sign_height = sign_height
+        self.sign_shape = sign_shape
+        self.vertical_alignment = vertical_alignment
+        self.translations = translations
+
+    @classmethod
+    def from_dict(cls, sign_id: str, category: str, sign_data: Dict) -> 'SignRecord':
+        """Utwórz rekord na podstawie wpisu z database.json"""
+        return cls(
+            sign_id=sign_id,
+            category=category,
+            code=sign_data.get('code'),
+            wikipedia_file_page=sign_data.get('wikipedia_file_page'),
+            sign_width=int(sign_data.get('sign_width', DEFAULT_SIGN_SIZE)),
+            sign_height=int(sign_data.get('sign_height', DEFAULT_SIGN_SIZE)),
+            sign_shape=sign_data.get('sign_shape', DEFAULT_SIGN_SHAPE),
+            vertical_alignment=sign_data.get('vertical_alignment', DEFAULT_VERTICAL_ALIGNMENT),
+            translations=sign_data.get('translations', {}),
+        )
+
+    def __repr__(self):
+        return (f"SignRecord({self.sign_id!r}, {self.sign_shape} {self.sign_width}x{self.sign_height}, "
+                f"{self.vertical_alignment})")
+
+
+class SignCatalog:
+    """Indeks znaków z bazy danych: sign_id → (kategoria, rekord) w czasie O(1)"""
+
+    def __init__(self, data: Dict):
+        self.data = data
+        self._signs: Dict[str, SignRecord] = {}
+        self._categories: Dict[str, List[SignRecord]] = {}
+
+        for category, category_data in data['categories'].items():
+            records = [SignRecord.from_dict(sign_id, category, sign_data)
+                       for sign_id, sign_data in category_data['blocks'].items()]
+            self._categories[category] = records
+            for record in records:
+                self._signs[record.sign_id] = record
+
+    @classmethod
+    def load(cls, database_path: str) -> 'SignCatalog':
+        """Wczytaj bazę danych z pliku"""
+        with open(database_path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __contains__(self, sign_id: str) -> bool:
+        return sign_id in self._signs
+
+    def __len__(self) -> int:
+        return len(self._signs)
+
+    def __iter__(self) -> Iterator[SignRecord]:
+        """Iteruj po znakach w kolejności z bazy danych"""
+        return iter(self._signs.values())
+
+    def get(self, sign_id: str) -> Optional[SignRecord]:
+        """Pobierz rekord znaku"""
+        return self._signs.get(sign_id)
+
+    def lookup(self, sign_id: str) -> Tuple[Optional[str], Optional[SignRecord]]:
+        """Pobierz kategorię i rekord znaku"""
+        record = self._signs.get(sign_id)
+        return (record.category, record) if record else (None, None)
+
+    @property
+    def categories(self) -> List[str]:
+        """Klucze kategorii w kolejności z bazy danych"""
+        return list(self._categories)
+
+    def find_category(self, name: str) -> Optional[str]:
+        """Znajdź klucz kategorii bez względu na wielkość liter"""
+        for category in self._categories:
+            if category.lower() == name.lower():
+                return category
+        return None
+
+    def signs_in_category(self, category: str) -> List[SignRecord]:
+        """Pobierz znaki z kategorii w kolejności z bazy danych"""
+        return self._categories.get(category, [])
+
+    @property
+    def sign_ids(self):
+        """Zbiór identyfikatorów wszystkich znaków"""
+        return self._signs.keys()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Budowanie w drzewie roboczym (.build-stage/) i podmiana katalogów BP/ i RP/ dopiero po udanym przebiegu
+"""
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from build_cache import BUILD_CACHE_DIR
+from console_utils import ConsoleStyle, print_if_not_quiet
+from schema_validation import validate_documents
+
+STAGE_DIR = ".build-stage"
+PACK_DIRS = ("BP", "RP")
+# Pliki, które muszą istnieć i być poprawnym JSON-em, zanim drzewo robocze zastąpi bieżące
+REQUIRED_JSON_FILES = ("BP/manifest.json", "RP/manifest.json", "RP/textures/terrain_texture.json")
+
+
+class StagingError(Exception):
+    """Drzewo robocze nie przeszło walidacji lub nie udało się go podmienić"""
+
+
+class StagedTree:
+    """Kopia BP/ i RP/ z twardych dowiązań: zmienione pliki zastępowane są atomowo (os.replace), więc
+    zapis w drzewie roboczym nigdy nie zmienia plików bieżącego drzewa, a niezmienione pliki nie są kopiowane
+    """
+
+    def __init__(self, root: str = '.', stage_dir: str = STAGE_DIR):
+        self.root = os.path.abspath(root)
+        self.stage_dir = os.path.join(self.root, stage_dir)
+        self.tree_dir = os.path.join(self.stage_dir, "tree")
+        self.previous_dir = os.path.join(self.stage_dir, "previous")
+        self._cwd: Optional[str] = None
+        self.linked_count = 0
+        self.copied_count = 0
+
+    def recover(self) -> bool:
+        """Wycofaj podmianę przerwaną między zmianami nazw katalogów; usuń pozostałości poprzedniego przebiegu
+
+        Podmiana BP/ i RP/ jest jedną operacją: jeśli previous/ zawiera którykolwiek pakiet, oba pakiety wracają
+        do stanu sprzed podmiany (pakiet już zastąpiony drzewem roboczym jest z powrotem przenoszony do tree/).
+        """
+        recovered = False
+        if os.path.isdir(self.previous_dir):
+            for pack_dir in PACK_DIRS:
+                previous = os.path.join(self.previous_dir, pack_dir)
+                if not os.path.isdir(previous):
+                    continue
+                live = os.path.join(self.root, pack_dir)
+                if os.path.exists(live):
+                    staged = os.path.join(self.tree_dir, pack_dir)
+                    if os.path.exists(staged):
+                        shutil.rmtree(staged)
+                    os.makedirs(self.tree_dir, exist_ok=True)
+                    os.rename(live, staged)
+                os.rename(previous, live)
+                recovered = True
+        if os.path.exists(self.stage_dir):
+            shutil.rmtree(self.stage_dir)
+        return recovered
+
+    def _link_tree(self, source: str, target: str):
+        """Odtwórz katalog z twardych dowiązań (kopia tylko tam, gdzie system plików ich nie obsługuje)"""
+        os.makedirs(target, exist_ok=True)
+        with os.scandir(source) as entries:
+            for entry in entries:
+                target_path = os.path.join(target, entry.name)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), target_path)
+                elif entry.is_dir():
+                    self._link_tree(entry.path, target_path)
+                else:
+                    try:
+                        os.link(entry.path, target_path)
+                        self.linked_count += 1
+                    except OSError:
+                        shutil.copy2(entry.path, target_path)
+                        self.copied_count += 1
+
+    def prepare(self):
+        """Utwórz drzewo robocze i przejdź do niego (ścieżki BP/ i RP/ w procesorze są względne)"""
+        if self.recover():
+            print_if_not_quiet(ConsoleStyle.warning("Przywrócono katalogi po przerwanej podmianie drzewa"))
+        for pack_dir in PACK_DIRS:
+            self._link_tree(os.path.join(self.root, pack_dir), os.path.join(self.tree_dir, pack_dir))
+
+        # Manifest budowania i metadane są wspólne — wpisy wskazują ścieżki względne, ważne także po podmianie
+        build_cache_dir = os.path.join(self.root, BUILD_CACHE_DIR)
+        os.makedirs(build_cache_dir, exist_ok=True)
+        os.symlink(build_cache_dir, os.path.join(self.tree_dir, BUILD_CACHE_DIR))
+
+        self._cwd = os.getcwd()
+        os.chdir(self.tree_dir)
+        print_if_not_quiet(ConsoleStyle.info(
+            f"Drzewo robocze [{STAGE_DIR}]: dowiązano [{self.linked_count}] plików, skopiowano [{self.copied_count}]"))
+
+    def _restore_cwd(self):
+        if self._cwd is not None:
+            os.chdir(self._cwd)
+            self._cwd = None
+
+    def changed_files(self) -> Iterator[str]:
+        """Pliki drzewa roboczego (ścieżki względne), które nie są dowiązaniem do pliku bieżącego drzewa"""
+        for pack_dir in PACK_DIRS:
+            for directory, _, files in os.walk(os.path.join(self.tree_dir, pack_dir)):
+                for file_name in files:
+                    staged_path = os.path.join(directory, file_name)
+                    relative_path = os.path.relpath(staged_path, self.tree_dir)
+                    try:
+                        live_stat = os.stat(os.path.join(self.root, relative_path))
+                    except FileNotFoundError:
+                        live_stat = None
+                    staged_stat = os.stat(staged_path)
+                    if live_stat is None or (live_stat.st_ino, live_stat.st_dev) != (staged_stat.st_ino,
+                                                                                     staged_stat.st_dev):
+                        yield relative_path
+
+    def validate(self) -> List[str]:
+        """Sprawdź drzewo robocze: wymagane pliki, poprawność każdego zmienionego pliku JSON i jego zgodność
+        ze schematem (bloki, geometrie, manifesty, katalog crafting — jedna partia walidacji)"""
+        errors = []
+        documents = []
+        json_paths = set(REQUIRED_JSON_FILES)
+        json_paths.update(path for path in self.changed_files() if path.endswith('.json'))
+        for relative_path in sorted(json_paths):
+            try:
+                with open(os.path.join(self.tree_dir, relative_path), 'r', encoding='utf-8') as f:
+                    documents.append((relative_path, json.load(f)))
+            except FileNotFoundError:
+                errors.append(f"Brak pliku [{relative_path}]")
+            except (OSError, ValueError) as e:
+                errors.append(f"Niepoprawny JSON [{relative_path}]: {e}")
+        for relative_path, schema_errors in validate_documents(documents).items():
+            errors.extend(f"Niezgodny ze schematem [{relative_path}] {error}" for error in schema_errors)
+        return errors
+
+    def commit(self):
+        """Zweryfikuj drzewo robocze i podmień nim BP/ i RP/ (zmiana nazwy katalogu jest atomowa)"""
+        self._restore_cwd()
+        errors = self.validate()
+        if errors:
+            raise StagingError("; ".join(errors))
+
+        os.makedirs(self.previous_dir, exist_ok=True)
+        swapped = []
+        try:
+            for pack_dir in PACK_DIRS:
+                live = os.path.join(self.root, pack_dir)
+                os.rename(live, os.path.join(self.previous_dir, pack_dir))
+                swapped.append(pack_dir)
+                os.rename(os.path.join(self.tree_dir, pack_dir), live)
+        except OSError as e:
+            # Wycofaj podmienione katalogi, zanim drzewo robocze zostanie usunięte
+            for pack_dir in reversed(swapped):
+                live = os.path.join(self.root, pack_dir)
+                if os.path.isdir(live):
+                    os.rename(live, os.path.join(self.tree_dir, pack_dir))
+                os.rename(os.path.join(self.previous_dir, pack_dir), live)
+            raise StagingError(f"Nie udało się podmienić katalogów: {e}") from e
+
+        # Po zmianie nazwy previous/ podmiana jest zakończona: recover() nie wycofa jej, nawet jeśli
+        # usuwanie drzewa roboczego zostanie przerwane
+        os.rename(self.previous_dir, os.path.join(self.stage_dir, "discarded"))
+        shutil.rmtree(self.stage_dir)
+        print_if_not_quiet(ConsoleStyle.success(f"Podmieniono katalogi {', '.join(PACK_DIRS)} drzewem roboczym"))
+
+    def discard(self):
+        """Porzuć drzewo robocze; bieżące BP/ i RP/ pozostają nietknięte"""
+        self._restore_cwd()
+        if os.path.exists(self.stage_dir):
+            shutil.rmtree(self.stage_dir)
+
+
+@contextmanager
+def staged_output(enabled: bool = True, root: str = '.'):
+    """Wykonaj blok w drzewie roboczym i podmień nim BP/ i RP/ tylko wtedy, gdy blok zakończy się bez błędu"""
+    if not enabled:
+        # Przebieg bez --stage również nie może pracować na połowicznie podmienionych BP/ i RP/
+        if StagedTree(root).recover():
+            print_if_not_quiet(ConsoleStyle.warning("Przywrócono katalogi po przerwanej podmianie drzewa"))
+        yield None
+        return
+
+    stage = StagedTree(root)
+    stage.prepare()
+    try:
+        yield stage
+    except BaseException:
+        stage.discard()
+        print_if_not_quiet(ConsoleStyle.warning("Przebieg przerwany — katalogi BP/ i RP/ pozostały bez zmian"))
+        raise
+    try:
+        stage.commit()
+    except StagingError:
+        stage.discard()
+        raise
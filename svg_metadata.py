@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Trwały zapis metadanych pobranych plików SVG (adres, ETag/Last-Modified, SHA-1, czas pobrania)
+"""
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from build_cache import BUILD_CACHE_DIR
+from emitter import atomic_open
+
+SVG_METADATA_PATH = os.path.join(BUILD_CACHE_DIR, "svg_metadata.json")
+SVG_METADATA_VERSION = 1
+
+
+class SvgMetadataStore:
+    """Metadane SVG per znak, pozwalające wysyłać zapytania warunkowe (If-None-Match / If-Modified-Since)"""
+
+    def __init__(self, metadata_path: str = SVG_METADATA_PATH):
+        self.metadata_path = metadata_path
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.metadata_path):
+                try:
+                    with open(self.metadata_path, 'r', encoding='utf-8') as f:
+                        metadata = json.load(f)
+                    if metadata.get('version') == SVG_METADATA_VERSION:
+                        self._entries = metadata.get('signs', {})
+                except (OSError, ValueError):
+                    self._entries = {}
+        return self._entries
+
+    def get(self, sign_id: str) -> Optional[Dict]:
+        return self.entries.get(sign_id)
+
+    def conditional_headers(self, sign_id: str) -> Dict[str, str]:
+        """Nagłówki zapytania warunkowego dla zapamiętanej wersji pliku"""
+        entry = self.entries.get(sign_id) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record(self, sign_id: str, page: str, url: str, sha1: str, etag: Optional[str] = None,
+               last_modified: Optional[str] = None):
+        """Zapamiętaj pobraną wersję pliku"""
+        self.entries[sign_id] = {
+            'page': page,
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha1': sha1,
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        }
+        self._dirty = True
+
+    def touch(self, sign_id: str):
+        """Odnotuj, że plik został potwierdzony jako aktualny"""
+        entry = self.entries.get(sign_id)
+        if entry:
+            entry['fetched_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            self._dirty = True
+
+    def save(self) -> bool:
+        """Zapisz metadane atomowo, jeśli coś się zmieniło"""
+        if not self._dirty:
+            return False
+
+        with atomic_open(self.metadata_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SVG_METADATA_VERSION, 'signs': dict(sorted(self.entries.items()))}, f, indent=2)
+
+        self._dirty = False
+        return True
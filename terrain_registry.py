@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Rejestr wpisów RP/textures/terrain_texture.json zapisywany jednorazowo na koniec przebiegu
+"""
+import json
+import os
+from typing import Callable, Dict, List, Optional
+
+from emitter import Emitter, serialize_json
+
+TERRAIN_TEXTURE_PATH = "RP/textures/terrain_texture.json"
+
+
+class TerrainTextureRegistry:
+    """Zbiera dodania i usunięcia tekstur w pamięci i zapisuje plik tylko wtedy, gdy się zmienił"""
+
+    def __init__(self, terrain_path: str = TERRAIN_TEXTURE_PATH, emitter: Optional[Emitter] = None):
+        self.terrain_path = terrain_path
+        self.emitter = emitter or Emitter()
+        self._terrain: Optional[Dict] = None
+        self._original_content: Optional[bytes] = None
+
+    def _load(self) -> Dict:
+        """Wczytaj plik przy pierwszym użyciu"""
+        if self._terrain is None:
+            if os.path.exists(self.terrain_path):
+                with open(self.terrain_path, 'rb') as f:
+                    self._original_content = f.read()
+                self._terrain = json.loads(self._original_content)
+            else:
+                self._terrain = {"texture_data": {}}
+        return self._terrain
+
+    @property
+    def texture_data(self) -> Dict[str, Dict]:
+        return self._load()["texture_data"]
+
+    def __contains__(self, texture_key: str) -> bool:
+        return texture_key in self.texture_data
+
+    def add(self, texture_key: str, texture_path: str) -> bool:
+        """Dodaj wpis tekstury; zwraca False, jeśli wpis już istnieje"""
+        if texture_key in self.texture_data:
+            return False
+        self.texture_data[texture_key] = {"textures": texture_path}
+        return True
+
+    def remove(self, texture_key: str) -> bool:
+        """Usuń wpis tekstury; zwraca False, jeśli wpisu nie było"""
+        return self.texture_data.pop(texture_key, None) is not None
+
+    def remove_matching(self, predicate: Callable[[str], bool]) -> List[str]:
+        """Usuń wszystkie wpisy, których klucz spełnia warunek"""
+        keys_to_remove = [key for key in self.texture_data if predicate(key)]
+        for key in keys_to_remove:
+            del self.texture_data[key]
+        return keys_to_remove
+
+    def _serialize(self) -> bytes:
+        return serialize_json(self._terrain)
+
+    @property
+    def changed(self) -> bool:
+        """Czy zawartość różni się od pliku na dysku"""
+        return self._terrain is not None and self._serialize() != self._original_content
+
+    def flush(self) -> bool:
+        """Zapisz plik atomowo (plik tymczasowy + os.replace), jeśli zawartość się zmieniła"""
+        if self._terrain is None:
+            return False
+        content = self._serialize()
+        if content == self._original_content:
+            return False
+
+        self.emitter.write_bytes(self.terrain_path, content)
+        self._original_content = content
+        return True
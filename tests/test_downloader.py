@@ -0,0 +1,205 @@
+"""
+Klient HTTP/1.1 z downloader.py na lokalnym serwerze: treść chunked i zamykana połączeniem, przekierowania,
+429 z Retry-After, zapytania warunkowe, ponowne użycie połączeń keep-alive
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from downloader import (MAX_REDIRECTS, MAX_RETRY_AFTER, AsyncDownloader, DownloadError, DownloadSettings,
+                        parse_retry_after)
+
+BODY = b'<svg xmlns="http://www.w3.org/2000/svg"/>\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        route = getattr(self, f"route_{self.path.strip('/').split('?')[0].replace('-', '_')}", None)
+        if route:
+            route()
+        else:
+            self.respond(404, b'')
+
+    def respond(self, status, body, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def route_file(self):
+        etag = f'"{hashlib.sha1(BODY).hexdigest()}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+        else:
+            self.respond(200, BODY, [('ETag', etag)])
+
+    def route_chunked(self):
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for part in (BODY[:10], BODY[10:11], BODY[11:]):
+            self.wfile.write(f"{len(part):x};ext=1\r\n".encode('ascii') + part + b"\r\n")
+        self.wfile.write(b"0\r\nX-Trailer: done\r\n\r\n")
+
+    def route_until_close(self):
+        self.send_response(200)
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(BODY)
+        self.close_connection = True
+
+    def route_redirect(self):
+        self.respond(302, b'', [('Location', 'file')])
+
+    def route_redirect_chain(self):
+        self.respond(301, b'', [('Location', '/redirect')])
+
+    def route_redirect_loop(self):
+        self.respond(307, b'', [('Location', '/redirect-loop')])
+
+    def route_limited(self):
+        # Pierwsze zapytanie odrzucone z Retry-After, kolejne obsłużone
+        if self.server.requests.count(self.path) == 1:
+            self.respond(429, b'', [('Retry-After', '1')])
+        else:
+            self.respond(200, BODY)
+
+    def route_unavailable(self):
+        self.respond(503, b'', [('Retry-After', '0')])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.connections = 0
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def run(coroutine_function, **settings):
+    """Wykonaj coroutine_function(downloader) w nowej pętli asyncio"""
+    async def main():
+        async with AsyncDownloader(DownloadSettings(rate=0, **settings)) as downloader:
+            return await coroutine_function(downloader)
+    return asyncio.run(main())
+
+
+def test_chunked_body_with_extensions_and_trailers(server):
+    response = run(lambda downloader: downloader.fetch(f"{server.base_url}/chunked"))
+
+    assert response.status == 200
+    assert response.body == BODY
+
+
+def test_chunked_response_keeps_connection_for_next_request(server):
+    async def fetch_twice(downloader):
+        await downloader.fetch(f"{server.base_url}/chunked")
+        return await downloader.fetch(f"{server.base_url}/file")
+
+    response = run(fetch_twice)
+
+    assert response.body == BODY
+    assert server.connections == 1
+
+
+def test_body_delimited_by_connection_close(server):
+    async def fetch_twice(downloader):
+        first = await downloader.fetch(f"{server.base_url}/until-close")
+        second = await downloader.fetch(f"{server.base_url}/file")
+        return first, second
+
+    first, second = run(fetch_twice)
+
+    assert first.body == BODY
+    assert second.body == BODY
+    assert server.connections == 2
+
+
+def test_redirects_are_followed_to_relative_location(server):
+    response = run(lambda downloader: downloader.fetch(f"{server.base_url}/redirect-chain"))
+
+    assert response.status == 200
+    assert response.body == BODY
+    assert server.requests == ['/redirect-chain', '/redirect', '/file']
+
+
+def test_redirect_loop_stops_after_limit(server):
+    with pytest.raises(DownloadError, match="przekierowań"):
+        run(lambda downloader: downloader.fetch(f"{server.base_url}/redirect-loop"))
+
+    assert len(server.requests) == MAX_REDIRECTS + 1
+
+
+def test_429_waits_for_retry_after(server):
+    started = time.monotonic()
+    response = run(lambda downloader: downloader.fetch(f"{server.base_url}/limited"), max_retries=1)
+
+    assert response.status == 200
+    assert server.requests == ['/limited', '/limited']
+    assert time.monotonic() - started >= 0.9
+
+
+def test_retry_statuses_fail_after_max_retries(server):
+    with pytest.raises(DownloadError, match="HTTP 503"):
+        run(lambda downloader: downloader.fetch(f"{server.base_url}/unavailable"), max_retries=2)
+
+    assert len(server.requests) == 3
+
+
+def test_download_writes_file_and_skips_it_on_304(server, tmp_path):
+    output_path = str(tmp_path / "sign.svg")
+
+    response = run(lambda downloader: downloader.download(f"{server.base_url}/file", output_path,
+                                                          hashlib.sha1(BODY).hexdigest()))
+    with open(output_path, 'rb') as f:
+        assert f.read() == BODY
+    os.remove(output_path)
+
+    conditional = {'If-None-Match': response.headers['etag']}
+    response = run(lambda downloader: downloader.download(f"{server.base_url}/file", output_path,
+                                                          headers=conditional))
+    assert response.status == 304
+    assert not os.path.exists(output_path)
+
+
+def test_download_rejects_sha1_mismatch_without_writing(server, tmp_path):
+    output_path = str(tmp_path / "sign.svg")
+
+    with pytest.raises(DownloadError, match="SHA-1"):
+        run(lambda downloader: downloader.download(f"{server.base_url}/file", output_path, "0" * 40))
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(str(int(MAX_RETRY_AFTER) * 10)) == MAX_RETRY_AFTER
+    assert 25 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,84 @@
+"""
+Zapis plików przez emitter.py: atomowa podmiana bez pozostałości po błędzie, pomijanie niezmienionej
+zawartości i liczniki zapisanych/pominiętych plików
+"""
+import json
+import os
+import stat
+
+import pytest
+
+from emitter import Emitter, atomic_open, serialize_json
+from schema_validation import SchemaValidationError
+
+
+def test_atomic_open_replaces_file_with_readable_permissions(tmp_path):
+    path = str(tmp_path / "nested" / "file.json")
+
+    with atomic_open(path, 'w', encoding='utf-8') as f:
+        f.write('{"a": 1}')
+        assert not os.path.exists(path)
+
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == '{"a": 1}'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert os.listdir(str(tmp_path / "nested")) == ["file.json"]
+
+
+def test_atomic_open_error_keeps_old_file_and_removes_temp(tmp_path):
+    path = tmp_path / "file.json"
+    path.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_open(str(path)) as f:
+            f.write(b"partial")
+            raise RuntimeError("przerwany zapis")
+
+    assert path.read_bytes() == b"old"
+    assert os.listdir(str(tmp_path)) == ["file.json"]
+
+
+def test_emitter_skips_unchanged_content(tmp_path):
+    path = str(tmp_path / "file.lang")
+    emitter = Emitter()
+
+    assert emitter.write_text(path, "a=1\n")
+    inode = os.stat(path).st_ino
+    assert not emitter.write_text(path, "a=1\n")
+    assert os.stat(path).st_ino == inode
+    assert emitter.write_text(path, "a=2\n")
+
+    assert emitter.counts == {'written': 2, 'skipped': 1}
+
+
+def test_emitter_counts_pop_and_merge(tmp_path):
+    worker, parent = Emitter(), Emitter()
+    worker.write_bytes(str(tmp_path / "a"), b"a")
+    worker.write_bytes(str(tmp_path / "a"), b"a")
+
+    parent.merge(worker.pop_counts())
+    parent.merge(worker.pop_counts())
+
+    assert worker.counts == {'written': 0, 'skipped': 0}
+    assert parent.counts == {'written': 1, 'skipped': 1}
+
+
+def test_write_json_matches_json_dumps(tmp_path):
+    path = str(tmp_path / "file.json")
+    data = {'name': 'Znak ostrzegawczy', 'small': 1e-05, 'values': [0.5, 2]}
+
+    Emitter().write_json(path, data)
+
+    with open(path, 'rb') as f:
+        assert f.read() == json.dumps(data, indent=2).encode('utf-8') == serialize_json(data)
+
+
+def test_write_json_rejects_document_not_matching_schema(tmp_path):
+    path = str(tmp_path / "BP" / "blocks" / "a" / "a_1.block.json")
+    emitter = Emitter()
+
+    with pytest.raises(SchemaValidationError, match="does not match the block schema"):
+        emitter.write_json(path, {'format_version': '1.21.0'})
+
+    assert not os.path.exists(path)
+    assert emitter.counts == {'written': 0, 'skipped': 0}
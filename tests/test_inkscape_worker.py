@@ -0,0 +1,38 @@
+"""
+Eksport przez `inkscape --shell` (atrapa z fake_tools.py): PNG na standardowym wyjściu powłoki, bez pliku
+"""
+import os
+import struct
+
+from fake_tools import FakeToolbox, make_png
+from inkscape_worker import PNG_SIGNATURE, SHELL_PROMPT, InkscapeShell, png_end
+
+
+def test_png_end_walks_chunks_and_ignores_prompt_bytes_inside_image():
+    png = make_png(3, 2)
+    # Znak zachęty wewnątrz danych chunku nie kończy obrazu
+    chunk_data = b"x" + SHELL_PROMPT
+    chunk = struct.pack('>I', len(chunk_data)) + b'tEXt' + chunk_data + b'\0\0\0\0'
+    png = png[:len(PNG_SIGNATURE)] + chunk + png[len(PNG_SIGNATURE):]
+    output = b"warning\n" + png + SHELL_PROMPT
+
+    assert png_end(output, len(b"warning\n")) == len(output) - len(SHELL_PROMPT)
+    assert png_end(output[:-len(SHELL_PROMPT) - 1], len(b"warning\n")) is None
+
+
+def test_export_data_returns_png_without_writing_files(tmp_path):
+    svg_path = str(tmp_path / "sign.svg")
+    with open(svg_path, 'w', encoding='utf-8') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg"/>')
+
+    with FakeToolbox(), InkscapeShell() as shell:
+        first = shell.export_data(svg_path, 30, 60)
+        missing = shell.export_data(str(tmp_path / "missing.svg"), 30, 60)
+        second = shell.export_data(svg_path, 40, 20)
+
+    assert first.success and first.data[:len(PNG_SIGNATURE)] == PNG_SIGNATURE
+    assert struct.unpack('>II', first.data[16:24]) == (30, 60)
+    assert not missing.success and missing.data is None
+    assert struct.unpack('>II', second.data[16:24]) == (40, 20)
+    assert shell.start_count == 1
+    assert os.listdir(str(tmp_path)) == ["sign.svg"]
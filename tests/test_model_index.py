@@ -0,0 +1,89 @@
+"""
+Wyszukiwanie modeli w model_index.py w porównaniu z dawnym MinecraftUtils._find_similar_model: te same wyniki
+dla istniejących modeli, zgłaszany brak modelu tam, gdzie dawne dopasowanie prefiksem go ukrywało
+"""
+import os
+import random
+
+import pytest
+
+from build_plan import get_model_name, parse_model_name
+from model_index import ModelIndex
+from model_registry import MODELS_DIR
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_MODELS = sorted(file_name[:-len('.geo.json')]
+                     for file_name in os.listdir(os.path.join(REPO_ROOT, MODELS_DIR))
+                     if file_name.endswith('.geo.json'))
+
+
+def find_similar_model(model_name, available_models):
+    """Dawna implementacja z minecraft_check.py (przed indeksem modeli)"""
+    if model_name in available_models:
+        return model_name
+    base_name = model_name.split('_')[0]
+    for available_model in available_models:
+        if available_model.startswith(base_name):
+            return available_model
+    return None
+
+
+def brute_force_nearest(model_name, available_models):
+    """Najmniejszy łączny odstęp wymiarów wśród modeli o tym samym kształcie i wyrównaniu (przegląd liniowy)"""
+    shape, width, height, alignment = parse_model_name(model_name)
+    distances = [abs(w - width) + abs(h - height)
+                 for s, w, h, a in filter(None, map(parse_model_name, available_models))
+                 if (s, a) == (shape, alignment)]
+    return min(distances) if distances else None
+
+
+def distance(model_name, other_name):
+    _, width, height, _ = parse_model_name(model_name)
+    _, other_width, other_height, _ = parse_model_name(other_name)
+    return abs(width - other_width) + abs(height - other_height)
+
+
+@pytest.fixture
+def index():
+    return ModelIndex(REPO_MODELS)
+
+
+def test_existing_models_match_the_old_lookup(index):
+    assert len(index) == len(REPO_MODELS)
+    for model_name in REPO_MODELS:
+        assert model_name in index
+        assert index.nearest(model_name) == find_similar_model(model_name, REPO_MODELS) == model_name
+
+
+@pytest.mark.parametrize('model_name', [
+    get_model_name('rectangle', 1300, 1000),
+    get_model_name('inverted_triangle', 1000, 900),
+    get_model_name('circle', 2000, 10),
+])
+def test_missing_model_is_reported_with_nearest_hint(index, model_name):
+    # Dawne dopasowanie prefiksem 'road' uznawało każdy brakujący model za istniejący
+    assert find_similar_model(model_name, REPO_MODELS) is not None
+    assert model_name not in index
+
+    nearest = index.nearest(model_name)
+    assert parse_model_name(nearest)[0::3] == parse_model_name(model_name)[0::3]
+    assert distance(model_name, nearest) == brute_force_nearest(model_name, REPO_MODELS)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_nearest_matches_linear_scan(seed):
+    # Nieregularne wymiary: najbliższy model bywa przy szerokości dalszej niż sąsiednia
+    rng = random.Random(seed)
+    models = [get_model_name('square', rng.randrange(100, 1000), rng.randrange(100, 1000)) for _ in range(40)]
+    index = ModelIndex(models)
+
+    for width in range(50, 1100, 37):
+        for height in range(50, 1100, 41):
+            model_name = get_model_name('square', width, height)
+            assert distance(model_name, index.nearest(model_name)) == brute_force_nearest(model_name, models)
+
+
+def test_unknown_shape_alignment_or_name_has_no_hint(index):
+    assert index.nearest(get_model_name('hexagon', 900, 900)) is None
+    assert index.nearest(get_model_name('circle', 900, 900, 'top')) is None
+    assert index.nearest('some_other_model') is None
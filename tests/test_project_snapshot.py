@@ -0,0 +1,65 @@
+"""
+Migawka projektu dla verify_all.py: pomijane katalogi dopasowywane po nazwie, a brak lub uszkodzenie bazy danych
+zgłaszane jako błąd weryfikacji bloków zamiast pominięcia sprawdzenia pokrycia
+"""
+import os
+import shutil
+
+import pytest
+
+import project_snapshot
+from minecraft_check import MinecraftUtils
+from project_snapshot import ProjectSnapshot
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCK_PATH = "BP/blocks/a/a_1.block.json"
+
+
+def write(root, relative_path, content=b'{}'):
+    path = os.path.join(str(root), relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def test_skipped_dirs_match_whole_path_components(tmp_path):
+    for relative_path in ("dist/a.json", "BP/__pycache__/a.pyc", ".build-stage/tree/BP/a.json", "venv/a.py",
+                          "distance/a.json", "RP/textures/venvy/a.png", "my.git/a.json", BLOCK_PATH):
+        write(tmp_path, relative_path)
+
+    snapshot = ProjectSnapshot(str(tmp_path))
+
+    assert snapshot.files == {"distance/a.json", "RP/textures/venvy/a.png", "my.git/a.json", BLOCK_PATH}
+    assert snapshot.exists("distance/") and not snapshot.exists("dist/")
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Jeden poprawny blok z repozytorium; baza danych zapisywana przez test"""
+    os.makedirs(str(tmp_path / "BP/blocks/a"))
+    shutil.copyfile(os.path.join(REPO_ROOT, BLOCK_PATH), str(tmp_path / BLOCK_PATH))
+    shutil.copytree(os.path.join(REPO_ROOT, "RP/models/blocks"), str(tmp_path / "RP/models/blocks"))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(project_snapshot, '_snapshot', None)
+    return tmp_path
+
+
+def test_valid_database_runs_coverage_check(workspace):
+    write(workspace, "database.json", b'{"categories": {"A": {"blocks": {"a_1": {}, "a_2": {}}}}}')
+
+    assert any(error.startswith("Missing [1] file blocks: a_2") for error in MinecraftUtils.verify_blocks()[0])
+
+
+@pytest.mark.parametrize('content, message', [
+    (None, "Cannot load database [database.json]: No such file"),
+    (b'{"categories": ', "Cannot load database [database.json]: Expecting value"),
+    (b'{"signs": []}', "Cannot load database [database.json]: 'categories'"),
+    (b'{"categories": {}}', "No blocks defined in database [database.json]"),
+])
+def test_unusable_database_is_an_error(workspace, content, message):
+    if content is not None:
+        write(workspace, "database.json", content)
+
+    errors, _ = MinecraftUtils.verify_blocks()
+
+    assert any(error.startswith(message) for error in errors), errors
@@ -0,0 +1,89 @@
+"""
+Uzgadnianie plików wynikowych z bazą danych: usuwane są osierocone pliki i wpisy terrain_texture.json,
+zapominane ich klucze manifestu i modele, a pliki opisywane przez bazę zostają nietknięte
+"""
+import os
+
+import pytest
+
+from build_cache import BuildCache
+from build_plan import get_model_name
+from model_registry import ModelRegistry
+from reconcile import (AVERSE_TERRAIN_PREFIX, OutputSet, get_averse_png_path, get_block_path, get_model_path,
+                       get_reverse_texture_path, reconcile_outputs)
+from sign_catalog import SignCatalog
+from terrain_registry import TerrainTextureRegistry
+
+
+def make_catalog(width=900, height=900):
+    return SignCatalog({'categories': {'A': {'blocks': {
+        'a_1': {'sign_shape': 'triangle', 'sign_width': str(width), 'sign_height': str(height)},
+    }}}})
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'{}')
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Pliki wynikowe znaku a_1 oraz osierocone pozostałości po usuniętym znaku a_9"""
+    monkeypatch.chdir(tmp_path)
+    catalog = make_catalog()
+    for path in OutputSet(catalog).files:
+        touch(path)
+
+    orphans = [get_block_path('a_9'), get_averse_png_path('a_9'), get_reverse_texture_path('orphan_back'),
+               get_model_path(get_model_name('circle', 123, 123))]
+    for path in orphans:
+        touch(path)
+
+    terrain = TerrainTextureRegistry()
+    terrain.add(f"{AVERSE_TERRAIN_PREFIX}a_1", get_averse_png_path('a_1')[len("RP/"):])
+    terrain.add(f"{AVERSE_TERRAIN_PREFIX}a_9", get_averse_png_path('a_9')[len("RP/"):])
+
+    cache = BuildCache()
+    for key in ('block:a_1', 'block:a_9', 'averse:a_9', 'reverse:orphan_back'):
+        cache.record(key, {}, [])
+    return catalog, orphans, terrain, cache, ModelRegistry()
+
+
+def test_removes_orphans_and_forgets_their_cache_keys(workspace):
+    catalog, orphans, terrain, cache, models = workspace
+
+    report = reconcile_outputs(catalog, terrain, cache, models)
+
+    assert report.orphan_files == sorted(orphans)
+    assert not any(os.path.exists(path) for path in orphans)
+    assert all(os.path.exists(path) for path in OutputSet(catalog).files)
+    assert set(cache.entries) == {'block:a_1'}
+    assert set(terrain.texture_data) == {f"{AVERSE_TERRAIN_PREFIX}a_1"}
+    assert report.removed_count == len(orphans) + 1
+
+
+def test_dry_run_deletes_nothing(workspace):
+    catalog, orphans, terrain, cache, models = workspace
+
+    report = reconcile_outputs(catalog, terrain, cache, models, dry_run=True)
+
+    assert report.orphan_files == sorted(orphans)
+    assert report.orphan_terrain_keys == [f"{AVERSE_TERRAIN_PREFIX}a_9"]
+    assert all(os.path.exists(path) for path in orphans)
+    assert len(cache.entries) == 4
+    assert report.removed_count == 0
+
+
+def test_changed_dimensions_replace_the_stale_model(workspace):
+    _, _, terrain, cache, models = workspace
+    old_model = get_model_name('triangle', 900, 900)
+    new_model = get_model_name('triangle', 750, 663)
+    models.load(old_model)
+
+    report = reconcile_outputs(make_catalog(750, 663), terrain, cache, models)
+
+    assert not os.path.exists(get_model_path(old_model))
+    assert models.load(old_model) is None
+    assert get_model_path(new_model) in report.missing_files
+    assert not report.up_to_date
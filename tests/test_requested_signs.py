@@ -0,0 +1,79 @@
+"""
+Wybór znaków z linii poleceń ("all", "category:X", kody): przebieg przetwarza dokładnie znaki pokazywane
+przez --plan, a podsumowanie ma ten sam kształt co przed wspólnym selektorem
+"""
+import re
+
+import pytest
+
+import road_sign_processor
+from road_sign_processor import process_requested_signs, select_requested_signs
+from sign_catalog import SignCatalog
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+LINK = 'https://pl.wikipedia.org/wiki/Plik:PL_road_sign_{}.svg'
+
+
+@pytest.fixture
+def catalog():
+    return SignCatalog({'categories': {
+        'A': {'blocks': {
+            'a_1': {'wikipedia_file_page': LINK.format('A-1')},
+            'a_2': {},
+        }},
+        'B': {'blocks': {
+            'b_1': {'wikipedia_file_page': LINK.format('B-1'), 'sign_width': '600', 'sign_height': '800'},
+            'b_2': {'wikipedia_file_page': LINK.format('B-2')},
+        }},
+    }})
+
+
+@pytest.fixture
+def processed(monkeypatch):
+    """Atrapa process_signs: zapamiętuje przekazane znaki, b_2 kończy się błędem"""
+    calls = []
+
+    def fake_process_signs(signs, *args):
+        calls.append([sign.sign_id for sign in signs])
+        return [sign.sign_id != 'b_2' for sign in signs]
+    monkeypatch.setattr(road_sign_processor, 'process_signs', fake_process_signs)
+    return calls
+
+
+def output(capsys):
+    return ANSI_ESCAPE.sub('', capsys.readouterr().out)
+
+
+@pytest.mark.parametrize('blocks', [['all'], ['category:b'], ['A-1', 'a_2', 'x_9', 'b1']])
+def test_run_processes_exactly_the_planned_signs(catalog, processed, blocks):
+    process_requested_signs(catalog, blocks)
+
+    assert processed == [[sign.sign_id for sign in select_requested_signs(catalog, blocks)]]
+
+
+def test_all_skips_signs_without_link_and_reports_each_category(catalog, processed, capsys):
+    assert process_requested_signs(catalog, ['all']) == (2, 4, ["b_2: błąd przetwarzania"])
+
+    text = output(capsys)
+    assert "Kategoria A\n" in text and "Kategoria B\n" in text
+    assert "a_2: brak linku do pliku Wikipedii" in text
+
+
+def test_category_reports_sign_count(catalog, processed, capsys):
+    assert process_requested_signs(catalog, ['category:b']) == (1, 2, ["b_2: błąd przetwarzania"])
+
+    assert "Znaleziono 2 znaków w kategorii B" in output(capsys)
+
+
+def test_unknown_category_returns_none(catalog, processed, capsys):
+    assert process_requested_signs(catalog, ['category:z']) is None
+    assert processed == []
+
+
+def test_codes_report_missing_signs_and_links_as_errors(catalog, processed, capsys):
+    assert process_requested_signs(catalog, ['A-1', 'a_2', 'x_9', 'b1']) == (
+        2, 4, ["a_2: brak linku do pliku Wikipedii", "x_9: nie znaleziono w bazie"])
+
+    text = output(capsys)
+    assert "Kod: A-1 → a_1" in text and "Kod: b1 → b_1" in text
+    assert "Docelowe wymiary: 600x800" in text
@@ -0,0 +1,118 @@
+"""
+Walidatory schematów z schema_validation.py: pliki z repozytorium są poprawne, a uszkodzone dokumenty
+odrzucane z błędami wskazującymi ścieżkę w dokumencie
+"""
+import copy
+import glob
+import json
+import os
+
+import pytest
+
+from schema_validation import (SchemaValidationError, compile_schema, schema_kind_for_path, validate_document,
+                               validate_documents)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCK_PATH = "BP/blocks/a/a_1.block.json"
+GEOMETRY_PATH = "RP/models/blocks/road_sign_circle_900x900_bottom.geo.json"
+MANIFEST_PATH = "BP/manifest.json"
+CATALOG_PATH = "BP/item_catalog/crafting_item_catalog.json"
+
+
+def load(relative_path):
+    with open(os.path.join(REPO_ROOT, relative_path), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_repository_files_match_their_schemas():
+    paths = [MANIFEST_PATH, "RP/manifest.json", CATALOG_PATH]
+    for pattern in ("BP/blocks/*/*.block.json", "RP/models/blocks/*.geo.json"):
+        paths.extend(os.path.relpath(path, REPO_ROOT) for path in glob.glob(os.path.join(REPO_ROOT, pattern)))
+
+    assert len(paths) > 3
+    assert validate_documents((path, load(path)) for path in paths) == {}
+
+
+@pytest.mark.parametrize('path, kind', [
+    (BLOCK_PATH, 'block'),
+    (os.path.join(".build-stage", "tree", GEOMETRY_PATH), 'geometry'),
+    ("RP/manifest.json", 'manifest'),
+    (CATALOG_PATH, 'catalog'),
+    ("RP/textures/terrain_texture.json", None),
+    ("notBP/manifest.json", None),
+])
+def test_schema_kind_for_path(path, kind):
+    assert schema_kind_for_path(path) == kind
+
+
+def broken(path, change):
+    data = copy.deepcopy(load(path))
+    change(data)
+    return validate_document(path, data)
+
+
+def test_block_errors_point_into_the_document():
+    def change(data):
+        data['format_version'] = 1.21
+        data['minecraft:block']['description']['identifier'] = 'A 1'
+        del data['minecraft:block']['components']['minecraft:geometry']
+
+    errors = broken(BLOCK_PATH, change)
+
+    assert "$.format_version: expected string" in errors
+    assert "$.minecraft:block.description.identifier: 'A 1' does not match ^[a-z0-9_.\\-]+:[a-z0-9_.\\-]+$" in errors
+    assert "$.minecraft:block.components: missing required property 'minecraft:geometry'" in errors
+    assert len(errors) == 3
+
+
+def test_geometry_rejects_bad_cube_vectors():
+    def change(data):
+        data['minecraft:geometry'][0]['bones'][0]['cubes'][0]['size'] = [1, 2]
+
+    assert broken(GEOMETRY_PATH, change) == [
+        "$.minecraft:geometry[0].bones[0].cubes[0].size: expected at least 3 items"]
+
+
+def test_manifest_rejects_bad_uuid_and_version():
+    def change(data):
+        data['header']['uuid'] = 'not-a-uuid'
+        data['header']['version'] = [1, True, -1]
+
+    errors = broken(MANIFEST_PATH, change)
+
+    assert "$.header.uuid: 'not-a-uuid' does not match" in errors[0]
+    assert "$.header.version[1]: expected integer" in errors
+    assert "$.header.version[2]: -1 is less than 0" in errors
+
+
+def test_catalog_rejects_unknown_menu_category():
+    def change(data):
+        data['minecraft:crafting_items_catalog']['categories'][0]['category_name'] = 'signs'
+
+    errors = broken(CATALOG_PATH, change)
+
+    assert len(errors) == 1
+    assert errors[0].startswith("$.minecraft:crafting_items_catalog.categories[0].category_name: 'signs' is not one")
+
+
+def test_non_object_document_is_rejected():
+    assert validate_document(BLOCK_PATH, []) == ["$: expected object"]
+    assert validate_documents([(BLOCK_PATH, None), (GEOMETRY_PATH, load(GEOMETRY_PATH))]) == {
+        BLOCK_PATH: ["$: expected object"]}
+
+
+def test_additional_properties_and_min_properties():
+    validate = compile_schema({'type': 'object', 'minProperties': 1,
+                               'additionalProperties': {'type': 'integer'}, 'properties': {'name': {}}})
+
+    assert validate({'name': 'x', 'a': 1}) == []
+    assert validate({}) == ["$: expected at least 1 properties"]
+    assert validate({'a': '1', '{b}': 2.5}) == ["$.a: expected integer", "$.{b}: expected integer"]
+
+
+def test_schema_validation_error_message():
+    error = SchemaValidationError(BLOCK_PATH, ["$: expected object"])
+
+    assert isinstance(error, ValueError)
+    assert str(error) == f"{BLOCK_PATH} does not match the block schema: $: expected object"
+    assert error.errors == ["$: expected object"]
@@ -0,0 +1,112 @@
+"""
+Drzewo robocze --stage: BP/ i RP/ podmieniane dopiero po udanym i poprawnym przebiegu, a podmiana przerwana
+między zmianami nazw katalogów wycofywana przy następnym uruchomieniu
+"""
+import os
+import shutil
+
+import pytest
+
+from emitter import Emitter
+from staging import REQUIRED_JSON_FILES, STAGE_DIR, StagedTree, StagingError, staged_output
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCK_PATH = "BP/blocks/a/a_1.block.json"
+
+
+def read(root, relative_path):
+    with open(os.path.join(str(root), relative_path), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """Minimalne BP/ i RP/ z wymaganymi plikami JSON skopiowanymi z repozytorium"""
+    for relative_path in REQUIRED_JSON_FILES:
+        os.makedirs(os.path.dirname(str(tmp_path / relative_path)), exist_ok=True)
+        shutil.copyfile(os.path.join(REPO_ROOT, relative_path), str(tmp_path / relative_path))
+    (tmp_path / "BP/blocks/a").mkdir(parents=True)
+    (tmp_path / BLOCK_PATH).write_bytes(b'{"old": true}')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_successful_run_swaps_in_the_staged_tree(root):
+    unchanged_inode = os.stat(str(root / "RP/manifest.json")).st_ino
+
+    with staged_output(root=str(root)) as stage:
+        assert os.getcwd() == stage.tree_dir
+        Emitter().write_bytes("RP/texts/en_US.lang", b"tile.polish_road_sign:a_1.name=A-1\n")
+        assert not (root / "RP/texts").exists()
+
+    assert os.getcwd() == str(root)
+    assert read(root, "RP/texts/en_US.lang") == b"tile.polish_road_sign:a_1.name=A-1\n"
+    assert os.stat(str(root / "RP/manifest.json")).st_ino == unchanged_inode
+    assert not (root / STAGE_DIR).exists()
+
+
+def test_failed_run_leaves_live_tree_untouched(root):
+    with pytest.raises(RuntimeError):
+        with staged_output(root=str(root)):
+            Emitter().write_bytes(BLOCK_PATH, b'{"new": true}')
+            raise RuntimeError("przerwany przebieg")
+
+    assert os.getcwd() == str(root)
+    assert read(root, BLOCK_PATH) == b'{"old": true}'
+    assert not (root / STAGE_DIR).exists()
+
+
+def test_invalid_json_blocks_the_swap(root):
+    with pytest.raises(StagingError, match="Niepoprawny JSON"):
+        with staged_output(root=str(root)):
+            Emitter().write_bytes("RP/textures/terrain_texture.json", b'{"texture_data": ')
+
+    assert read(root, "RP/textures/terrain_texture.json") == read(REPO_ROOT, "RP/textures/terrain_texture.json")
+    assert not (root / STAGE_DIR).exists()
+
+
+def test_schema_error_in_changed_block_blocks_the_swap(root):
+    with pytest.raises(StagingError, match=r"Niezgodny ze schematem \[BP/blocks/a/a_1\.block\.json\]"):
+        with staged_output(root=str(root)):
+            Emitter().write_bytes(BLOCK_PATH, b'{"format_version": "1.21.0"}')
+
+    assert read(root, BLOCK_PATH) == b'{"old": true}'
+
+
+@pytest.mark.parametrize('swapped_packs', [0, 1])
+def test_recover_rolls_back_interrupted_swap(root, swapped_packs):
+    # Stan po przerwaniu commit(): BP/ przeniesiony do previous/, a (opcjonalnie) drzewo robocze już na jego miejscu
+    stage = StagedTree(str(root))
+    os.makedirs(stage.previous_dir)
+    os.rename(str(root / "BP"), os.path.join(stage.previous_dir, "BP"))
+    if swapped_packs:
+        (root / "BP").mkdir()
+        (root / "BP/new.json").write_bytes(b'{}')
+
+    assert StagedTree(str(root)).recover()
+
+    assert read(root, BLOCK_PATH) == b'{"old": true}'
+    assert not (root / "BP/new.json").exists()
+    assert read(root, "RP/manifest.json") == read(REPO_ROOT, "RP/manifest.json")
+    assert not (root / STAGE_DIR).exists()
+
+
+def test_disabled_staging_still_recovers(root):
+    stage = StagedTree(str(root))
+    os.makedirs(stage.previous_dir)
+    os.rename(str(root / "RP"), os.path.join(stage.previous_dir, "RP"))
+
+    with staged_output(enabled=False, root=str(root)) as stage:
+        assert stage is None
+        assert read(root, "RP/manifest.json") == read(REPO_ROOT, "RP/manifest.json")
+
+
+def test_swap_interrupted_during_cleanup_is_not_rolled_back(root):
+    # Stan po przerwaniu commit() w trakcie usuwania drzewa roboczego: previous/ ma już nazwę discarded/
+    stage = StagedTree(str(root))
+    shutil.copytree(str(root / "BP"), os.path.join(stage.stage_dir, "discarded", "BP"))
+    (root / BLOCK_PATH).write_bytes(b'{"new": true}')
+
+    assert not StagedTree(str(root)).recover()
+    assert read(root, BLOCK_PATH) == b'{"new": true}'
+    assert not (root / STAGE_DIR).exists()
@@ -0,0 +1,117 @@
+"""
+Liczby wywołań narzędzi zewnętrznych i zapytań HTTP w przebiegu procesora: atrapy narzędzi i lokalny serwer
+z fake_tools.py, procesor uruchamiany jako osobny proces w kopii projektu
+"""
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from build_plan import get_model_name
+from fake_tools import FakeToolbox
+from model_registry import MODELS_DIR
+from pipeline_benchmark import copy_tool_tree, write_fixture_svgs
+from sign_catalog import SignCatalog
+from wikimedia_api import MAX_TITLES_PER_QUERY
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG = SignCatalog.load(os.path.join(ROOT, 'database.json'))
+SIGN_COUNT = len(CATALOG)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    copy_tool_tree(str(tmp_path), ROOT)
+    shutil.copy2(os.path.join(ROOT, 'database.json'), str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def tools():
+    with FakeToolbox() as toolbox:
+        yield toolbox
+
+
+def run_processor(workspace, tools, *args):
+    """Uruchom road_sign_processor.py w kopii projektu; zwraca liczby wywołań tylko z tego przebiegu"""
+    before = tools.counts()
+    command = [sys.executable, 'road_sign_processor.py', *args, '--quiet']
+    if '--skip-download' not in args:
+        command += ['--base-url', tools.base_url, '--rate', '0']
+    result = subprocess.run(command, cwd=workspace, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    counts = tools.counts()
+    counts.subtract(before)
+    return counts
+
+
+def test_full_run_batches_api_queries_and_uses_one_inkscape_shell(workspace, tools):
+    counts = run_processor(workspace, tools, 'all', '--force-rebuild')
+
+    assert counts['http:api'] == math.ceil(SIGN_COUNT / MAX_TITLES_PER_QUERY)
+    assert counts['http:page'] == 0
+    assert counts['http:file'] == SIGN_COUNT
+    assert counts['inkscape:export'] == SIGN_COUNT
+    assert counts['inkscape:shell'] == 1
+    for tool in ('magick', 'identify', 'curl', 'rsvg-convert'):
+        assert counts[tool] == 0, tool
+
+
+def test_parallel_run_starts_one_inkscape_shell_per_worker(workspace, tools):
+    counts = run_processor(workspace, tools, 'all', '--force-rebuild', '--jobs', '2')
+
+    assert counts['inkscape:export'] == SIGN_COUNT
+    assert counts['inkscape:shell'] == 2
+
+
+def test_offline_run_makes_no_http_requests(workspace, tools):
+    write_fixture_svgs(workspace, CATALOG)
+    counts = run_processor(workspace, tools, 'all', '--skip-download')
+
+    assert counts['http'] == 0
+    assert counts['inkscape:export'] == SIGN_COUNT
+
+
+def test_unchanged_rerun_exports_nothing(workspace, tools):
+    write_fixture_svgs(workspace, CATALOG)
+    run_processor(workspace, tools, 'all', '--skip-download')
+    counts = run_processor(workspace, tools, 'all', '--skip-download')
+
+    assert counts['inkscape:export'] == 0
+    assert counts['inkscape:shell'] == 0
+
+
+def test_sync_rerun_revalidates_without_downloading_or_exporting(workspace, tools):
+    run_processor(workspace, tools, 'all')
+    previous_calls = len(tools.calls('http', 'file'))
+    counts = run_processor(workspace, tools, 'all', '--sync')
+
+    statuses = [call['args'][1] for call in tools.calls('http', 'file')[previous_calls:]]
+    assert statuses == ['304'] * SIGN_COUNT
+    assert counts['inkscape:export'] == 0
+    assert counts['inkscape:shell'] == 0
+
+
+def test_sync_rerun_applies_database_changes_to_unchanged_svg(workspace, tools):
+    run_processor(workspace, tools, 'all')
+    database_path = os.path.join(workspace, 'database.json')
+    with open(database_path, 'r', encoding='utf-8') as f:
+        database = json.load(f)
+    sign = database['categories']['a']['blocks']['a_1']
+    sign['sign_width'], sign['sign_height'] = '750', '663'
+    with open(database_path, 'w', encoding='utf-8') as f:
+        json.dump(database, f, indent=2, ensure_ascii=False)
+
+    counts = run_processor(workspace, tools, 'all', '--sync')
+
+    # SVG jest bez zmian, ale zmienił się wpis bazy: tekstura i blok znaku powstają na nowo, model istnieje
+    assert counts['inkscape:export'] == 1
+    with open(os.path.join(workspace, 'BP/blocks/a/a_1.block.json'), 'r', encoding='utf-8') as f:
+        geometry = json.load(f)['minecraft:block']['components']['minecraft:geometry']
+    model_name = get_model_name('triangle', 750, 663)
+    assert geometry == f"geometry.{model_name}"
+    assert os.path.exists(os.path.join(workspace, MODELS_DIR, f"{model_name}.geo.json"))
@@ -4,30 +4,73 @@ Comprehensive verification script for Minecraft Bedrock Addon
 Verifies project structure, files, textures, and build readiness
 """
 
-from minecraft_check import MinecraftUtils
-
-try:
-    from PIL import Image
-
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+import argparse
+import atexit
 
+from build_plan import get_reverse_texture_for_shape, get_texture_canvas_size, scale_size_from_mm_to_px
 from console_utils import ConsoleStyle, rsort
+from image_metadata import ImageMetadataIndex
+from minecraft_check import MinecraftUtils
+from profiler import DEFAULT_TRACE_PATH, get_profiler
+from project_snapshot import get_project_snapshot, set_changed_only
+from sign_catalog import SignCatalog
 
-if not PIL_AVAILABLE:
-    print(ConsoleStyle.warning("PIL not available - texture dimension checks will be skipped"))
+# Wymiary tekstur odczytywane z nagłówków PNG i zapamiętywane między uruchomieniami
+image_index = ImageMetadataIndex()
 
 
 def get_texture_dimensions(texture_path):
     """Pobierz wymiary tekstury"""
-    if not PIL_AVAILABLE:
-        return None, None
-    try:
-        with Image.open(texture_path) as img:
-            return img.size[0], img.size[1]
-    except Exception:
-        return None, None
+    return image_index.dimensions(texture_path)
+
+
+def verify_texture_dimensions():
+    """Sprawdź wymiary tekstur awersu i rewersu (nagłówki PNG, bez dekodowania obrazów)
+
+    Wcześniej get_texture_dimensions nie miało żadnego wywołania, choć komunikat o braku PIL zapowiadał
+    sprawdzanie wymiarów. To jedyny odbiorca indeksu nagłówków w weryfikacji: tekstura o innym rozmiarze niż
+    płótno modelu (UV w pikselach) rozciąga się w grze, a pozostałe testy tekstur sprawdzają tylko ich obecność.
+    """
+    errors = []
+    warnings = []
+
+    catalog = SignCatalog(get_project_snapshot().database)
+
+    expected = {}
+    for sign in catalog:
+        canvas_size = get_texture_canvas_size(scale_size_from_mm_to_px(sign.sign_width),
+                                              scale_size_from_mm_to_px(sign.sign_height))
+        expected[f"RP/textures/blocks/averse/{sign.category.lower()}/{sign.sign_id}.png"] = canvas_size
+        reverse_texture_name = get_reverse_texture_for_shape(sign.sign_shape, sign.sign_width, sign.sign_height)
+        expected[f"RP/textures/blocks/reverse/{reverse_texture_name}.png"] = canvas_size
+
+    checked = 0
+    missing = 0
+    mismatched = []
+    for texture_path, (expected_width, expected_height) in sorted(expected.items()):
+        if not get_project_snapshot().exists(texture_path):
+            missing += 1
+            continue
+        checked += 1
+        width, height = get_texture_dimensions(texture_path)
+        if width is None:
+            errors.append(f"Unreadable PNG header: {texture_path}")
+        elif (width, height) != (expected_width, expected_height):
+            mismatched.append(texture_path)
+            errors.append(f"Texture {texture_path} is {width}x{height}, expected {expected_width}x{expected_height}")
+
+    image_index.save()
+
+    stats = {
+        ConsoleStyle.info("Checked textures"): f"[{checked}]",
+        ConsoleStyle.info("Missing textures (see texture checks)"): f"[{missing}]",
+        ConsoleStyle.error("Wrong dimensions") if mismatched else ConsoleStyle.success("Wrong dimensions"):
+            f"[{len(mismatched)}]" + (f" ({', '.join(mismatched)})" if mismatched else ""),
+        ConsoleStyle.info("PNG headers read from disk"): f"[{image_index.read_count}]",
+    }
+    ConsoleStyle.print_stats(stats, f"TEXTURE DIMENSIONS ([{len(expected)}])", icon='🖼')
+
+    return errors, warnings
 
 
 def verify_vertical_alignment():
@@ -35,7 +78,7 @@ def verify_vertical_alignment():
     errors = []
     warnings = []
 
-    data = MinecraftUtils.load_json_file('database.json')
+    data = get_project_snapshot().database
 
     stats = {}
     total_signs = 0
@@ -80,7 +123,7 @@ def verify_database():
     errors = []
     warnings = []
 
-    data = MinecraftUtils.load_json_file('database.json')
+    data = get_project_snapshot().database
 
     stats = {}
     categories = list(data['categories'].keys())
@@ -135,7 +178,7 @@ def verify_blocks_comprehensive():
     warnings = []
 
     # Wczytaj dane
-    data = MinecraftUtils.load_json_file('database.json')
+    data = get_project_snapshot().database
 
     # Zbierz statystyki
     sizes = {}
@@ -207,20 +250,46 @@ def verify_blocks_comprehensive():
 
 def main():
     """Main verification function"""
-    from minecraft_check import MinecraftUtils
-    MinecraftUtils.verification_summary([
+    parser = argparse.ArgumentParser(description="Verify the Minecraft Bedrock addon project")
+    parser.add_argument("--profile", nargs='?', const=DEFAULT_TRACE_PATH, metavar='TRACE',
+                        help=f"measure time and memory per check, write a Chrome trace (default {DEFAULT_TRACE_PATH});"
+                             " checks run sequentially, as the memory peak is shared by all threads")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="number of threads running the checks (default 0 = number of CPU cores, 1 = sequential;"
+                             " always 1 with --profile)")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="re-parse only files changed since the last verification (per-file facts cache)")
+    args = parser.parse_args()
+
+    if args.changed_only:
+        set_changed_only()
+
+    profiler = get_profiler()
+    jobs = args.jobs
+    if args.profile:
+        # tracemalloc mierzy cały proces: w puli wątków sprawdzenia zerowałyby sobie nawzajem szczyt pamięci
+        jobs = 1
+        profiler.enable("verify_all")
+        # verification_summary kończy proces przez sys.exit — podsumowanie wypisywane jest przy wyjściu
+        atexit.register(profiler.finish, args.profile)
+
+    verifications = [
         MinecraftUtils.verify_config,
         MinecraftUtils.verify_manifests,
+        MinecraftUtils.verify_schemas,
         MinecraftUtils.verify_project_structure,
         MinecraftUtils.count_project_files,
         MinecraftUtils.verify_translations,
         MinecraftUtils.verify_blocks,
         MinecraftUtils.verify_models,
         MinecraftUtils.verify_textures,
+        verify_texture_dimensions,
         verify_database,
         verify_blocks_comprehensive,
         verify_vertical_alignment,
-    ])
+    ]
+    MinecraftUtils.verification_summary([profiler.wrap(verification) if profiler.enabled else verification
+                                         for verification in verifications], jobs=jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Wsadowe pobieranie informacji o plikach (adres, SHA-1, rozmiar) przez API MediaWiki (prop=imageinfo)
+"""
+import asyncio
+import json
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import unquote, urlencode, urlsplit
+
+from build_cache import file_sha1
+from downloader import AsyncDownloader, DownloadError
+
+MAX_TITLES_PER_QUERY = 50
+API_PATH = "/w/api.php"
+
+
+class ImageInfo:
+    """Informacje o pliku zwrócone przez API"""
+
+    __slots__ = ('title', 'url', 'sha1', 'size', 'width', 'height', 'timestamp')
+
+    def __init__(self, title: str, url: str, sha1: str, size: int, width: Optional[int], height: Optional[int],
+                 timestamp: str):
+        self.title = title
+        self.url = url
+        self.sha1 = sha1
+        self.size = size
+        self.width = width
+        self.height = height
+        self.timestamp = timestamp
+
+    def matches_file(self, path: str) -> bool:
+        """Czy plik na dysku ma taki sam skrót SHA-1 jak plik w repozytorium"""
+        return file_sha1(path) == self.sha1
+
+    def __repr__(self):
+        return f"ImageInfo({self.title!r}, {self.url!r}, sha1={self.sha1})"
+
+
+def page_title(file_page_url: str) -> Optional[str]:
+    """Tytuł strony pliku z adresu w postaci https://host/wiki/Plik:Nazwa.svg"""
+    path = urlsplit(file_page_url).path
+    if not path.startswith('/wiki/'):
+        return None
+    return unquote(path[len('/wiki/'):]) or None
+
+
+def api_url_for(file_page_url: str) -> str:
+    """Adres API wiki, na której leży strona pliku"""
+    parts = urlsplit(file_page_url)
+    return f"{parts.scheme}://{parts.netloc}{API_PATH}"
+
+
+class ImageInfoResolver:
+    """Rozwiązuje adresy stron plików na bezpośrednie adresy plików, do 50 tytułów w jednym zapytaniu"""
+
+    def __init__(self, downloader: AsyncDownloader, api_url: Optional[str] = None,
+                 batch_size: int = MAX_TITLES_PER_QUERY):
+        self.downloader = downloader
+        self.api_url = api_url
+        self.batch_size = min(batch_size, MAX_TITLES_PER_QUERY)
+        self.query_count = 0
+        self.errors: List[str] = []
+
+    async def resolve(self, file_page_urls: Iterable[str]) -> Dict[str, ImageInfo]:
+        """Zwraca {adres strony pliku: ImageInfo}; brakujące pliki i błędy zapytań są pomijane"""
+        titles_by_api: Dict[str, Dict[str, List[str]]] = {}
+        for file_page_url in dict.fromkeys(file_page_urls):
+            title = page_title(file_page_url)
+            if title:
+                api_url = self.api_url or api_url_for(file_page_url)
+                titles_by_api.setdefault(api_url, {}).setdefault(title, []).append(file_page_url)
+
+        queries = []
+        for api_url, pages_by_title in titles_by_api.items():
+            titles = list(pages_by_title)
+            for start in range(0, len(titles), self.batch_size):
+                queries.append((api_url, titles[start:start + self.batch_size]))
+
+        resolved: Dict[str, ImageInfo] = {}
+        for (api_url, titles), infos in zip(queries, await asyncio.gather(
+                *(self._query(api_url, titles) for api_url, titles in queries))):
+            for title, info in infos.items():
+                for file_page_url in titles_by_api[api_url][title]:
+                    resolved[file_page_url] = info
+        return resolved
+
+    async def _query(self, api_url: str, titles: List[str]) -> Dict[str, ImageInfo]:
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': '2',
+            'prop': 'imageinfo',
+            'iiprop': 'url|sha1|size|timestamp',
+            'redirects': '1',
+            'titles': '|'.join(titles),
+        }
+        try:
+            response = json.loads(await self.downloader.fetch_text(f"{api_url}?{urlencode(params)}"))
+        except (DownloadError, ValueError) as e:
+            self.errors.append(f"{api_url}: {e}")
+            return {}
+        finally:
+            self.query_count += 1
+
+        query = response.get('query', {})
+        if 'error' in response:
+            self.errors.append(f"{api_url}: {response['error'].get('info', response['error'])}")
+        normalized = {item['from']: item['to'] for item in query.get('normalized', [])}
+        redirects = {item['from']: item['to'] for item in query.get('redirects', [])}
+        pages = {page['title']: page for page in query.get('pages', [])}
+
+        infos = {}
+        for title in titles:
+            resolved_title = normalized.get(title, title)
+            resolved_title = redirects.get(resolved_title, resolved_title)
+            page = pages.get(resolved_title)
+            if not page or page.get('missing') or not page.get('imageinfo'):
+                continue
+            image_info = page['imageinfo'][0]
+            infos[title] = ImageInfo(
+                title=resolved_title,
+                url=image_info['url'],
+                sha1=image_info['sha1'],
+                size=image_info['size'],
+                width=image_info.get('width'),
+                height=image_info.get('height'),
+                timestamp=image_info['timestamp'],
+            )
+        return infos